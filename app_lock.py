@@ -0,0 +1,116 @@
+"""
+PID lock file of the running app, for the launcher's update handoff.
+
+The app writes its PID next to its executable when it starts and removes the
+file when it exits. Before replacing core.exe the launcher waits for exactly
+that process to end (the app also passes its PID with --app-pid when it
+starts the update), blocking on the process handle instead of polling:
+
+    app:      app_lock.acquire()
+    launcher: app_lock.wait_for_exit(pid, timeout)
+"""
+import atexit
+import json
+import os
+import sys
+import time
+
+LOCK_FILE = "core.pid"
+# Polling step where the platform has no way to wait on another process
+_POLL_INTERVAL = 0.05
+
+
+def default_lock_path() -> str:
+    """LOCK_FILE next to the executable (frozen) or the source tree."""
+    if getattr(sys, "frozen", False):
+        base_dir = os.path.dirname(sys.executable)
+    else:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_dir, LOCK_FILE)
+
+
+def acquire(path: str = None):
+    """Record this process in the lock file; it is removed again at exit."""
+    path = path or default_lock_path()
+    pid = os.getpid()
+    tmp_path = f"{path}.{pid}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"pid": pid, "started": time.time()}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        return
+    atexit.register(release, path, pid)
+
+
+def release(path: str, pid: int):
+    """Remove the lock file if it still names pid (a newer app may own it)."""
+    if read_pid(path) == pid:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def read_pid(path: str = None):
+    """The PID in the lock file, or None."""
+    try:
+        with open(path or default_lock_path(), "r", encoding="utf-8") as f:
+            pid = json.load(f).get("pid")
+    except (OSError, ValueError, AttributeError):
+        return None
+    return pid if isinstance(pid, int) and pid > 0 else None
+
+
+def is_running(pid: int) -> bool:
+    if sys.platform == "win32":
+        return not _wait_windows(pid, 0)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def wait_for_exit(pid: int, timeout: float) -> bool:
+    """Block until process pid has exited; False when it still runs after timeout."""
+    if sys.platform == "win32":
+        return _wait_windows(pid, timeout)
+    if hasattr(os, "pidfd_open"):
+        try:
+            fd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            pass  # kernel without pidfd support
+        else:
+            import select
+            try:
+                # The descriptor becomes readable when the process exits
+                readable, _, _ = select.select([fd], [], [], timeout)
+                return bool(readable)
+            finally:
+                os.close(fd)
+    deadline = time.monotonic() + timeout
+    while is_running(pid):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(_POLL_INTERVAL)
+    return True
+
+
+def _wait_windows(pid: int, timeout: float) -> bool:
+    import ctypes
+    SYNCHRONIZE = 0x00100000
+    WAIT_OBJECT_0 = 0
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.OpenProcess(SYNCHRONIZE, False, pid)
+    if not handle:
+        # No such process (anymore), or one we may not wait on
+        return True
+    try:
+        return kernel32.WaitForSingleObject(handle, int(timeout * 1000)) == WAIT_OBJECT_0
+    finally:
+        kernel32.CloseHandle(handle)
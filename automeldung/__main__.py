@@ -0,0 +1,177 @@
+"""
+Command-line export: python -m automeldung [--resume] [--limit N] [--json] [--verbose]
+                                           [--profile [--profile-snapshots N]]
+                                           [--dry-run] [--daemon]
+
+Uses the same app_settings.json as the GUI and consumes the exporter's progress
+events (automeldung.utils.run.events) instead of parsing log text.
+
+--dry-run only checks the rows (validation, ohne/mit AU/Zwischenmeldung, output
+name, AU file, template fields) and prints one line per row; no PDF is written.
+The exit code is 2 when a row or template would fail.
+
+--daemon keeps the process warm (backends imported, Kontaktdaten, templates and
+AU listing cached) and runs one export per line read from stdin; each line
+takes the same options, e.g. "run", "--limit 5" or "--resume --json". "quit" exits.
+"""
+import argparse
+import json
+import shlex
+import sys
+import threading
+
+from automeldung.main_exporter import main_exporter
+from automeldung.utils.run.cancel import CancelToken, ExportCancelled
+from automeldung.utils.run.context import RunContext, RunCaches
+from automeldung.utils.run.events import ProgressTracker, RowDone, RowFailed, RunFinished
+
+
+def _print_event(event, tracker: ProgressTracker):
+    if isinstance(event, RowDone):
+        print(f"[{tracker.completed}/{tracker.total}] {event.name} -> {event.output_path}")
+    elif isinstance(event, RowFailed):
+        print(f"[{tracker.completed}/{tracker.total}] FAILED {event.name}: {event.reason}")
+    elif isinstance(event, RunFinished):
+        stats = event.stats
+        print(
+            f"Finished: {stats.get('done', 0)} done, {stats.get('failed', 0)} failed "
+            f"in {stats.get('elapsed_seconds', 0)}s ({stats.get('rows_per_sec', 0)} rows/s)"
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m automeldung", description="Automeldung PDF export")
+    parser.add_argument("--resume", action="store_true", help="Continue a cancelled run from its checkpoint")
+    parser.add_argument("--limit", type=int, default=None, help="Override the row limit from the settings")
+    parser.add_argument("--json", action="store_true", help="Print progress events as JSON lines")
+    parser.add_argument("--verbose", action="store_true", help="Also print the exporter log (to stderr)")
+    parser.add_argument("--profile", action="store_true", help="Profile the run with cProfile (.pstats in the export folder)")
+    parser.add_argument("--profile-snapshots", type=int, default=0, metavar="N",
+                        help="With --profile, take a tracemalloc snapshot every N rows")
+    parser.add_argument("--dry-run", action="store_true", help="Only check which rows would be exported or fail; write nothing")
+    parser.add_argument("--daemon", action="store_true", help="Stay warm and run one export per line read from stdin")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.daemon:
+        return _daemon()
+    return _run(args)
+
+
+def _daemon() -> int:
+    from automeldung.main_exporter import warm_up_backends, preload_lookups
+
+    parser = build_parser()
+    # Shared by all runs of this process; entries reload when their file changes
+    caches = RunCaches()
+    print("Warming up...", file=sys.stderr)
+    try:
+        warm_up_backends()
+    except ImportError as ex:
+        print(f"Error: {ex}", file=sys.stderr)
+        return 1
+    preload_lookups(RunContext.from_config(caches=caches))
+    print("Ready. One export per line (options as on the command line), 'quit' to exit.", file=sys.stderr, flush=True)
+    try:
+        for line in sys.stdin:
+            tokens = shlex.split(line)
+            if not tokens:
+                continue
+            if tokens[:1] == ["run"]:
+                tokens = tokens[1:]
+            if tokens[:1] in (["quit"], ["exit"]):
+                break
+            try:
+                args = parser.parse_args(tokens)
+            except SystemExit:
+                continue
+            code = _run(args, caches)
+            print(f"Exit code {code}. Ready.", file=sys.stderr, flush=True)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _run(args, caches=None) -> int:
+    if args.verbose:
+        log = lambda m: print(m, file=sys.stderr)
+    elif args.profile:
+        # Keep the profile summary visible without the full log
+        log = lambda m: print(m, file=sys.stderr) if str(m).startswith(("Profile", "Allocation", "Top ")) else None
+    else:
+        log = lambda m: None
+    overrides = {"log": log}
+    if caches is not None:
+        overrides["caches"] = caches
+    if args.limit is not None:
+        overrides["limit_rows"] = args.limit
+    ctx = RunContext.from_config(**overrides)
+    if args.dry_run:
+        return _dry_run(ctx, args)
+
+    tracker = ProgressTracker()
+    lock = threading.Lock()
+
+    def on_event(event):
+        with lock:
+            tracker.update(event)
+            if args.json:
+                print(json.dumps(event.to_dict()), flush=True)
+            else:
+                _print_event(event, tracker)
+
+    token = CancelToken()
+    result = {}
+
+    def run():
+        try:
+            result["stats"] = main_exporter(
+                ctx,
+                cancel_token=token,
+                resume=args.resume,
+                on_event=on_event,
+                profile=args.profile,
+                snapshot_every=args.profile_snapshots,
+            )
+        except Exception as ex:
+            result["error"] = ex
+
+    # Run on a worker thread so Ctrl+C can cancel cooperatively (and leave a checkpoint)
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    try:
+        while worker.is_alive():
+            worker.join(0.2)
+    except KeyboardInterrupt:
+        print("Cancelling... (run again with --resume to continue)", file=sys.stderr)
+        token.cancel()
+        worker.join()
+
+    error = result.get("error")
+    if isinstance(error, ExportCancelled):
+        return 130
+    if error is not None:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _dry_run(ctx, args) -> int:
+    from automeldung.dry_run import dry_run
+
+    try:
+        result = dry_run(ctx)
+    except Exception as ex:
+        print(f"Error: {ex}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(result.to_dict(), default=str))
+    else:
+        print("\n".join(result.format_table()))
+    return 2 if result.errors or result.counts()["failing"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
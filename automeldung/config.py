@@ -4,6 +4,14 @@ creation_date = None
 # Default limit for rows to process
 limit_rows = 15
 
+# Export pipeline: size of the bounded queues between stages and number of
+# worker threads for each PDF stage (resolve AU, fill, merge, flatten)
+pipeline_queue_size = 8
+pipeline_workers = 2
+
+# Write run_report_<timestamp>.json/.csv (per-stage timings) into the export folder
+timing_report = True
+
 # --- Load overrides from persisted app settings (if present) ---
 # This lets the backend pick up values saved by the GUI without modifying code elsewhere.
 import os
@@ -25,9 +33,14 @@ def _load_settings(path: str) -> Dict[str, Any]:
               pass
        return {}
 
-def _apply_settings(settings: Dict[str, Any]):
+def config_values(settings: Dict[str, Any]) -> Dict[str, Any]:
+       """Map persisted settings to config variable names (without touching this module).
+
+       Empty values are skipped so the caller keeps its defaults for them.
+       """
+       values: Dict[str, Any] = {}
        if not settings:
-              return
+              return values
 
        def _strval(key: str):
               v = settings.get(key)
@@ -58,32 +71,40 @@ def _apply_settings(settings: Dict[str, Any]):
               "creation_date": "creation_date",
        }
 
+       if isinstance(settings.get("timing_report"), bool):
+              values["timing_report"] = settings["timing_report"]
+
        for s_key, cfg_name in direct_map.items():
               val = _strval(s_key)
               if val:
-                     globals()[cfg_name] = val
+                     values[cfg_name] = val
 
-       # Handle limit_rows as integer
-       limit_val = _intval("limit_rows")
-       if limit_val is not None:
-              globals()["limit_rows"] = limit_val
+       # Handle integer settings
+       for int_key in ("limit_rows", "pipeline_queue_size", "pipeline_workers"):
+              int_val = _intval(int_key)
+              if int_val is not None:
+                     values[int_key] = int_val
 
        # Legacy keys compatibility (from early UI versions)
        excel_path = _strval("excel_path")
        if excel_path:
-              globals()["krankmeldungsliste_path"] = excel_path
+              values["krankmeldungsliste_path"] = excel_path
 
        krank_path = _strval("krank_path")
        if krank_path:
               # If specific ones weren't set by current keys, set both to legacy value
               if not _strval("krank_ohne_path"):
-                     globals()["vorlage_krankmeldung_ohne_au_path"] = krank_path
+                     values["vorlage_krankmeldung_ohne_au_path"] = krank_path
               if not _strval("krank_mit_path"):
-                     globals()["vorlage_krankmeldung_mit_au_path"] = krank_path
+                     values["vorlage_krankmeldung_mit_au_path"] = krank_path
 
        gesund_legacy = _strval("gesund_path")
        if gesund_legacy:
-              globals()["vorlage_gesundmeldung_path"] = gesund_legacy
+              values["vorlage_gesundmeldung_path"] = gesund_legacy
+       return values
+
+def _apply_settings(settings: Dict[str, Any]):
+       globals().update(config_values(settings))
 
 # Apply settings on import (safe no-op if file is missing)
 _apply_settings(_load_settings(_APP_SETTINGS_PATH))
@@ -0,0 +1,130 @@
+# checks what an export would do with each row, without creating any PDF
+import os
+import time
+from dataclasses import dataclass, asdict
+from typing import Tuple
+
+from automeldung.utils.run.context import RunContext
+from automeldung.utils.run.cancel import check_cancelled
+
+OHNE_AU, MIT_AU, ZWISCHENMELDUNG, SKIPPED = "ohne AU", "mit AU", "Zwischenmeldung", "skipped"
+
+
+@dataclass(frozen=True)
+class RowCheck:
+    """Outcome of one row: the documents it would get, or why it is skipped.
+
+    errors make the row fail in a real export; warnings do not (e.g. an AU
+    file that is not found is left out of the merged PDF).
+    """
+
+    index: int
+    name: str
+    decision: str
+    output_name: str = ""
+    errors: Tuple[str, ...] = ()
+    warnings: Tuple[str, ...] = ()
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class DryRunResult:
+    rows: Tuple[RowCheck, ...]
+    # Problems that affect the whole run (templates)
+    errors: Tuple[str, ...]
+    elapsed_seconds: float
+
+    def counts(self) -> dict:
+        counts = {"rows": len(self.rows), "failing": sum(1 for r in self.rows if not r.ok)}
+        for row in self.rows:
+            if row.ok:
+                counts[row.decision] = counts.get(row.decision, 0) + 1
+        return counts
+
+    def to_dict(self) -> dict:
+        return {
+            "rows": [r.to_dict() for r in self.rows],
+            "errors": list(self.errors),
+            "counts": self.counts(),
+            "elapsed_seconds": self.elapsed_seconds,
+        }
+
+    def format_table(self):
+        """The result as text lines: one per row, then the run-level errors and a summary."""
+        width = max([len(r.name) for r in self.rows] + [4])
+        lines = [f"{'Row':>5}  {'Name':<{width}}  {'Decision':<15}  File / problems"]
+        for row in self.rows:
+            details = [row.output_name] if row.output_name else []
+            details += [f"ERROR: {e}" for e in row.errors] + [f"warn: {w}" for w in row.warnings]
+            decision = row.decision if row.ok else "fails"
+            lines.append(f"{row.index:>5}  {row.name:<{width}}  {decision:<15}  {'; '.join(details)}".rstrip())
+        lines += [f"ERROR: {e}" for e in self.errors]
+        counts = self.counts()
+        summary = ", ".join(f"{counts.get(d, 0)} {d}" for d in (OHNE_AU, MIT_AU, ZWISCHENMELDUNG, SKIPPED))
+        lines.append(f"Checked {counts['rows']} row(s) in {self.elapsed_seconds}s: {summary}, {counts['failing']} failing.")
+        return lines
+
+
+def dry_run(ctx=None, cancel_token=None) -> DryRunResult:
+    """Run the checks of an export without its PDF stages.
+
+    Loads the sheet (first ctx.limit_rows rows, like the export) and, for each
+    selected row, applies Meldung.check_info_validity, decides between ohne AU,
+    mit AU and Zwischenmeldung, reserves the output name and looks up the AU
+    file. The templates are checked once for the form fields the export fills.
+    Nothing is written to the export folder.
+    """
+    from automeldung.utils.data.data_extractor import create_dataframe_from_excel_table
+    import automeldung.utils.pdf.pdf_creator as pdf_creator
+    from automeldung.utils.data.meldung import Meldung
+
+    if ctx is None:
+        ctx = RunContext.from_config()
+    started_at = time.perf_counter()
+    run_errors = tuple(pdf_creator.template_field_errors(ctx))
+    rows_df = create_dataframe_from_excel_table(ctx.krankmeldungsliste_path).head(ctx.limit_rows)
+    creation_date = ctx.creation_date_text()
+    names = pdf_creator.OutputNames()
+
+    results = []
+    for row in rows_df.itertuples():
+        check_cancelled(cancel_token)
+        index = int(getattr(row, "Index", -1))
+        name = f"{getattr(row, 'nachname', '')}, {getattr(row, 'vorname', '')}"
+        if not row.select:
+            results.append(RowCheck(index, name, SKIPPED))
+            continue
+        is_valid, err_msg = Meldung.check_info_validity(row, ctx)
+        if not is_valid:
+            results.append(RowCheck(index, name, SKIPPED, errors=(err_msg,)))
+            continue
+        with_au = pdf_creator.pdf_kind(row)
+        if with_au is None:
+            problem = f"{Meldung.get_days_sum(row)} days without AU"
+            results.append(RowCheck(index, name, SKIPPED, errors=(problem,)))
+            continue
+        try:
+            job = pdf_creator.PdfJob(ctx, row, creation_date, with_au=with_au, names=names)
+        except Exception as e:
+            results.append(RowCheck(index, name, MIT_AU if with_au else OHNE_AU, errors=(f"{type(e).__name__}: {e}",)))
+            continue
+
+        warnings = ()
+        if with_au and job.meldung.has_AU:
+            au_id = str(job.meldung.au_file_id)
+            if not os.path.exists(au_id) and not pdf_creator.get_au_index(ctx).find(au_id):
+                warnings = (f"no AU file found for '{au_id}', exported without it",)
+        if not with_au:
+            decision = OHNE_AU
+        else:
+            decision = ZWISCHENMELDUNG if job.is_zwischenmeldung else MIT_AU
+        results.append(RowCheck(index, name, decision, os.path.basename(job.final_filename), warnings=warnings))
+
+    elapsed = round(time.perf_counter() - started_at, 3)
+    return DryRunResult(rows=tuple(results), errors=run_errors, elapsed_seconds=elapsed)
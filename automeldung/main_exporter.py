@@ -1,31 +1,272 @@
 # this file fills out pdf forms with data from excel table
-import automeldung.config as config
-from automeldung.utils.data.data_extractor import create_dataframe_from_excel_table
-import automeldung.utils.pdf.pdf_creator as pdf_creator
-from automeldung.utils.data.meldung import Meldung
-from datetime import datetime
-
-def main_exporter():
-    KGdf = create_dataframe_from_excel_table(config.krankmeldungsliste_path)
-    # Optional row limit from environment to allow UI control without changing logic elsewhere
-
-    for row in KGdf.head(config.limit_rows).itertuples():
-        is_selected = row.select
-        is_valid, err_msg = Meldung.check_info_validity(row)
-        
-        if is_selected:
-            config.log(f"Processing: {row.vorname}, {row.nachname}")
-            if is_valid:
-                Days = Meldung.get_days_sum(row)
-                # Use configured creation date or default to today
-                creation_date = config.creation_date if getattr(config, 'creation_date', None) else datetime.now().strftime("%d.%m.%Y")
-                
-                has_au = getattr(row, "au", False) or getattr(row, "eau", False)
-                if Days <= 3 and not has_au:
-                    pdf_creator.create_pdf_form_ohne_AU(row, creation_date)
-                elif has_au:
-                    pdf_creator.create_pdf_form_mit_AU(row, creation_date)
-                else:
-                    config.log(f"Problem encountered with row: {row.vorname}, {row.nachname} -- Days: {Days} -- Has AU: {has_au}")
-            else:
-                config.log(err_msg)
\ No newline at end of file
+from automeldung.utils.run.context import RunContext
+from automeldung.utils.run.cancel import ExportCancelled
+from automeldung.utils.run.checkpoint import Checkpoint
+from automeldung.utils.pdf.output_writer import remove_intermediates
+from automeldung.utils.run.events import (
+    safe_emitter, RunStarted, RowStarted, StageFinished, RowDone, RowFailed, RunFinished,
+)
+from automeldung.utils.run import timing
+from automeldung.utils.run.timing import timed
+import os
+import time
+import threading
+
+def _row_of(item):
+    # Pipeline items are rows (validate stage) or PdfJobs carrying their row
+    return getattr(item, "row", item)
+
+def _row_index(item) -> int:
+    return int(getattr(_row_of(item), "Index", -1))
+
+def _row_name(item) -> str:
+    row = _row_of(item)
+    return f"{getattr(row, 'nachname', '')}, {getattr(row, 'vorname', '')}"
+
+def _in_row(fn, timer):
+    """Wrap a stage function so timings on the worker thread go to this run's timer and the item's row."""
+    def run(item):
+        timing.set_current_row(_row_index(item), timer)
+        return fn(item)
+    return run
+
+def main_exporter(ctx=None, cancel_token=None, resume=False, on_event=None, profile=False, snapshot_every=0, executor=None):
+    """Run the export.
+
+    Rows flow through a staged pipeline (read -> validate -> resolve AU -> fill ->
+    merge -> flatten -> write) connected by bounded queues, see
+    automeldung.utils.run.pipeline.
+
+    ctx: RunContext with the paths, options, logger and caches of this run.
+        Defaults to a snapshot of automeldung.config; nothing here reads the
+        config module after that, so several runs can share one process.
+    cancel_token: optional CancelToken, checked between rows and between PDF stages.
+    resume: skip rows recorded in the export folder's checkpoint by a previous,
+        cancelled run. A fresh (non-resume) run discards any old checkpoint.
+    on_event: optional callback receiving the typed progress events from
+        automeldung.utils.run.events (run_started, row_started, stage_finished,
+        row_done, row_failed, run_finished). Called from worker threads.
+    profile: wrap the run in cProfile and save profile_<timestamp>.pstats in
+        the export folder; the top 20 functions are written to the log.
+    snapshot_every: with profile, take a tracemalloc snapshot every N rows and
+        write the top allocation diffs next to the .pstats file.
+    executor: optional shared thread pool for the PDF stages (the GUI's job
+        scheduler shares one between concurrent jobs); a pool per run otherwise.
+
+    Returns the stats dict that is also sent with RunFinished. When
+    ctx.timing_report is on, a per-stage timing report is written next to
+    the exports (automeldung.utils.run.timing).
+    """
+    if ctx is None:
+        ctx = RunContext.from_config()
+    emit = safe_emitter(on_event)
+    started_at = time.perf_counter()
+    timer = timing.start_run(enabled=ctx.timing_report)
+    profiler = None
+    if profile:
+        from automeldung.utils.run.profiling import ExportProfiler
+        profiler = ExportProfiler(ctx.export_path, snapshot_every=snapshot_every)
+        try:
+            profiler.start()
+        except ValueError as e:
+            # Another run in this process is being profiled (one cProfile at a time on 3.12+)
+            ctx.log(f"warn: profiling disabled for this run: {e}")
+            profiler = None
+    try:
+        return _run_export(ctx, cancel_token, resume, emit, started_at, timer, profiler, executor)
+    finally:
+        timing.stop_run()
+        if profiler is not None:
+            try:
+                stats = profiler.finish()
+                ctx.log(f"Profile saved to: {profiler.pstats_path}")
+                if profiler.alloc_path:
+                    ctx.log(f"Allocation diffs saved to: {profiler.alloc_path}")
+                ctx.log(profiler.summary(stats, limit=20))
+            except Exception as e:
+                ctx.log(f"warn: could not save profile: {e}")
+
+def _run_export(ctx, cancel_token, resume, emit, started_at, timer, profiler, executor):
+    # Heavy backends (pandas, openpyxl, PyPDF2, pikepdf, reportlab) are imported on
+    # first use so that importing this module stays cheap for the GUI.
+    from automeldung.utils.data.data_extractor import create_dataframe_from_excel_table
+    import automeldung.utils.pdf.pdf_creator as pdf_creator
+    from automeldung.utils.data.meldung import Meldung
+    from automeldung.utils.run.pipeline import Pipeline, Stage
+
+    if resume:
+        checkpoint = Checkpoint.load(ctx.export_path, ctx.krankmeldungsliste_path)
+        if len(checkpoint):
+            ctx.log(f"Resuming export: {len(checkpoint)} row(s) already completed.")
+    else:
+        checkpoint = Checkpoint(ctx.export_path, ctx.krankmeldungsliste_path)
+        checkpoint.clear()
+
+    with timed("excel_load"):
+        KGdf = create_dataframe_from_excel_table(ctx.krankmeldungsliste_path)
+    pdf_creator.ensure_export_dir(ctx)
+    # Intermediates of a run that was killed mid-row (a finished row removes its own)
+    remove_intermediates(ctx.export_path)
+    # Use configured creation date or default to today
+    creation_date = ctx.creation_date_text()
+
+    rows_df = KGdf.head(ctx.limit_rows)
+    total = sum(1 for row in rows_df.itertuples() if row.select and not checkpoint.is_done(row))
+    stats = {"total": total, "done": 0, "failed": 0, "cancelled": False}
+    stats_lock = threading.Lock()
+    emit(RunStarted(total=total))
+
+    def count(key):
+        with stats_lock:
+            stats[key] += 1
+
+    def fail(row, reason):
+        count("failed")
+        emit(RowFailed(index=_row_index(row), name=_row_name(row), reason=reason))
+
+    # Output names of this run; reserved in sheet order by the validate stage
+    names = pdf_creator.OutputNames()
+
+    def validate(row):
+        if not row.select:
+            return None
+        if checkpoint.is_done(row):
+            # Keep the name of the file written before the resume, so a later
+            # row with the same name does not replace it
+            try:
+                with_au = pdf_creator.pdf_kind(row)
+                if with_au is not None:
+                    pdf_creator.PdfJob(ctx, row, creation_date, with_au=with_au, names=names)
+            except Exception:
+                pass
+            return None
+        ctx.log(f"Processing: {row.vorname}, {row.nachname}")
+        emit(RowStarted(index=_row_index(row), name=_row_name(row)))
+        with timed("validation"):
+            is_valid, err_msg = Meldung.check_info_validity(row, ctx)
+        if not is_valid:
+            ctx.log(err_msg)
+            fail(row, err_msg)
+            return None
+
+        with_au = pdf_creator.pdf_kind(row)
+        if with_au is not None:
+            return pdf_creator.PdfJob(ctx, row, creation_date, with_au=with_au, names=names)
+        Days = Meldung.get_days_sum(row)
+        has_au = getattr(row, "au", False) or getattr(row, "eau", False)
+        problem = f"Problem encountered with row: {row.vorname}, {row.nachname} -- Days: {Days} -- Has AU: {has_au}"
+        ctx.log(problem)
+        fail(row, problem)
+        return None
+
+    def write(job):
+        with timed("final_write"):
+            ctx.log(f"PDF saved to: {job.final_filename}")
+            pdf_creator.cleanup_job(job)
+            checkpoint.mark_done(job.row)
+            try:
+                timing.add_bytes(os.path.getsize(job.final_filename))
+            except OSError:
+                pass
+        if profiler is not None:
+            profiler.row_done()
+        count("done")
+        emit(RowDone(index=_row_index(job), name=_row_name(job), output_path=job.final_filename))
+        return job.final_filename
+
+    def discard(item):
+        if isinstance(item, pdf_creator.PdfJob):
+            pdf_creator.cleanup_job(item)
+
+    def on_error(stage_name, item, exc):
+        reason = f"{stage_name} failed: {exc}"
+        ctx.log(f"error: {_row_name(item)}: {reason}")
+        discard(item)
+        fail(_row_of(item), reason)
+
+    def on_stage_finished(stage_name, item, duration):
+        emit(StageFinished(index=_row_index(item), stage=stage_name, duration=duration))
+
+    stage_fns = [("validate", validate, 1)]
+    stage_fns += [(name, fn, ctx.pipeline_workers) for name, fn in pdf_creator.PDF_STAGES]
+    stage_fns.append(("write", write, 1))
+    stages = []
+    for name, fn, workers in stage_fns:
+        fn = _in_row(fn, timer)
+        if profiler is not None:
+            fn = profiler.wrap(fn)
+        stages.append(Stage(name, fn, workers=workers))
+    pipeline = Pipeline(
+        stages,
+        queue_size=ctx.pipeline_queue_size,
+        cancel_token=cancel_token,
+        on_error=on_error,
+        discard=discard,
+        on_stage_finished=on_stage_finished,
+        executor=executor,
+    )
+
+    try:
+        pipeline.run(rows_df.itertuples())
+    except ExportCancelled:
+        stats["cancelled"] = True
+        ctx.log(f"Export cancelled. {len(checkpoint)} row(s) completed; press Resume to continue.")
+        raise
+    finally:
+        checkpoint.close()
+        # Leftovers from older versions that wrote overlays next to the exports
+        pdf_creator._cleanup_overlays(ctx.export_path)
+        ctx.log(pipeline.summary())
+        elapsed = time.perf_counter() - started_at
+        stats["elapsed_seconds"] = round(elapsed, 3)
+        stats["rows_per_sec"] = round((stats["done"] + stats["failed"]) / elapsed, 3) if elapsed > 0 else 0.0
+        stats["stages"] = [m.to_dict() for m in pipeline.metrics]
+        if timer.enabled:
+            try:
+                json_path, _ = timer.write_report(ctx.export_path, extra=stats)
+                stats["report_path"] = json_path
+                ctx.log(f"Run report saved to: {json_path}")
+            except OSError as e:
+                ctx.log(f"warn: could not write run report: {e}")
+        emit(RunFinished(stats=dict(stats)))
+
+    # Finished the whole sheet; nothing left to resume
+    checkpoint.clear()
+    return stats
+
+
+def warm_up_backends():
+    """Import the heavy PDF/Excel backends ahead of the first export.
+
+    Meant to run on a background thread once the GUI has painted, so the first
+    click on Run does not pay for the imports.
+    """
+    import pandas  # noqa: F401
+    import openpyxl  # noqa: F401
+    import automeldung.utils.pdf.pdf_creator  # noqa: F401
+    import automeldung.utils.data.meldung  # noqa: F401
+    import automeldung.utils.run.pipeline  # noqa: F401
+
+
+def preload_lookups(ctx):
+    """Load what a run of ctx reads for every row into ctx.caches.
+
+    Kontaktdaten index, the three templates and the AU folder listing; a warm
+    worker calls this before the first run so rows start right away. Missing
+    files are skipped here and reported by the run itself.
+    """
+    import automeldung.utils.pdf.pdf_creator as pdf_creator
+    from automeldung.utils.data.meldung import get_kontaktdaten
+
+    loaders = [
+        lambda: get_kontaktdaten(ctx),
+        lambda: pdf_creator.get_template(ctx, ctx.vorlage_krankmeldung_ohne_au_path),
+        lambda: pdf_creator.get_template(ctx, ctx.vorlage_krankmeldung_mit_au_path),
+        lambda: pdf_creator.get_template(ctx, ctx.vorlage_gesundmeldung_path),
+        lambda: pdf_creator.get_au_index(ctx),
+    ]
+    for load in loaders:
+        try:
+            load()
+        except Exception:
+            pass
@@ -0,0 +1,64 @@
+import os
+import bisect
+from typing import Optional
+
+from automeldung.utils.data.packed import decode, encode, open_tables, pack_tables
+
+
+class AuIndex:
+    """File listing of the AU folder for repeated prefix lookups.
+
+    Built once per folder state (see RunCaches.for_file) instead of listing the
+    folder for every row; find() prefers PDFs, then the newest file.
+    Kept free of heavy imports so the GUI process can build and share it.
+    """
+
+    def __init__(self, dir_path: Optional[str] = None, entries=None):
+        if entries is None:
+            entries = []
+            if os.path.isdir(dir_path):
+                for fname in os.listdir(dir_path):
+                    fpath = os.path.join(dir_path, fname)
+                    if not os.path.isfile(fpath):
+                        continue
+                    is_pdf = 0 if os.path.splitext(fname)[1].lower() == ".pdf" else 1
+                    entries.append((fname.lower(), (is_pdf, -os.path.getmtime(fpath)), fpath))
+        entries.sort()
+        self._names = [e[0] for e in entries]
+        self._entries = entries
+
+    def find(self, prefix: str) -> Optional[str]:
+        prefix_lower = prefix.lower()
+        best = None
+        i = bisect.bisect_left(self._names, prefix_lower)
+        while i < len(self._names) and self._names[i].startswith(prefix_lower):
+            if best is None or self._entries[i][1] < best[1]:
+                best = self._entries[i]
+            i += 1
+        return best[2] if best else None
+
+    def to_bytes(self) -> bytes:
+        """Packed table for sharing with other processes (see from_bytes)."""
+        return pack_tables([
+            ((name.encode("utf-8"), encode([rank, path])) for name, rank, path in self._entries),
+        ])
+
+    @staticmethod
+    def from_bytes(data) -> "PackedAuIndex":
+        return PackedAuIndex(data)
+
+
+class PackedAuIndex:
+    """AuIndex read in place from its to_bytes() buffer (no per-worker copy)."""
+
+    def __init__(self, data):
+        (self._table,) = open_tables(data)
+
+    def find(self, prefix: str) -> Optional[str]:
+        best = None
+        # UTF-8 byte order is code point order, so the prefix range matches AuIndex
+        for i in self._table.prefixed(prefix.lower().encode("utf-8")):
+            rank, path = decode(self._table.value(i))
+            if best is None or rank < best[0]:
+                best = (rank, path)
+        return best[1] if best else None
@@ -0,0 +1,109 @@
+from automeldung.utils.data.packed import decode, encode, open_tables, pack_tables
+
+
+class KontaktdatenIndex:
+    """Kontaktdaten as dictionaries/sets, so a row lookup does not scan the table.
+
+    Kept free of pandas (like au_index) so the GUI process and the benchmarks
+    can handle the shared form; Meldung builds it from the workbook.
+    """
+
+    def __init__(self, rows=()):
+        self.nachnamen = set()
+        self.vornamen = set()
+        self.persnr = {}
+        # (nachname, vorname) of contracts in the Fachbereich (checked by prefix)
+        self.fachbereich = []
+        for nachname, vorname, persnr, vertrag_im in rows:
+            self.nachnamen.add(nachname)
+            self.vornamen.add(vorname)
+            # First match wins, as in the former .values[0] lookup
+            self.persnr.setdefault((nachname, vorname), persnr)
+            if vertrag_im == "FB" and isinstance(nachname, str) and isinstance(vorname, str):
+                self.fachbereich.append((nachname, vorname))
+
+    @classmethod
+    def from_dataframe(cls, df) -> "KontaktdatenIndex":
+        return cls(zip(*(df[c] for c in ("nachname", "vorname", "persnr", "vertrag_im"))))
+
+    def to_bytes(self) -> bytes:
+        """Packed tables for sharing with other processes (see from_bytes)."""
+        return pack_tables([
+            ((encode(nn), b"") for nn in self.nachnamen),
+            ((encode(vn), b"") for vn in self.vornamen),
+            ((encode(pair), encode(nr)) for pair, nr in self.persnr.items()),
+            # Raw UTF-8 keeps names with a common prefix next to each other
+            ((nn.encode("utf-8"), vn.encode("utf-8")) for nn, vn in self.fachbereich),
+        ])
+
+    @staticmethod
+    def from_bytes(data) -> "PackedKontaktdaten":
+        return PackedKontaktdaten(data)
+
+    def has_pair(self, nachname, vorname) -> bool:
+        return (nachname, vorname) in self.persnr
+
+    def vertrag_in_fachbereich(self, nachname: str, vorname: str) -> bool:
+        return any(nn.startswith(nachname) and vn.startswith(vorname) for nn, vn in self.fachbereich)
+
+
+class _PackedSet:
+    def __init__(self, table):
+        self._table = table
+
+    def __contains__(self, value) -> bool:
+        try:
+            return self._table.find(encode(value)) is not None
+        except (TypeError, ValueError):
+            return False
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+
+class _PackedMapping:
+    def __init__(self, table):
+        self._table = table
+
+    def _index(self, key):
+        try:
+            return self._table.find(encode(key))
+        except (TypeError, ValueError):
+            return None
+
+    def __getitem__(self, key):
+        i = self._index(key)
+        if i is None:
+            raise KeyError(key)
+        return decode(self._table.value(i))
+
+    def __contains__(self, key) -> bool:
+        return self._index(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+
+class PackedKontaktdaten:
+    """KontaktdatenIndex read in place from its to_bytes() buffer.
+
+    Workers get this over the shared block: lookups search the packed tables
+    directly, so attaching costs no parsing and no per-worker copy.
+    """
+
+    def __init__(self, data):
+        nachnamen, vornamen, persnr, fachbereich = open_tables(data)
+        self.nachnamen = _PackedSet(nachnamen)
+        self.vornamen = _PackedSet(vornamen)
+        self.persnr = _PackedMapping(persnr)
+        self._fachbereich = fachbereich
+
+    def has_pair(self, nachname, vorname) -> bool:
+        return (nachname, vorname) in self.persnr
+
+    def vertrag_in_fachbereich(self, nachname: str, vorname: str) -> bool:
+        table = self._fachbereich
+        return any(
+            bytes(table.value(i)).decode("utf-8").startswith(vorname)
+            for i in table.prefixed(nachname.encode("utf-8"))
+        )
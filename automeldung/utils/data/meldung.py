@@ -1,14 +1,25 @@
 import pandas as pd
 from typing import Optional, Tuple
-from openpyxl import load_workbook
 
-import automeldung.config as config
 from automeldung.utils.data.data_extractor import create_dataframe_from_excel_table
+from automeldung.utils.data.kontaktdaten_index import KontaktdatenIndex
+from automeldung.utils.run.timing import timed
 
-kontaktdaten = create_dataframe_from_excel_table(config.kontaktdaten_path)
+def _load_kontaktdaten_index(path):
+    return KontaktdatenIndex.from_dataframe(create_dataframe_from_excel_table(path))
+
+def get_kontaktdaten(ctx) -> KontaktdatenIndex:
+    """Return the Kontaktdaten index of the run, loading it on first use.
+
+    Cached in ctx.caches (not at import) and reloaded when the workbook
+    changes, so warm workers and jobs sharing the caches stay current.
+    """
+    return ctx.caches.for_file(
+        "kontaktdaten", ctx.kontaktdaten_path, _load_kontaktdaten_index, from_shared=KontaktdatenIndex.from_bytes
+    )
 
 class Meldung:  
-    def __init__(self, row):
+    def __init__(self, row, ctx):
         # Resolve the Excel fill color of the Nachname cell for this person
         self.nachname = row.nachname.strip()
         self.vorname = row.vorname.strip()
@@ -29,7 +40,7 @@ class Meldung:
             if pd.notna(self.von_date)
             else ""
         )
-        self.todays_date = pd.Timestamp.now().strftime("%d.%m.%Y")
+        self.todays_date = ctx.now().strftime("%d.%m.%Y")
         self.has_AU = getattr(row, "au", False)
         self.has_eAU = getattr(row, "eau", False)
         self.au_file_id = row.au_file_id
@@ -48,7 +59,8 @@ class Meldung:
             self.von_ohne_parsed = ""
             self.bis_ohne_parsed = ""
 
-        self.PNr = kontaktdaten.loc[(kontaktdaten['nachname'] == self.nachname) & (kontaktdaten['vorname'] == self.vorname),'persnr'].values[0]
+        with timed("kontaktdaten_lookup"):
+            self.PNr = get_kontaktdaten(ctx).persnr[(self.nachname, self.vorname)]
 
     def get_values(self):
         return (
@@ -62,7 +74,7 @@ class Meldung:
         )
 
     @staticmethod
-    def check_info_validity(row) -> Tuple[bool, str]:
+    def check_info_validity(row, ctx) -> Tuple[bool, str]:
         def _is_empty(val) -> bool:
             if val is None:
                 return True
@@ -96,29 +108,24 @@ class Meldung:
         if not errors:
             nn = (nachname or "").strip()
             vn = (vorname or "").strip()
-            try:
-                has_last = kontaktdaten['nachname'].eq(nn).any()
-                has_first = kontaktdaten['vorname'].eq(vn).any()
-                # Check if vertrag is in Fachbereich - handle multiple matches gracefully
-                vertrag_matches = kontaktdaten.loc[
-                    (kontaktdaten['vorname'].str.startswith(vorname) & kontaktdaten['nachname'].str.startswith(nachname)),
-                    "vertrag_im"
-                ]
-                # Check if any match has 'FB' (Fachbereich)
-                vertrag_in_fachbereich = (vertrag_matches == 'FB').any() if len(vertrag_matches) > 0 else False
-                if vertrag_in_fachbereich:
-                    errors.append("Vertrag im Fachbereich, Meldung wird nicht erstellt.")
-                if not has_last:
-                    errors.append("Unknown 'nachname' in kontaktdaten")
-                if not has_first:
-                    errors.append("Unknown 'vorname' in kontaktdaten")
-                if has_last and has_first:
-                    pair_exists = ((kontaktdaten['nachname'] == nn) & (kontaktdaten['vorname'] == vn)).any()
-                    if not pair_exists:
-                        errors.append("Name combination not found in kontaktdaten")
-            except Exception as e:
-                # If kontaktdaten is unavailable or columns missing, mark as error
-                errors.append(f"kontaktdaten lookup failed with error {e}")
+            with timed("kontaktdaten_lookup"):
+                try:
+                    kontaktdaten = get_kontaktdaten(ctx)
+                    has_last = nn in kontaktdaten.nachnamen
+                    has_first = vn in kontaktdaten.vornamen
+                    # Check if vertrag is in Fachbereich - handle multiple matches gracefully
+                    if kontaktdaten.vertrag_in_fachbereich(nachname, vorname):
+                        errors.append("Vertrag im Fachbereich, Meldung wird nicht erstellt.")
+                    if not has_last:
+                        errors.append("Unknown 'nachname' in kontaktdaten")
+                    if not has_first:
+                        errors.append("Unknown 'vorname' in kontaktdaten")
+                    if has_last and has_first:
+                        if not kontaktdaten.has_pair(nn, vn):
+                            errors.append("Name combination not found in kontaktdaten")
+                except Exception as e:
+                    # If kontaktdaten is unavailable or columns missing, mark as error
+                    errors.append(f"kontaktdaten lookup failed with error {e}")
 
         # 2 - AU aber kein AU_file
         au_flag = bool(getattr(row, "au", False))
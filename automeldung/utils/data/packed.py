@@ -0,0 +1,105 @@
+import json
+from array import array
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Offsets are native unsigned ints: tables are written and read on one machine
+_OFFSET = "I"
+_OFFSET_SIZE = array(_OFFSET).itemsize
+
+
+def _plain(value):
+    # numpy scalars -> Python values for JSON
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+def encode(value) -> bytes:
+    """Key/value encoding for pack_tables (JSON; tuples come back as lists)."""
+    return json.dumps(value, default=_plain, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode(data) -> object:
+    return json.loads(bytes(data))
+
+
+def pack_tables(tables: Iterable[Iterable[Tuple[bytes, bytes]]]) -> bytes:
+    """Several sorted key -> value tables in one flat buffer (see PackedTable).
+
+    Each table is [size][count][count+1 key offsets][count+1 value offsets]
+    [keys][values], padded to the offset size so the next one stays aligned.
+    Keys are sorted bytewise; duplicate keys are kept in their given order.
+    """
+    out = bytearray()
+    for items in tables:
+        items = sorted(items, key=lambda item: item[0])
+        key_offsets, value_offsets = array(_OFFSET, [0]), array(_OFFSET, [0])
+        for key, value in items:
+            key_offsets.append(key_offsets[-1] + len(key))
+            value_offsets.append(value_offsets[-1] + len(value))
+        body = bytearray(array(_OFFSET, [len(items)]).tobytes())
+        body += key_offsets.tobytes() + value_offsets.tobytes()
+        body += b"".join(key for key, _ in items) + b"".join(value for _, value in items)
+        body += b"\0" * (-len(body) % _OFFSET_SIZE)
+        out += array(_OFFSET, [len(body)]).tobytes() + body
+    return bytes(out)
+
+
+def open_tables(buf) -> List["PackedTable"]:
+    """The tables of a pack_tables() buffer, read in place (no copy of buf)."""
+    buf = memoryview(buf).cast("B")
+    tables, pos = [], 0
+    while pos < len(buf):
+        size = buf[pos:pos + _OFFSET_SIZE].cast(_OFFSET)[0]
+        pos += _OFFSET_SIZE
+        tables.append(PackedTable(buf[pos:pos + size]))
+        pos += size
+    return tables
+
+
+class PackedTable:
+    """One sorted table of pack_tables(), searched directly in its buffer.
+
+    Opening it only casts the offset arrays; a lookup bisects over the keys
+    and copies just the entries it compares or returns, so a worker that
+    attaches to a shared block never builds its own copy of the table.
+    """
+
+    def __init__(self, buf: memoryview):
+        count = buf[:_OFFSET_SIZE].cast(_OFFSET)[0]
+        start = _OFFSET_SIZE
+        offsets_len = (count + 1) * _OFFSET_SIZE
+        self._count = count
+        self._key_offsets = buf[start:start + offsets_len].cast(_OFFSET)
+        self._value_offsets = buf[start + offsets_len:start + 2 * offsets_len].cast(_OFFSET)
+        self._keys = buf[start + 2 * offsets_len:]
+        self._values = self._keys[self._key_offsets[count]:]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def key(self, i: int) -> bytes:
+        return bytes(self._keys[self._key_offsets[i]:self._key_offsets[i + 1]])
+
+    def value(self, i: int) -> memoryview:
+        return self._values[self._value_offsets[i]:self._value_offsets[i + 1]]
+
+    def bisect_left(self, key: bytes) -> int:
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, key: bytes) -> Optional[int]:
+        """Index of the first entry with exactly key, or None."""
+        i = self.bisect_left(key)
+        return i if i < self._count and self.key(i) == key else None
+
+    def prefixed(self, prefix: bytes) -> Iterator[int]:
+        """Indexes of the entries whose key starts with prefix, in key order."""
+        i = self.bisect_left(prefix)
+        while i < self._count and self.key(i).startswith(prefix):
+            yield i
+            i += 1
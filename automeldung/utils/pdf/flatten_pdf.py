@@ -1,5 +1,6 @@
 import sys
 import os
+import io
 import pikepdf
 from pikepdf import Name, Array
 from reportlab.pdfgen import canvas
@@ -18,9 +19,10 @@ def flatten_pdf(input_path: str, output_path: str) -> None:
     """
     base = pikepdf.Pdf.open(input_path)
 
-    # 1) Build an overlay PDF with the same number of pages, drawing field values
-    overlay_path = _temp_overlay_path(input_path)
-    c = canvas.Canvas(overlay_path, pagesize=A4)
+    # 1) Build an overlay PDF with the same number of pages, drawing field values.
+    # Kept in memory so concurrent rows never share (or delete) a temp file.
+    overlay_buf = io.BytesIO()
+    c = canvas.Canvas(overlay_buf, pagesize=A4)
     for page in base.pages:
         annots = page.get(Name('/Annots'), [])
         # Draw field values
@@ -116,7 +118,8 @@ def flatten_pdf(input_path: str, output_path: str) -> None:
     c.save()
 
     # 2) Merge overlay into base
-    overlay = pikepdf.Pdf.open(overlay_path)
+    overlay_buf.seek(0)
+    overlay = pikepdf.Pdf.open(overlay_buf)
     for i, page in enumerate(base.pages):
         page.Contents = base.make_stream(
             page.Contents.read_bytes() + overlay.pages[i].Contents.read_bytes()
@@ -149,11 +152,6 @@ def flatten_pdf(input_path: str, output_path: str) -> None:
     base.save(output_path)
 
 
-def _temp_overlay_path(input_path: str) -> str:
-    base, _ = os.path.splitext(input_path)
-    return f"{base}__overlay.pdf"
-
-
 def _main(argv: list[str]) -> int:
     if len(argv) not in (2, 3, 4):
         print("Usage: python flatten_pdf.py <input.pdf> [output.pdf] [--preserve-values]")
@@ -2,7 +2,7 @@ import os
 from typing import Optional
 import pikepdf
 from automeldung.utils.image.image_converter import image_to_pdf_a4
-import automeldung.config as config
+from automeldung.utils.run.timing import timed
 
 
 def merge_pdfs(paths: list[str], output_path: str) -> str:
@@ -51,15 +51,20 @@ def merge_pdfs(paths: list[str], output_path: str) -> str:
     base.save(output_path)
     return output_path
 
-def ensure_pdf_for_merge(path: str) -> Optional[str]:
-    """Return a PDF path; if input is an image, convert to temp PDF in export folder."""
+def ensure_pdf_for_merge(path: str, export_dir: str, stem: Optional[str] = None) -> Optional[str]:
+    """Return a PDF path; if input is an image, convert to temp PDF in export_dir.
+
+    The temp PDF is named <stem>_as_pdf.pdf (default: the image's name), so
+    rows converting the same image in parallel can use different files.
+    """
     if not path:
         return None
     ext = os.path.splitext(path)[1].lower()
     if ext == ".pdf":
         return path
     if ext in [".jpg", ".jpeg", ".png", ".tif", ".tiff", ".bmp", ".gif"]:
-        base = os.path.splitext(os.path.basename(path))[0]
-        out_pdf = os.path.join(f"{config.export_path}/{base}_as_pdf.pdf")
-        return image_to_pdf_a4(path, out_pdf)
+        base = stem or os.path.splitext(os.path.basename(path))[0]
+        out_pdf = os.path.join(export_dir, f"{base}_as_pdf.pdf")
+        with timed("image_to_pdf_a4"):
+            return image_to_pdf_a4(path, out_pdf)
     return None
\ No newline at end of file
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import threading
+from typing import Callable, Dict, Optional
+
+
+class OutputNames:
+    """Reservation table for the output names of one run in one export folder.
+
+    Names are reserved when a row is validated (in sheet order), so the result
+    does not depend on which pipeline worker finishes first. The first row
+    gets the plain name; a different row with the same name gets the
+    Personalnummer appended, then a counter (_2, _3, ...). A row asking again
+    gets its own name back.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # stem -> owner
+        self._owners: Dict[str, str] = {}
+
+    def reserve(self, stem: str, owner: str, alternative: Optional[str] = None) -> str:
+        """Reserve stem (a file name without .pdf) for owner; returns the name to use."""
+        candidates = [stem]
+        if alternative:
+            candidates.append(f"{stem}_{alternative}")
+        with self._lock:
+            for candidate in candidates:
+                if self._owners.setdefault(candidate, owner) == owner:
+                    return candidate
+            n = 2
+            while True:
+                candidate = f"{stem}_{n}"
+                if self._owners.setdefault(candidate, owner) == owner:
+                    return candidate
+                n += 1
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+
+def write_atomic(path: str, write: Callable[[str], None]) -> str:
+    """Call write(tmp_path) for a temp file next to path, then rename it to path.
+
+    Readers (and a crash half-way) never see a partly written output, and an
+    existing file is replaced in one step.
+    """
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory or ".")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+# Files a row leaves in the export folder until its final PDF is written:
+# filled and merged forms, converted AU images and write_atomic temp files
+_INTERMEDIATE_SUFFIXES = ("_interactive.pdf", "_as_pdf.pdf")
+
+
+def is_intermediate(fname: str) -> bool:
+    return fname.endswith(_INTERMEDIATE_SUFFIXES) or (fname.startswith(".") and fname.endswith(".tmp"))
+
+
+def remove_intermediates(directory: str) -> int:
+    """Delete the intermediate files of rows that never finished; returns how many.
+
+    A worker killed mid-row (hard cancel, crash) cannot clean up after itself.
+    Only call this while no export writes to directory.
+    """
+    removed = 0
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return 0
+    for fname in names:
+        if not is_intermediate(fname):
+            continue
+        try:
+            os.remove(os.path.join(directory, fname))
+            removed += 1
+        except OSError:
+            pass
+    return removed
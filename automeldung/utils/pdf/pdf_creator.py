@@ -1,31 +1,55 @@
 import os
 import pandas as pd
 from PyPDF2 import PdfReader, PdfWriter
-import automeldung.config as config
 from .flatten_pdf import flatten_pdf
-from automeldung.utils.image.image_converter import _find_au_file_by_prefix
+from automeldung.utils.data.au_index import AuIndex
 from .merge_pdf import merge_pdfs, ensure_pdf_for_merge
+from .output_writer import OutputNames, write_atomic
 from automeldung.utils.data.meldung import Meldung
+from automeldung.utils.run.checkpoint import row_key
+from automeldung.utils.run.shared import BufferStream
+from automeldung.utils.run.timing import timed
 
-os.makedirs(config.export_path, exist_ok=True)
+def ensure_export_dir(ctx):
+    """Create the export folder on first use instead of at import time."""
+    os.makedirs(ctx.export_path, exist_ok=True)
 
-def _get_date_tag(meldung):
+def _get_date_tag(meldung, ctx):
     """Generate a date tag for filenames."""
     return (
         meldung.von_date.strftime("%Y-%m-%d") 
         if pd.notna(meldung.von_date) 
-        else pd.Timestamp.now().strftime("%Y-%m-%d")
+        else ctx.now().strftime("%Y-%m-%d")
     )
 
-def _fill_pdf_form(template_path, field_data, output_path):
-    """Fills a PDF form with given data and saves it."""
-    reader = PdfReader(template_path)
-    writer = PdfWriter()
-    writer.append_pages_from_reader(reader)
-    writer.update_page_form_field_values(writer.pages[0], field_data)
-    
-    with open(output_path, "wb") as f:
-        writer.write(f)
+def _read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def get_template(ctx, path):
+    """Template bytes, read once per file version and kept in ctx.caches.
+
+    In an export worker the bytes come from the shared-memory block published
+    by the GUI process (a memoryview, not a copy); readers open it through
+    BufferStream, which does not copy it either.
+    """
+    return ctx.caches.for_file("template", path, _read_bytes, from_shared=lambda buf: buf)
+
+def get_au_index(ctx):
+    """Listing of the AU folder, rebuilt when files are added or removed."""
+    return ctx.caches.for_file("au_index", ctx.au_files_path, AuIndex, from_shared=AuIndex.from_bytes)
+
+def _fill_pdf_form(template, field_data, output_path):
+    """Fills a PDF form (template path or bytes) with given data and saves it."""
+    with timed("fill_pdf_form"):
+        # A reader per call: PyPDF2 readers are not shared between threads
+        reader = PdfReader(BufferStream(template) if isinstance(template, (bytes, memoryview)) else template)
+        writer = PdfWriter()
+        writer.append_pages_from_reader(reader)
+        writer.update_page_form_field_values(writer.pages[0], field_data)
+        
+        with open(output_path, "wb") as f:
+            writer.write(f)
     return output_path
 
 def _cleanup_files(file_list):
@@ -47,8 +71,11 @@ def _cleanup_overlays(directory):
     except OSError:
         pass
 
-def _resolve_au_file(meldung):
-    """Finds and prepares the AU file (PDF or Image) for merging."""
+def _resolve_au_file(meldung, ctx, stem=None):
+    """Finds and prepares the AU file (PDF or Image) for merging.
+
+    An image is converted to <stem>_as_pdf.pdf in the export folder.
+    """
     if not meldung.has_AU:
         return None
         
@@ -56,66 +83,144 @@ def _resolve_au_file(meldung):
     if not au_candidate:
         return None
 
-    config.log(f"Resolving AU file for: {au_candidate}")
+    ctx.log(f"Resolving AU file for: {au_candidate}")
     
     # Direct path provided
     if os.path.exists(au_candidate):
         au_path = au_candidate
     else:
         # Search by prefix in ./au_files (case-insensitive)
-        au_path = _find_au_file_by_prefix(config.au_files_path, au_candidate)
+        au_path = get_au_index(ctx).find(au_candidate)
     
     if au_path:
-        return ensure_pdf_for_merge(au_path)
+        return ensure_pdf_for_merge(au_path, ctx.export_path, stem=stem)
     return None
 
-def create_pdf_form_ohne_AU(row, creation_date):
-    meldung = Meldung(row)
-    date_tag = _get_date_tag(meldung)
-    
-    # Define filenames
-    interactive_filename = os.path.join(config.export_path, f"Meldung_{meldung.nachname}_{date_tag}_interactive.pdf")
-    final_filename = os.path.join(config.export_path, f"Meldung_{meldung.nachname}_{date_tag}.pdf")
+def _plain_persnr(value):
+    """Personalnummer as file name text (1234.0 -> "1234"); None when missing."""
+    if value is None or pd.isna(value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip() or None
 
-    # Prepare data
-    field_data = {
-        "nachname_vorname": meldung.fullname,
-        "pnr": meldung.PNr,
-        "von": meldung.von_date_parsed,
-        "bis": meldung.bis_date_parsed,
-        "wiederaufnahmedatum": meldung.wiederaufnahme_date,
-        "zuletzt": meldung.zuletzt_date,
-        "datum": creation_date,
-    }
+def _is_zwischenmeldung(meldung, ctx):
+    """A Zwischenmeldung (intermediate report) is due while bis_date is still in the future."""
+    if pd.isna(meldung.bis_date):
+        return False
+    # Normalize to midnight for accurate comparison
+    today_midnight = pd.Timestamp(ctx.now()).normalize()
+    return meldung.bis_date.normalize() > today_midnight
+
+def pdf_kind(row):
+    """with_au for the row's PdfJob, or None when the row cannot be exported.
+
+    AU/eAU rows get the mit-AU documents; without AU only sick leaves of up
+    to three days are exported.
+    """
+    has_au = getattr(row, "au", False) or getattr(row, "eau", False)
+    if has_au:
+        return True
+    return False if Meldung.get_days_sum(row) <= 3 else None
+
+# Form fields filled in each template (see fill_stage)
+TEMPLATE_FIELDS = {
+    "vorlage_krankmeldung_ohne_au_path": (
+        "nachname_vorname", "pnr", "von", "bis", "wiederaufnahmedatum", "zuletzt", "datum",
+    ),
+    "vorlage_krankmeldung_mit_au_path": (
+        "nachname_vorname", "pnr", "von_ohne", "bis_ohne", "von_mit", "bis_mit",
+        "eAU_checkbox", "AU_checkbox", "zuletzt", "datum",
+    ),
+    "vorlage_gesundmeldung_path": (
+        "nachname_vorname", "pnr", "von", "bis", "wiederaufnahmedatum", "datum",
+    ),
+}
+
+def template_field_errors(ctx):
+    """Problems with the templates of ctx: unreadable files and missing form fields."""
+    errors = []
+    for name, expected in TEMPLATE_FIELDS.items():
+        path = getattr(ctx, name)
+        try:
+            template = get_template(ctx, path)
+            found = PdfReader(BufferStream(template)).get_fields() or {}
+        except Exception as e:
+            errors.append(f"Template {path}: cannot read ({e})")
+            continue
+        missing = [f for f in expected if f not in found]
+        if missing:
+            errors.append(f"Template {path}: missing form field(s) {', '.join(missing)}")
+    return errors
 
-    # Create interactive PDF
-    _fill_pdf_form(config.vorlage_krankmeldung_ohne_au_path, field_data, interactive_filename)
+class PdfJob:
+    """State of one row while it moves through the PDF stages.
 
-    # Flatten to final output
-    flatten_pdf(interactive_filename, final_filename)
-    config.log(f"PDF saved to: {final_filename}")
+    The stages below (resolve AU, fill, merge, flatten) each take and return the
+    job; the export pipeline runs them as separate steps (PDF_STAGES), so rows
+    can be in different stages at once. Paths and templates come from the
+    job's RunContext.
 
-    # Cleanup
-    _cleanup_files([interactive_filename])
-    _cleanup_overlays(config.export_path)
+    The output name is reserved in names (the run's OutputNames) when the job
+    is created; intermediate files carry the same name, so rows running in
+    parallel never share a file.
+    """
 
-    return final_filename
+    def __init__(self, ctx, row, creation_date, with_au, names=None):
+        self.ctx = ctx
+        self.row = row
+        self.meldung = Meldung(row, ctx)
+        self.creation_date = creation_date
+        self.with_au = with_au
+        self.date_tag = _get_date_tag(self.meldung, ctx)
+        self.is_zwischenmeldung = with_au and _is_zwischenmeldung(self.meldung, ctx)
 
-def create_pdf_form_mit_AU(row, creation_date):
-    meldung = Meldung(row)
-    date_tag = _get_date_tag(meldung)
+        if not with_au:
+            self.final_prefix = "Meldung"
+        else:
+            self.final_prefix = "Zwischenmeldung" if self.is_zwischenmeldung else "Meldung"
+        names = names if names is not None else OutputNames()
+        # Reserved per final name; stem is the part after the prefix, e.g. "Meier_2025-01-02"
+        # or "Meier_2025-01-02_1234" when another row already has that name
+        self.stem = names.reserve(
+            f"{self.final_prefix}_{self.meldung.nachname}_{self.date_tag}",
+            owner=row_key(row),
+            alternative=_plain_persnr(self.meldung.PNr),
+        )[len(self.final_prefix) + 1:]
+        self.final_filename = os.path.join(ctx.export_path, f"{self.final_prefix}_{self.stem}.pdf")
 
-    # Check if this is a Zwischenmeldung (Intermediate Report)
-    # Condition: bis_date is strictly in the future relative to today
-    is_zwischenmeldung = False
-    if pd.notna(meldung.bis_date):
-        # Normalize to midnight for accurate comparison
-        today_midnight = pd.Timestamp.now().normalize()
-        bis_midnight = meldung.bis_date.normalize()
-        if bis_midnight > today_midnight:
-            is_zwischenmeldung = True
+        self.au_pdf = None
+        self.forms = []          # filled interactive forms, in merge order (AU goes after the first)
+        self.merged = None       # merged interactive PDF (mit AU only)
+        self.flatten_source = None
 
-    # 1) Create Krankmeldung (MitAU) interactive PDF
+    def _path(self, prefix, suffix="interactive"):
+        return os.path.join(self.ctx.export_path, f"{prefix}_{self.stem}_{suffix}.pdf")
+
+def resolve_au_stage(job):
+    """Find the AU attachment and convert images to PDF."""
+    if job.with_au:
+        with timed("resolve_au_file"):
+            job.au_pdf = _resolve_au_file(job.meldung, job.ctx, stem=f"{job.final_prefix}_{job.stem}_AU")
+    return job
+
+def fill_stage(job):
+    """Fill the interactive form(s) for the row."""
+    meldung = job.meldung
+    if not job.with_au:
+        field_data = {
+            "nachname_vorname": meldung.fullname,
+            "pnr": meldung.PNr,
+            "von": meldung.von_date_parsed,
+            "bis": meldung.bis_date_parsed,
+            "wiederaufnahmedatum": meldung.wiederaufnahme_date,
+            "zuletzt": meldung.zuletzt_date,
+            "datum": job.creation_date,
+        }
+        job.forms.append(_fill_pdf_form(get_template(job.ctx, job.ctx.vorlage_krankmeldung_ohne_au_path), field_data, job._path("Meldung")))
+        return job
+
+    # 1) Krankmeldung (MitAU)
     krank_data = {
         "nachname_vorname": meldung.fullname,
         "pnr": meldung.PNr,
@@ -126,56 +231,58 @@ def create_pdf_form_mit_AU(row, creation_date):
         "eAU_checkbox": "/Yes" if meldung.has_eAU else "/Off",
         "AU_checkbox": "/Yes" if meldung.has_AU else "/Off",
         "zuletzt": meldung.zuletzt_date,
-        "datum": creation_date,
+        "datum": job.creation_date,
     }
-    
-    prefix = "Zwischenmeldung" if is_zwischenmeldung else "Krankmeldung"
-    krank_interactive = os.path.join(config.export_path, f"{prefix}_{meldung.nachname}_{date_tag}_interactive.pdf")
-    _fill_pdf_form(config.vorlage_krankmeldung_mit_au_path, krank_data, krank_interactive)
-
-    # 2) Resolve optional AU file
-    au_pdf = _resolve_au_file(meldung)
+    prefix = "Zwischenmeldung" if job.is_zwischenmeldung else "Krankmeldung"
+    job.forms.append(_fill_pdf_form(get_template(job.ctx, job.ctx.vorlage_krankmeldung_mit_au_path), krank_data, job._path(prefix)))
 
-    # 3) Create Gesundmeldung interactive PDF (ONLY if NOT Zwischenmeldung)
-    gesund_interactive = None
-    if not is_zwischenmeldung:
+    # 2) Gesundmeldung (ONLY if NOT Zwischenmeldung)
+    if not job.is_zwischenmeldung:
         gesund_data = {
             "nachname_vorname": meldung.fullname,
             "pnr": meldung.PNr,
             "von": meldung.von_date_parsed,
             "bis": meldung.bis_date_parsed,
             "wiederaufnahmedatum": meldung.wiederaufnahme_date,
-            "datum": creation_date,
+            "datum": job.creation_date,
         }
-        gesund_interactive = os.path.join(config.export_path, f"Gesundmeldung_{meldung.nachname}_{date_tag}_interactive.pdf")
-        _fill_pdf_form(config.vorlage_gesundmeldung_path, gesund_data, gesund_interactive)
+        job.forms.append(_fill_pdf_form(get_template(job.ctx, job.ctx.vorlage_gesundmeldung_path), gesund_data, job._path("Gesundmeldung")))
+    return job
 
-    # 4) Merge: Krank + optional AU + [Gesund (if applicable)]
-    final_prefix = "Zwischenmeldung" if is_zwischenmeldung else "Meldung"
-    merged_interactive = os.path.join(config.export_path, f"{final_prefix}_{meldung.nachname}_{date_tag}_merged_interactive.pdf")
-    
-    merge_list = [krank_interactive]
-    if au_pdf:
-        merge_list.append(au_pdf)
-    if gesund_interactive:
-        merge_list.append(gesund_interactive)
-    
-    merge_pdfs(merge_list, merged_interactive)
-
-    # 5) Flatten merged to final output
-    final_filename = os.path.join(config.export_path, f"{final_prefix}_{meldung.nachname}_{date_tag}.pdf")
-    flatten_pdf(merged_interactive, final_filename)
-    config.log(f"PDF saved to: {final_filename}")
-
-    # 6) Cleanup
-    cleanup_list = [krank_interactive, merged_interactive]
-    if gesund_interactive:
-        cleanup_list.append(gesund_interactive)
-    if au_pdf and au_pdf.endswith("_as_pdf.pdf"):
-        cleanup_list.append(au_pdf)
-    
-    _cleanup_files(cleanup_list)
-    _cleanup_overlays(config.export_path)
+def merge_stage(job):
+    """Merge Krank + optional AU + [Gesund]; a single form (ohne AU) is used as is."""
+    if not job.with_au:
+        job.flatten_source = job.forms[0]
+        return job
+    merge_list = job.forms[:1]
+    if job.au_pdf:
+        merge_list.append(job.au_pdf)
+    merge_list.extend(job.forms[1:])
+    job.merged = job._path(job.final_prefix, "merged_interactive")
+    with timed("merge_pdfs"):
+        merge_pdfs(merge_list, job.merged)
+    job.flatten_source = job.merged
+    return job
 
-    return final_filename
+def flatten_stage(job):
+    """Flatten the interactive PDF into the final output file (temp file + rename)."""
+    with timed("flatten_pdf"):
+        write_atomic(job.final_filename, lambda tmp_path: flatten_pdf(job.flatten_source, tmp_path))
+    return job
+
+def cleanup_job(job):
+    """Remove the intermediate files of a job (finished, failed or cancelled)."""
+    cleanup_list = list(job.forms)
+    if job.merged:
+        cleanup_list.append(job.merged)
+    if job.au_pdf and job.au_pdf.endswith("_as_pdf.pdf"):
+        cleanup_list.append(job.au_pdf)
+    _cleanup_files(cleanup_list)
 
+# Stage order of the export pipeline
+PDF_STAGES = [
+    ("resolve_au", resolve_au_stage),
+    ("fill", fill_stage),
+    ("merge", merge_stage),
+    ("flatten", flatten_stage),
+]
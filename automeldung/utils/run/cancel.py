@@ -0,0 +1,33 @@
+import threading
+
+
+class ExportCancelled(Exception):
+    """Raised inside the exporter once the user has requested a cancel."""
+
+
+class CancelToken:
+    """Thread-safe flag shared between the GUI and the export worker.
+
+    The GUI calls cancel(); the exporter calls raise_if_cancelled() between rows
+    and between the PDF stages of a row, so a run stops at the next safe point.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise ExportCancelled("Export cancelled by user.")
+
+
+def check_cancelled(token) -> None:
+    """Convenience helper that accepts None (no cancellation support)."""
+    if token is not None:
+        token.raise_if_cancelled()
@@ -0,0 +1,109 @@
+import os
+import json
+import threading
+from typing import Optional
+
+CHECKPOINT_FILENAME = ".automeldung_checkpoint.jsonl"
+
+
+def row_key(row) -> str:
+    """Identify a row by position and person so edits to other rows keep the checkpoint valid."""
+    parts = [
+        getattr(row, "Index", ""),
+        getattr(row, "nachname", ""),
+        getattr(row, "vorname", ""),
+        getattr(row, "von", ""),
+    ]
+    return "|".join(str(p).strip() for p in parts)
+
+
+class Checkpoint:
+    """Tracks completed rows of an export so a cancelled run can be resumed.
+
+    Stored as an append-only journal in the export folder: a header line with
+    the source workbook, then one JSON-encoded row key per line, appended and
+    flushed as each row completes. load() drops a line cut off by a crash and
+    compacts the journal (temp file + rename); close() releases the file.
+    """
+
+    def __init__(self, export_dir: str, source_path: str, done: Optional[list] = None):
+        self.path = os.path.join(export_dir, CHECKPOINT_FILENAME)
+        self.source_path = os.path.abspath(source_path) if source_path else ""
+        self._done = set(done or [])
+        self._lock = threading.Lock()
+        self._journal = None
+
+    @classmethod
+    def load(cls, export_dir: str, source_path: str) -> "Checkpoint":
+        """Load the checkpoint for source_path; returns an empty one if missing or for another file."""
+        cp = cls(export_dir, source_path)
+        try:
+            with open(cp.path, "r", encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                if header.get("source") != cp.source_path:
+                    return cp
+                for line in f:
+                    try:
+                        cp._done.add(json.loads(line))
+                    except ValueError:
+                        # Last line of a run that stopped mid-write
+                        pass
+        except (OSError, ValueError, AttributeError):
+            return cp
+        cp._compact()
+        return cp
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def is_done(self, row) -> bool:
+        return row_key(row) in self._done
+
+    def mark_done(self, row) -> None:
+        key = row_key(row)
+        with self._lock:
+            if key in self._done:
+                return
+            self._done.add(key)
+            try:
+                if self._journal is None:
+                    self._compact()
+                    self._journal = open(self.path, "a", encoding="utf-8")
+                self._journal.write(json.dumps(key) + "\n")
+                self._journal.flush()
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._close_journal()
+            self._done.clear()
+            try:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_journal()
+
+    def _close_journal(self) -> None:
+        if self._journal is not None:
+            try:
+                self._journal.close()
+            except OSError:
+                pass
+            self._journal = None
+
+    def _compact(self) -> None:
+        # Header plus the current keys, replacing the journal in one rename
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"source": self.source_path}) + "\n")
+                f.writelines(json.dumps(key) + "\n" for key in sorted(self._done))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
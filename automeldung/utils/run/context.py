@@ -0,0 +1,117 @@
+import os
+import threading
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+import automeldung.config as config
+
+
+class RunCaches:
+    """Lookup tables (e.g. Kontaktdaten) loaded once and shared by all rows.
+
+    Entries are keyed by the caller (typically kind + source path), so one
+    instance can be shared by several contexts/jobs without mixing sources.
+    A warm worker keeps its instance across runs; for_file() entries are
+    reloaded when their file or folder changes.
+
+    `shared` is set in export worker processes to the SharedView of blocks
+    published by the GUI process (automeldung.utils.run.shared); for_file()
+    then takes data from there before loading the file itself.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Any, Any] = {}
+        # (kind, path) -> (mtime, value, came_from_shared)
+        self._files: Dict[Any, tuple] = {}
+        self.shared = None
+
+    def get(self, key, load: Callable[[], Any]):
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = load()
+            return self._entries[key]
+
+    def for_file(self, kind: str, path, load: Callable[[Any], Any], from_shared: Optional[Callable] = None):
+        """load(path), cached until the modification time of path changes.
+
+        from_shared(buffer) builds the value from a shared block instead, when
+        one is published for this file version.
+        """
+        try:
+            mtime = os.path.getmtime(path)
+        except (OSError, TypeError):
+            mtime = None
+        with self._lock:
+            entry = self._files.get((kind, path))
+            if entry is None or entry[0] != mtime:
+                buf = None
+                if from_shared is not None and self.shared is not None:
+                    buf = self.shared.lookup(kind, path, mtime)
+                if buf is not None:
+                    entry = (mtime, from_shared(buf), True)
+                else:
+                    entry = (mtime, load(path), False)
+                self._files[(kind, path)] = entry
+            return entry[1]
+
+    def local_entries(self, kind: str):
+        """(path, mtime, value) of for_file() entries of kind that were loaded here, not shared."""
+        with self._lock:
+            return [
+                (path, mtime, value)
+                for (entry_kind, path), (mtime, value, shared) in self._files.items()
+                if entry_kind == kind and not shared
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._files.clear()
+
+
+@dataclass(frozen=True)
+class RunContext:
+    """Everything one export run reads: paths, options, clock, logger and caches.
+
+    Built once before the run and passed explicitly to main_exporter and the
+    PDF helpers, so concurrent runs in one process do not share mutable module
+    globals. Field names match the variables in automeldung.config.
+    """
+
+    krankmeldungsliste_path: Optional[str] = None
+    krankmeldungsliste_sheet_name: Optional[str] = None
+    kontaktdaten_path: Optional[str] = None
+    kontaktdaten_sheet_name: Optional[str] = None
+    vorlage_krankmeldung_ohne_au_path: Optional[str] = None
+    vorlage_krankmeldung_mit_au_path: Optional[str] = None
+    vorlage_gesundmeldung_path: Optional[str] = None
+    au_files_path: Optional[str] = None
+    export_path: Optional[str] = None
+    creation_date: Optional[str] = None
+    limit_rows: int = 15
+    pipeline_queue_size: int = 8
+    pipeline_workers: int = 2
+    timing_report: bool = True
+    log: Callable[[str], None] = field(default=config.log, compare=False, repr=False)
+    now: Callable[[], datetime] = field(default=datetime.now, compare=False, repr=False)
+    caches: RunCaches = field(default_factory=RunCaches, compare=False, repr=False)
+
+    @classmethod
+    def from_config(cls, **overrides) -> "RunContext":
+        """Snapshot the current automeldung.config values (plus overrides)."""
+        names = {f.name for f in fields(cls)} - {"log", "now", "caches"}
+        values = {name: getattr(config, name) for name in names if hasattr(config, name)}
+        values.update(overrides)
+        return cls(**values)
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any], **overrides) -> "RunContext":
+        """Config defaults overlaid with a settings dict (same keys as app_settings.json)."""
+        ctx = cls.from_config()
+        return replace(ctx, **{**config.config_values(settings), **overrides})
+
+    def creation_date_text(self) -> str:
+        """The configured creation date, or today's date (DD.MM.YYYY)."""
+        return self.creation_date or self.now().strftime("%d.%m.%Y")
@@ -0,0 +1,276 @@
+import gc
+import queue
+import threading
+import multiprocessing
+from dataclasses import fields
+from typing import Callable, Optional
+
+from automeldung.utils.run.cancel import CancelToken, ExportCancelled
+
+# Seconds between checks of the cancel token / process health while waiting for messages
+_POLL_INTERVAL = 0.2
+# Seconds a worker gets to exit after "stop" before it is terminated
+_STOP_TIMEOUT = 5.0
+
+# RunContext fields that are not sent to the worker (it builds its own)
+_LOCAL_FIELDS = ("log", "now", "caches")
+
+
+class EngineError(Exception):
+    """The export process failed or exited unexpectedly."""
+
+
+def context_fields(ctx) -> dict:
+    """The picklable part of a RunContext (paths and options)."""
+    return {f.name: getattr(ctx, f.name) for f in fields(ctx) if f.name not in _LOCAL_FIELDS}
+
+
+def _worker_main(conn):
+    """Entry point of the export process.
+
+    Messages from the parent: ("run", job), ("preload", context, manifest),
+    ("cancel",), ("stop",).
+    Messages to the parent: ("ready",), ("log", msg), ("event", event),
+    ("publish", kind, path, mtime, data), ("done", stats), ("cancelled",),
+    ("error", text).
+    """
+    from automeldung.main_exporter import main_exporter, warm_up_backends, preload_lookups
+    from automeldung.dry_run import dry_run
+    from automeldung.utils.run.context import RunContext, RunCaches
+    from automeldung.utils.run.shared import SharedView, WORKER_PUBLISHED_KINDS
+
+    send_lock = threading.Lock()
+    jobs = queue.Queue()
+    current = {"token": None}
+
+    def send(msg):
+        with send_lock:
+            try:
+                conn.send(msg)
+            except (OSError, EOFError):
+                pass
+
+    def read():
+        # Runs next to the export so cancel requests arrive while a job is busy
+        while True:
+            try:
+                msg = conn.recv()
+            except (OSError, EOFError):
+                msg = ("stop",)
+            kind = msg[0]
+            if kind == "cancel":
+                token = current["token"]
+                if token is not None:
+                    token.cancel()
+            elif kind in ("run", "preload"):
+                jobs.put(msg)
+            elif kind == "stop":
+                jobs.put(None)
+                return
+
+    threading.Thread(target=read, name="engine-reader", daemon=True).start()
+    try:
+        warm_up_backends()
+    except Exception as ex:
+        # The first run reports the real import error
+        send(("log", f"warn: backend warm-up failed: {ex}"))
+    send(("ready",))
+
+    # Kept for the lifetime of the process, so a warm worker reuses lookups
+    caches = RunCaches()
+    caches.shared = SharedView()
+    published = set()
+
+    def publish_lookups():
+        # Lookups this worker had to build itself go to the parent, which
+        # shares them with the other workers
+        for kind in WORKER_PUBLISHED_KINDS:
+            for path, mtime, value in caches.local_entries(kind):
+                if mtime is None or (kind, path, mtime) in published:
+                    continue
+                published.add((kind, path, mtime))
+                send(("publish", kind, path, mtime, value.to_bytes()))
+
+    while True:
+        msg = jobs.get()
+        if msg is None:
+            break
+        if msg[0] == "preload":
+            caches.shared.manifest = msg[2]
+            preload_lookups(RunContext(**msg[1], log=lambda m: None, caches=caches))
+            publish_lookups()
+            continue
+        job = msg[1]
+        caches.shared.manifest = job["shared"]
+        token = CancelToken()
+        current["token"] = token
+        ctx = RunContext(**job["context"], log=lambda m: send(("log", str(m))), caches=caches)
+        try:
+            if job.get("dry_run"):
+                stats = dry_run(ctx, cancel_token=token)
+            else:
+                stats = main_exporter(
+                    ctx,
+                    cancel_token=token,
+                    resume=job["resume"],
+                    on_event=lambda event: send(("event", event)),
+                    profile=job["profile"],
+                    snapshot_every=job["snapshot_every"],
+                )
+            result = ("done", stats)
+        except ExportCancelled:
+            result = ("cancelled",)
+        except Exception as ex:
+            result = ("error", f"{type(ex).__name__}: {ex}")
+        finally:
+            current["token"] = None
+        # Before the result, so the parent has them when run() returns
+        publish_lookups()
+        send(result)
+    # Views into the shared blocks go first, or detaching fails at exit. PDF
+    # readers over BufferStream sit in reference cycles, so collect them too.
+    caches.clear()
+    gc.collect()
+    caches.shared.close()
+    conn.close()
+
+
+class ExportProcess:
+    """Runs exports in a separate worker process and streams progress back.
+
+    The PDF work then neither holds the GUI's GIL nor takes the GUI down when
+    a PDF library crashes. Log lines and progress events arrive over a pipe
+    and are handed to ctx.log / on_event on the calling thread.
+
+    The process stays alive between runs (warm: backends imported, lookups
+    cached); start() and preload() may be called ahead of the first run. cancel_token
+    cancels cooperatively, terminate() kills the process (hard cancel).
+
+    With a SharedStore, each job carries its manifest so the worker attaches
+    to the published templates and lookups, and lookups the worker builds are
+    published to it.
+    """
+
+    def __init__(self, store=None):
+        self.store = store
+        self._process = None
+        self._conn = None
+        self._send_lock = threading.Lock()
+        self._terminated = False
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def start(self):
+        if self.alive:
+            return
+        mp = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = mp.Pipe()
+        process = mp.Process(target=_worker_main, args=(child_conn,), name="automeldung-export", daemon=True)
+        process.start()
+        child_conn.close()
+        self._process, self._conn = process, parent_conn
+        self._terminated = False
+
+    def preload(self, ctx):
+        """Start the worker and let it load the lookups/templates of ctx in the background."""
+        self.start()
+        self._send(("preload", context_fields(ctx), self._manifest()))
+
+    def run(self, ctx, cancel_token=None, resume=False, on_event: Optional[Callable] = None,
+            profile=False, snapshot_every=0, dry_run=False):
+        """Run one export in the worker; returns its stats like main_exporter.
+
+        With dry_run, runs automeldung.dry_run.dry_run instead and returns its
+        DryRunResult.
+
+        Raises ExportCancelled when cancelled (or terminated) and EngineError
+        when the export failed or the process died.
+        """
+        self.start()
+        job = {
+            "context": context_fields(ctx),
+            "resume": resume,
+            "profile": profile,
+            "snapshot_every": snapshot_every,
+            "shared": self._manifest(),
+            "dry_run": dry_run,
+        }
+        self._send(("run", job))
+        cancel_sent = False
+        while True:
+            if cancel_token is not None and cancel_token.cancelled and not cancel_sent:
+                self._send(("cancel",))
+                cancel_sent = True
+            try:
+                if not self._conn.poll(_POLL_INTERVAL):
+                    if not self.alive:
+                        raise EOFError
+                    continue
+                msg = self._conn.recv()
+            except (OSError, EOFError):
+                self._reset()
+                if self._terminated:
+                    raise ExportCancelled("Export process stopped.")
+                raise EngineError("Export process exited unexpectedly.")
+            kind = msg[0]
+            if kind == "log":
+                ctx.log(msg[1])
+            elif kind == "event":
+                if on_event is not None:
+                    on_event(msg[1])
+            elif kind == "publish":
+                self._publish(*msg[1:])
+            elif kind == "done":
+                return msg[1]
+            elif kind == "cancelled":
+                raise ExportCancelled("Export cancelled by user.")
+            elif kind == "error":
+                raise EngineError(msg[1])
+
+    def terminate(self):
+        """Hard cancel: kill the worker process (a running export stops at once)."""
+        process = self._process
+        if process is None:
+            return
+        self._terminated = True
+        process.terminate()
+        process.join(_STOP_TIMEOUT)
+
+    def close(self):
+        """Ask the worker to exit; kill it if it does not."""
+        process = self._process
+        if process is None:
+            return
+        self._send(("stop",))
+        process.join(_STOP_TIMEOUT)
+        if process.is_alive():
+            process.terminate()
+        self._reset()
+
+    def _manifest(self) -> dict:
+        return self.store.manifest() if self.store is not None else {}
+
+    def _publish(self, kind, path, mtime, data):
+        if self.store is None:
+            return
+        try:
+            self.store.publish(kind, path, mtime, data)
+        except (OSError, ValueError):
+            pass
+
+    def _send(self, msg):
+        with self._send_lock:
+            try:
+                self._conn.send(msg)
+            except (OSError, AttributeError):
+                pass
+
+    def _reset(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+        self._process, self._conn = None, None
@@ -0,0 +1,131 @@
+import time
+from dataclasses import dataclass, asdict, field
+from typing import Callable, Optional
+
+
+@dataclass(frozen=True)
+class ExportEvent:
+    """Base class of the progress events emitted by main_exporter."""
+
+    event_name = "event"
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["event"] = type(self).event_name
+        return data
+
+
+@dataclass(frozen=True)
+class RunStarted(ExportEvent):
+    event_name = "run_started"
+    total: int
+
+
+@dataclass(frozen=True)
+class RowStarted(ExportEvent):
+    event_name = "row_started"
+    index: int
+    name: str
+
+
+@dataclass(frozen=True)
+class StageFinished(ExportEvent):
+    event_name = "stage_finished"
+    index: int
+    stage: str
+    duration: float
+
+
+@dataclass(frozen=True)
+class RowDone(ExportEvent):
+    event_name = "row_done"
+    index: int
+    name: str
+    output_path: str
+
+
+@dataclass(frozen=True)
+class RowFailed(ExportEvent):
+    event_name = "row_failed"
+    index: int
+    name: str
+    reason: str
+
+
+@dataclass(frozen=True)
+class RunFinished(ExportEvent):
+    event_name = "run_finished"
+    stats: dict = field(default_factory=dict)
+
+
+def safe_emitter(on_event: Optional[Callable[[ExportEvent], None]]) -> Callable[[ExportEvent], None]:
+    """Wrap a consumer callback so a failing consumer never breaks the export.
+
+    Events are emitted from the pipeline's worker threads; consumers must be
+    thread-safe (the GUI and CLI only assign values and schedule redraws).
+    """
+    if on_event is None:
+        return lambda event: None
+
+    def emit(event: ExportEvent):
+        try:
+            on_event(event)
+        except Exception:
+            pass
+
+    return emit
+
+
+class ProgressTracker:
+    """Turns the event stream into counts, rows/sec and an ETA.
+
+    Shared by the GUI progress bar and the CLI so neither has to parse log text.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.started_at = None
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+
+    def update(self, event: ExportEvent) -> None:
+        if isinstance(event, RunStarted):
+            self.started_at = self._clock()
+            self.total = event.total
+            self.done = self.failed = 0
+        elif isinstance(event, RowDone):
+            self.done += 1
+        elif isinstance(event, RowFailed):
+            self.failed += 1
+
+    @property
+    def completed(self) -> int:
+        return self.done + self.failed
+
+    @property
+    def fraction(self) -> float:
+        return min(1.0, self.completed / self.total) if self.total else 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        elapsed = self._clock() - self.started_at
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        rate = self.rows_per_sec
+        if not rate:
+            return None
+        return max(0, self.total - self.completed) / rate
+
+    def describe(self) -> str:
+        """Short human-readable progress line, e.g. '12/40 rows - 3.2 rows/s - ETA 0:08'."""
+        text = f"{self.completed}/{self.total} rows - {self.rows_per_sec:.1f} rows/s"
+        eta = self.eta_seconds
+        if eta is not None:
+            minutes, seconds = divmod(int(round(eta)), 60)
+            text += f" - ETA {minutes}:{seconds:02d}"
+        return text
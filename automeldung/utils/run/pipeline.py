@@ -0,0 +1,194 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+
+from automeldung.utils.run.cancel import ExportCancelled
+
+# Marks the end of the input on a queue; one is sent per downstream worker
+_DONE = object()
+
+
+class Stage:
+    """One step of the export pipeline, run by `workers` concurrent workers.
+
+    fn takes an item and returns the item for the next stage, or None to drop it
+    (e.g. an invalid row). fn runs on the pipeline's executor, never on the loop.
+    """
+
+    def __init__(self, name: str, fn: Callable, workers: int = 1):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, int(workers))
+
+
+class StageMetrics:
+    """Counters and queue-depth samples collected for one stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.depth_samples = 0
+        self.depth_total = 0
+        self.depth_max = 0
+
+    def sample_depth(self, depth: int):
+        self.depth_samples += 1
+        self.depth_total += depth
+        self.depth_max = max(self.depth_max, depth)
+
+    @property
+    def depth_avg(self) -> float:
+        return self.depth_total / self.depth_samples if self.depth_samples else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "stage": self.name,
+            "processed": self.processed,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy_seconds, 4),
+            "queue_depth_avg": round(self.depth_avg, 2),
+            "queue_depth_max": self.depth_max,
+        }
+
+
+class Pipeline:
+    """Runs items through a chain of stages connected by bounded asyncio queues.
+
+    Every stage is a group of workers that pull from the stage's inbox queue and
+    push to the next one. Because the queues are bounded, a slow stage makes the
+    upstream stages wait instead of piling up rows in memory, so memory stays
+    flat however large the sheet is. Blocking work (PDF libraries, disk I/O)
+    runs on a thread pool so several stages make progress at the same time.
+
+    A per-stage queue-depth average/maximum is collected in `metrics`; the stage
+    in front of the fullest queue is the bottleneck.
+    """
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        queue_size: int = 8,
+        cancel_token=None,
+        on_error: Optional[Callable] = None,
+        discard: Optional[Callable] = None,
+        on_stage_finished: Optional[Callable] = None,
+        executor: Optional[Executor] = None,
+    ):
+        self.stages = stages
+        self.queue_size = max(1, int(queue_size))
+        self.cancel_token = cancel_token
+        self.on_error = on_error
+        self.discard = discard
+        self.on_stage_finished = on_stage_finished
+        # Shared pool (e.g. of the GUI's job scheduler); owned per run when None
+        self.executor = executor
+        self.metrics = [StageMetrics(s.name) for s in stages]
+        self._cancelled = False
+
+    def run(self, items: Iterable) -> List:
+        """Run all items through the pipeline; returns the outputs of the last stage.
+
+        Raises ExportCancelled if the cancel token fired (or a stage raised it).
+        Items already in flight are drained and handed to `discard`.
+        """
+        if self.executor is not None:
+            results = asyncio.run(self._run(items, self.executor))
+        else:
+            workers = sum(s.workers for s in self.stages)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export") as executor:
+                results = asyncio.run(self._run(items, executor))
+        if self._cancelled:
+            raise ExportCancelled("Export cancelled by user.")
+        return results
+
+    def summary(self) -> str:
+        parts = [
+            f"{m.name}: {m.processed} ok/{m.failed} failed, busy {m.busy_seconds:.2f}s, "
+            f"queue avg {m.depth_avg:.1f} max {m.depth_max}"
+            for m in self.metrics
+        ]
+        return "Pipeline stats -- " + " | ".join(parts)
+
+    # --- internals ---
+
+    def _is_cancelled(self) -> bool:
+        if not self._cancelled and self.cancel_token is not None and self.cancel_token.cancelled:
+            self._cancelled = True
+        return self._cancelled
+
+    def _drop(self, item):
+        if self.discard is not None:
+            try:
+                self.discard(item)
+            except Exception:
+                pass
+
+    async def _run(self, items: Iterable, executor) -> List:
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results: List = []
+        # Number of workers of each stage still running; the last one to finish
+        # forwards the end-of-input markers to the next stage.
+        remaining = [s.workers for s in self.stages]
+
+        async def put(index: int, item):
+            await queues[index].put(item)
+            self.metrics[index].sample_depth(queues[index].qsize())
+
+        async def feed():
+            for item in items:
+                if self._is_cancelled():
+                    break
+                await put(0, item)
+            for _ in range(self.stages[0].workers):
+                await queues[0].put(_DONE)
+
+        async def work(index: int):
+            loop = asyncio.get_running_loop()
+            stage = self.stages[index]
+            metrics = self.metrics[index]
+            is_last = index == len(self.stages) - 1
+            while True:
+                item = await queues[index].get()
+                if item is _DONE:
+                    break
+                if self._is_cancelled():
+                    self._drop(item)
+                    continue
+                started = time.perf_counter()
+                try:
+                    out = await loop.run_in_executor(executor, stage.fn, item)
+                except ExportCancelled:
+                    self._cancelled = True
+                    self._drop(item)
+                    continue
+                except Exception as exc:
+                    metrics.failed += 1
+                    if self.on_error is not None:
+                        self.on_error(stage.name, item, exc)
+                    continue
+                finally:
+                    duration = time.perf_counter() - started
+                    metrics.busy_seconds += duration
+                metrics.processed += 1
+                if self.on_stage_finished is not None:
+                    self.on_stage_finished(stage.name, item, duration)
+                if out is None:
+                    continue
+                if is_last:
+                    results.append(out)
+                else:
+                    await put(index + 1, out)
+
+            remaining[index] -= 1
+            if remaining[index] == 0 and not is_last:
+                for _ in range(self.stages[index + 1].workers):
+                    await queues[index + 1].put(_DONE)
+
+        tasks = [asyncio.create_task(feed())]
+        for i, stage in enumerate(self.stages):
+            tasks.extend(asyncio.create_task(work(i)) for _ in range(stage.workers))
+        await asyncio.gather(*tasks)
+        return results
@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from datetime import datetime
+
+
+# Before 3.12 a cProfile.Profile only sees the thread that enabled it; from 3.12
+# on it is built on sys.monitoring, which is process-wide and allows one active
+# profiler, so a single profiler already covers the worker threads.
+_PER_THREAD_PROFILES = sys.version_info < (3, 12)
+
+
+class ExportProfiler:
+    """cProfile (+ optional tracemalloc) for one export run.
+
+    The export pipeline runs its stages on worker threads. On Python < 3.12
+    cProfile only sees the enabling thread, so every worker thread gets its own
+    profiler (see wrap()) and all of them are merged into one .pstats file.
+
+    With snapshot_every > 0 a tracemalloc snapshot is taken every N finished rows
+    and the top allocation differences are appended to a text file.
+    """
+
+    def __init__(self, out_dir: str, snapshot_every: int = 0, top_allocations: int = 10):
+        self.out_dir = out_dir
+        self.snapshot_every = max(0, int(snapshot_every or 0))
+        self.top_allocations = top_allocations
+        self.stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.pstats_path = os.path.join(out_dir, f"profile_{self.stamp}.pstats")
+        self.alloc_path = os.path.join(out_dir, f"profile_{self.stamp}_alloc.txt") if self.snapshot_every else None
+        self._profiles = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._rows_done = 0
+        self._last_snapshot = None
+        self._started_tracemalloc = False
+
+    def start(self):
+        """Start profiling; raises ValueError (3.12+) while another profiler is
+        active in this process, before anything else has been started."""
+        self._thread_profile().enable()
+        if self.snapshot_every and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.snapshot_every:
+            self._last_snapshot = tracemalloc.take_snapshot()
+
+    def wrap(self, fn):
+        """Run fn under the calling thread's profiler."""
+        if not _PER_THREAD_PROFILES:
+            return fn
+
+        def run(*args, **kwargs):
+            profile = self._thread_profile()
+            profile.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profile.disable()
+        return run
+
+    def row_done(self):
+        if not self.snapshot_every:
+            return
+        with self._lock:
+            self._rows_done += 1
+            if self._rows_done % self.snapshot_every:
+                return
+            snapshot = tracemalloc.take_snapshot()
+            diffs = snapshot.compare_to(self._last_snapshot, "lineno")[: self.top_allocations]
+            self._last_snapshot = snapshot
+            os.makedirs(self.out_dir, exist_ok=True)
+            with open(self.alloc_path, "a", encoding="utf-8") as f:
+                f.write(f"--- after {self._rows_done} rows ({time.strftime('%H:%M:%S')}) ---\n")
+                for diff in diffs:
+                    f.write(f"{diff}\n")
+
+    def finish(self) -> pstats.Stats:
+        """Stop profiling, write the .pstats file and return the merged stats."""
+        self._thread_profile().disable()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        os.makedirs(self.out_dir, exist_ok=True)
+        with self._lock:
+            profiles = list(self._profiles)
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            try:
+                stats.add(profile)
+            except TypeError:
+                # Thread never ran a profiled call, so it has no stats to merge
+                pass
+        stats.dump_stats(self.pstats_path)
+        return stats
+
+    def summary(self, stats: pstats.Stats, limit: int = 20) -> str:
+        """Top `limit` functions by own time, one line each."""
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+        lines = [f"Top {len(rows)} functions by own time:"]
+        for (filename, lineno, func), (_, ncalls, tottime, cumtime, _) in rows:
+            location = f"{os.path.basename(filename)}:{lineno}" if lineno else filename
+            lines.append(f"  {tottime:8.3f}s own {cumtime:8.3f}s cum {ncalls:>8} calls  {func} ({location})")
+        return "\n".join(lines)
+
+    def _thread_profile(self) -> cProfile.Profile:
+        profile = getattr(self._local, "profile", None)
+        if profile is None:
+            profile = cProfile.Profile()
+            self._local.profile = profile
+            with self._lock:
+                self._profiles.append(profile)
+        return profile
+
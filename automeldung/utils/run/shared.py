@@ -0,0 +1,193 @@
+import io
+import os
+import sys
+import threading
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+# Attaching must not register the block with the resource tracker (3.13+);
+# the GUI process owns and unlinks every block.
+_ATTACH_KWARGS = {"track": False} if sys.version_info >= (3, 13) else {}
+
+# Kinds built by a worker (they need pandas) and sent back for publishing
+WORKER_PUBLISHED_KINDS = ("kontaktdaten",)
+
+
+class BufferStream(io.RawIOBase):
+    """Read-only, seekable binary stream over a buffer such as a SharedView block.
+
+    io.BytesIO(view) copies the whole buffer first; this copies only the
+    bytes that are read, so a reader over a shared template stays in place.
+    """
+
+    def __init__(self, buf):
+        self._buf = memoryview(buf).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._buf)}[whence]
+        if base + offset < 0:
+            raise ValueError("negative seek position")
+        self._pos = base + offset
+        return self._pos
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._buf) if size is None or size < 0 else min(len(self._buf), self._pos + size)
+        data = bytes(self._buf[self._pos:end])
+        self._pos = max(self._pos, end)
+        return data
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def readinto(self, b) -> int:
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+
+def _mtime(path) -> Optional[float]:
+    try:
+        return os.path.getmtime(path)
+    except (OSError, TypeError):
+        return None
+
+
+class SharedStore:
+    """Lookup data published once in shared memory for all export workers.
+
+    Lives in the GUI process. Template bytes and the AU folder listing are
+    read here; the Kontaktdaten index is built by the first worker that needs
+    it and published here, so every other worker attaches instead of reading
+    the workbook again. manifest() goes out with each job.
+
+    Blocks are replaced when their file changes and unlinked by close().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (kind, path) -> (mtime, SharedMemory, size)
+        self._blocks: Dict[Tuple[str, str], tuple] = {}
+
+    def publish(self, kind: str, path: str, mtime, data: bytes):
+        with self._lock:
+            current = self._blocks.get((kind, path))
+            if current is not None and current[0] == mtime:
+                return
+            block = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+            block.buf[:len(data)] = data
+            self._blocks[(kind, path)] = (mtime, block, len(data))
+        if current is not None:
+            # Workers still attached keep their mapping until they detach
+            self._release(current[1])
+
+    def refresh(self, ctx):
+        """Publish the templates and AU listing of ctx (skipped while unchanged)."""
+        from automeldung.utils.data.au_index import AuIndex
+
+        for path in (
+            ctx.vorlage_krankmeldung_ohne_au_path,
+            ctx.vorlage_krankmeldung_mit_au_path,
+            ctx.vorlage_gesundmeldung_path,
+        ):
+            mtime = _mtime(path)
+            if mtime is None or self._has("template", path, mtime):
+                continue
+            try:
+                with open(path, "rb") as f:
+                    self.publish("template", path, mtime, f.read())
+            except OSError:
+                pass
+
+        folder = ctx.au_files_path
+        mtime = _mtime(folder)
+        if mtime is not None and not self._has("au_index", folder, mtime):
+            self.publish("au_index", folder, mtime, AuIndex(folder).to_bytes())
+
+    def manifest(self) -> dict:
+        """{(kind, path): (mtime, block name, size)} for SharedView."""
+        with self._lock:
+            return {key: (mtime, block.name, size) for key, (mtime, block, size) in self._blocks.items()}
+
+    def close(self):
+        with self._lock:
+            blocks, self._blocks = list(self._blocks.values()), {}
+        for _, block, _ in blocks:
+            self._release(block)
+
+    def _has(self, kind, path, mtime) -> bool:
+        with self._lock:
+            current = self._blocks.get((kind, path))
+            return current is not None and current[0] == mtime
+
+    @staticmethod
+    def _release(block):
+        try:
+            block.close()
+            block.unlink()
+        except (OSError, BufferError):
+            pass
+
+
+class SharedView:
+    """Worker-side access to the blocks listed in a SharedStore manifest.
+
+    lookup() returns a read-only memoryview into the shared block (no copy)
+    when the published version matches the file's current mtime. A block
+    replaced in the manifest is detached as soon as no view into it is left.
+    """
+
+    def __init__(self):
+        self.manifest: dict = {}
+        # (kind, path) -> (block name, SharedMemory)
+        self._attached: Dict[Tuple[str, str], tuple] = {}
+        # Replaced blocks that still had views when they were superseded
+        self._superseded: List[shared_memory.SharedMemory] = []
+
+    def lookup(self, kind: str, path, mtime) -> Optional[memoryview]:
+        entry = self.manifest.get((kind, path))
+        if entry is None or entry[0] != mtime:
+            return None
+        _, name, size = entry
+        current = self._attached.get((kind, path))
+        if current is not None and current[0] == name:
+            block = current[1]
+        else:
+            try:
+                block = shared_memory.SharedMemory(name=name, create=False, **_ATTACH_KWARGS)
+            except (OSError, ValueError):
+                return None
+            self._attached[(kind, path)] = (name, block)
+            if current is not None:
+                self._superseded.append(current[1])
+        self._superseded = [b for b in self._superseded if not _detach(b)]
+        return block.buf[:size].toreadonly()
+
+    def close(self) -> bool:
+        """Detach from every block whose views are released; False if some are still in use.
+
+        Blocks that could not be detached stay listed, so a later close() retries them.
+        """
+        for key, (_, block) in list(self._attached.items()):
+            if _detach(block):
+                del self._attached[key]
+        self._superseded = [b for b in self._superseded if not _detach(b)]
+        return not self._attached and not self._superseded
+
+
+def _detach(block) -> bool:
+    # Fails while a view into the block is alive; close() can be retried then
+    try:
+        block.close()
+    except BufferError:
+        return False
+    return True
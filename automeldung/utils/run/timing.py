@@ -0,0 +1,173 @@
+import os
+import csv
+import json
+import time
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional
+
+# Stage names used in the run report, in pipeline order
+REPORT_STAGES = [
+    "excel_load",
+    "kontaktdaten_lookup",
+    "validation",
+    "fill_pdf_form",
+    "resolve_au_file",
+    "image_to_pdf_a4",
+    "merge_pdfs",
+    "flatten_pdf",
+    "final_write",
+]
+
+
+class _NullStage:
+    """Shared no-op context manager handed out while timing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+_thread_state = threading.local()
+
+
+class _Stage:
+    __slots__ = ("timer", "name", "started")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.add(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def _percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class StageTimer:
+    """Collects stage durations and bytes written for one export run.
+
+    Durations are grouped by the row currently handled on the calling thread
+    (see set_current_row) so the report can give p50/p95 per row; stages that
+    are not tied to a row (the Excel load) count as a single sample.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.started_at = time.perf_counter()
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+        # stage -> row key -> summed seconds
+        self._samples = defaultdict(lambda: defaultdict(float))
+        self._calls = defaultdict(int)
+
+    def stage(self, name: str):
+        return _Stage(self, name) if self.enabled else _NULL_STAGE
+
+    def add(self, name: str, seconds: float):
+        row = getattr(_thread_state, "row", None)
+        with self._lock:
+            self._samples[name][row] += seconds
+            self._calls[name] += 1
+
+    def add_bytes(self, count: int):
+        if self.enabled:
+            with self._lock:
+                self.bytes_written += count
+
+    def report(self) -> dict:
+        with self._lock:
+            names = [n for n in REPORT_STAGES if n in self._samples]
+            names += sorted(n for n in self._samples if n not in REPORT_STAGES)
+            stages = []
+            for name in names:
+                per_row = sorted(self._samples[name].values())
+                total = sum(per_row)
+                stages.append({
+                    "stage": name,
+                    "calls": self._calls[name],
+                    "rows": len(per_row),
+                    "total_s": round(total, 4),
+                    "mean_s": round(total / len(per_row), 4) if per_row else 0.0,
+                    "p50_s": round(_percentile(per_row, 50), 4),
+                    "p95_s": round(_percentile(per_row, 95), 4),
+                })
+            return {
+                "wall_time_s": round(time.perf_counter() - self.started_at, 4),
+                "bytes_written": self.bytes_written,
+                "stages": stages,
+            }
+
+    def write_report(self, export_dir: str, extra: Optional[dict] = None):
+        """Write run_report_<timestamp>.json and .csv into export_dir; returns both paths."""
+        report = self.report()
+        if extra:
+            report["run"] = extra
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        json_path = os.path.join(export_dir, f"run_report_{stamp}.json")
+        csv_path = os.path.join(export_dir, f"run_report_{stamp}.csv")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["stage", "calls", "rows", "total_s", "mean_s", "p50_s", "p95_s"])
+            writer.writeheader()
+            writer.writerows(report["stages"])
+        return json_path, csv_path
+
+
+# Timer used on threads that are not bound to a run
+_DISABLED = StageTimer(enabled=False)
+
+
+def _current() -> StageTimer:
+    return getattr(_thread_state, "timer", None) or _DISABLED
+
+
+def start_run(enabled: bool = True) -> StageTimer:
+    """Create the timer of a new run and bind it to the calling thread.
+
+    Timers are bound per thread (see set_current_row), so runs on different
+    threads of one process keep separate reports.
+    """
+    timer = StageTimer(enabled=enabled)
+    _thread_state.timer = timer
+    _thread_state.row = None
+    return timer
+
+
+def stop_run() -> None:
+    _thread_state.timer = None
+    _thread_state.row = None
+
+
+def timed(name: str):
+    """Context manager timing a stage of this thread's run (a no-op when disabled)."""
+    return _current().stage(name)
+
+
+def add_bytes(count: int) -> None:
+    _current().add_bytes(count)
+
+
+def set_current_row(row_key, timer: Optional[StageTimer] = None) -> None:
+    """Attribute the following timings on this thread to row_key (and to timer, if given)."""
+    if timer is not None:
+        _thread_state.timer = timer
+    _thread_state.row = row_key
@@ -0,0 +1 @@
+# Offline benchmark suite: synthetic data generator, export runner and import-time budget
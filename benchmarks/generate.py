@@ -0,0 +1,194 @@
+"""
+Synthetic benchmark data
+========================
+Creates everything an export needs, fully offline:
+- Krankmeldungsliste.xlsx and Kontaktdaten.xlsx with N rows of realistic German names/dates
+- the three fillable A4 templates with the field names pdf_creator fills
+- an AU folder with JPEG, PNG and PDF scans referenced by au_file_id
+
+Usage: python -m benchmarks.generate --rows 1000 --out benchmarks/data/1000 [--seed 42]
+"""
+import os
+import random
+import argparse
+from datetime import date, timedelta
+
+# "Today" of the generated data; benchmarks.run pins the export clock to it,
+# so every run sees the same sick leaves as past or still running
+REFERENCE_DATE = date(2025, 1, 1)
+
+FIRST_NAMES = [
+    "Anna", "Ben", "Clara", "David", "Emma", "Felix", "Greta", "Hannah", "Jonas", "Julia",
+    "Karl", "Lara", "Leon", "Lukas", "Marie", "Mia", "Moritz", "Noah", "Paul", "Sophie",
+    "Tim", "Ursula", "Valentin", "Wolfgang", "Yvonne", "Zoe", "Jürgen", "Sören", "Björn", "Käthe",
+]
+LAST_NAMES = [
+    "Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker", "Schulz", "Hoffmann",
+    "Schäfer", "Koch", "Bauer", "Richter", "Klein", "Wolf", "Schröder", "Neumann", "Schwarz", "Zimmermann",
+    "Braun", "Krüger", "Hofmann", "Hartmann", "Lange", "Schmitt", "Werner", "Schmitz", "Krause", "Meier",
+]
+
+# Field names expected by automeldung.utils.pdf.pdf_creator
+TEMPLATE_FIELDS = {
+    "Vorlage_Krankmeldung_OhneAU.pdf": {
+        "text": ["nachname_vorname", "pnr", "von", "bis", "wiederaufnahmedatum", "zuletzt", "datum"],
+        "checkbox": [],
+    },
+    "Vorlage_Krankmeldung_MitAU.pdf": {
+        "text": ["nachname_vorname", "pnr", "von_ohne", "bis_ohne", "von_mit", "bis_mit", "zuletzt", "datum"],
+        "checkbox": ["eAU_checkbox", "AU_checkbox"],
+    },
+    "Vorlage_Gesundmeldung.pdf": {
+        "text": ["nachname_vorname", "pnr", "von", "bis", "wiederaufnahmedatum", "datum"],
+        "checkbox": [],
+    },
+}
+
+AU_FORMATS = ["jpg", "png", "pdf"]
+
+
+def _people(count: int, rng: random.Random):
+    """Unique (nachname, vorname) pairs; numbered surnames once the name lists run out."""
+    pairs = [(last, first) for last in LAST_NAMES for first in FIRST_NAMES]
+    rng.shuffle(pairs)
+    people = []
+    for i in range(count):
+        last, first = pairs[i % len(pairs)]
+        if i >= len(pairs):
+            last = f"{last}-{i // len(pairs)}"
+        people.append((last, first))
+    return people
+
+
+def generate_tables(rows: int, out_dir: str, rng: random.Random):
+    import pandas as pd
+
+    people = _people(rows, rng)
+    today = REFERENCE_DATE
+    krank, kontakt = [], []
+    for i, (nachname, vorname) in enumerate(people):
+        kontakt.append({
+            "Nachname": nachname,
+            "Vorname": vorname,
+            "PersNr": 100000 + i,
+            # A few contracts live in the Fachbereich and are rejected by validation
+            "Vertrag im": "FB" if rng.random() < 0.02 else "ZV",
+        })
+
+        kind = rng.random()
+        days = rng.randint(1, 3) if kind < 0.4 else rng.randint(4, 21)
+        # Mostly past sick leaves; some still running (Zwischenmeldung)
+        start = today - timedelta(days=rng.randint(days, 120)) if rng.random() < 0.9 else today - timedelta(days=2)
+        end = start + timedelta(days=days - 1)
+        has_au = days > 3 and rng.random() < 0.7
+        has_eau = days > 3 and not has_au
+        au_file_id = f"AU_{i:05d}" if has_au else None
+        krank.append({
+            "Select": True,
+            "Nachname": nachname,
+            "Vorname": vorname,
+            "Von": pd.Timestamp(start),
+            "Bis": pd.Timestamp(end),
+            "Summe der Tage": days,
+            "AU": has_au,
+            "eAU": has_eau,
+            "AU File ID": au_file_id,
+            "AU von": None,
+            "AU bis": None,
+        })
+
+    krank_path = os.path.join(out_dir, "Krankmeldungsliste.xlsx")
+    kontakt_path = os.path.join(out_dir, "Kontaktdaten.xlsx")
+    pd.DataFrame(krank).to_excel(krank_path, index=False)
+    pd.DataFrame(kontakt).to_excel(kontakt_path, index=False)
+    return krank_path, kontakt_path, [r["AU File ID"] for r in krank if r["AU File ID"]]
+
+
+def generate_templates(out_dir: str):
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import A4
+
+    paths = {}
+    for filename, fields in TEMPLATE_FIELDS.items():
+        path = os.path.join(out_dir, filename)
+        c = canvas.Canvas(path, pagesize=A4)
+        c.setFont("Helvetica-Bold", 14)
+        c.drawString(60, 790, os.path.splitext(filename)[0].replace("_", " "))
+        c.setFont("Helvetica", 10)
+        y = 740
+        for name in fields["text"]:
+            c.drawString(60, y + 4, name)
+            c.acroForm.textfield(name=name, x=220, y=y, width=280, height=18, borderWidth=1)
+            y -= 36
+        for name in fields["checkbox"]:
+            c.drawString(60, y + 4, name)
+            c.acroForm.checkbox(name=name, x=220, y=y, size=14, buttonStyle="cross")
+            y -= 36
+        c.showPage()
+        c.save()
+        paths[filename] = path
+    return paths
+
+
+def generate_au_files(au_ids, au_dir: str, rng: random.Random):
+    from PIL import Image, ImageDraw
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import A4
+
+    os.makedirs(au_dir, exist_ok=True)
+    for au_id in au_ids:
+        fmt = rng.choice(AU_FORMATS)
+        path = os.path.join(au_dir, f"{au_id}_scan.{fmt}")
+        if fmt == "pdf":
+            c = canvas.Canvas(path, pagesize=A4)
+            c.drawString(60, 780, f"Arbeitsunfähigkeitsbescheinigung {au_id}")
+            c.showPage()
+            c.save()
+        else:
+            # Phone-photo sized scan with some text-like noise
+            img = Image.new("RGB", (1240, 1754), "white")
+            draw = ImageDraw.Draw(img)
+            for line in range(60):
+                y = 80 + line * 26
+                draw.line((80, y, 80 + rng.randint(300, 1080), y), fill=(40, 40, 40), width=3)
+            if fmt == "jpg":
+                img.save(path, quality=85)
+            else:
+                img.save(path)
+
+
+def generate_dataset(rows: int, out_dir: str, seed: int = 42) -> dict:
+    """Create a complete dataset in out_dir and return the paths the exporter needs."""
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    krank_path, kontakt_path, au_ids = generate_tables(rows, out_dir, rng)
+    templates = generate_templates(out_dir)
+    au_dir = os.path.join(out_dir, "au_files")
+    generate_au_files(au_ids, au_dir, rng)
+    return {
+        "rows": rows,
+        "krankmeldungsliste_path": krank_path,
+        "kontaktdaten_path": kontakt_path,
+        "vorlage_krankmeldung_ohne_au_path": templates["Vorlage_Krankmeldung_OhneAU.pdf"],
+        "vorlage_krankmeldung_mit_au_path": templates["Vorlage_Krankmeldung_MitAU.pdf"],
+        "vorlage_gesundmeldung_path": templates["Vorlage_Gesundmeldung.pdf"],
+        "au_files_path": au_dir,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate synthetic Automeldung benchmark data")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--out", default=None, help="Output folder (default: benchmarks/data/<rows>)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    out_dir = args.out or os.path.join(os.path.dirname(__file__), "data", str(args.rows))
+    dataset = generate_dataset(args.rows, out_dir, args.seed)
+    print(f"Generated {args.rows} rows in {out_dir}")
+    for key, value in dataset.items():
+        print(f"  {key}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
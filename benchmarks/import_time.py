@@ -0,0 +1,70 @@
+"""
+Import-time budget
+==================
+Measures the cumulative import time of the modules on the GUI's startup path
+with `python -X importtime` and fails when one exceeds its budget. Heavy
+backends (pandas, pikepdf, reportlab, PyPDF2) must stay out of these imports.
+
+Usage: python -m benchmarks.import_time [--repeat 5]
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budgets in milliseconds (cumulative, best of --repeat runs)
+IMPORT_BUDGETS_MS = {
+    "automeldung.main_exporter": 60,
+    "automeldung.__main__": 80,
+    "gui.logic.runner": 80,
+}
+
+# Modules that must not be pulled in by the budgeted imports
+FORBIDDEN_MODULES = ["pandas", "pikepdf", "reportlab", "PyPDF2", "openpyxl"]
+
+
+def measure(module: str):
+    """Return (cumulative_ms, imported_module_names) for a fresh `import module`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr}")
+    cumulative_us = None
+    imported = set()
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, _, rest = line.partition(":")
+        parts = [p.strip() for p in rest.split("|")]
+        if len(parts) != 3:
+            continue
+        name = parts[2].strip()
+        imported.add(name.split(".")[0])
+        if name == module:
+            cumulative_us = int(parts[1])
+    return (cumulative_us or 0) / 1000.0, imported
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check import-time budgets")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    failures = []
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        best, imported = min((measure(module) for _ in range(max(1, args.repeat))), key=lambda r: r[0])
+        heavy = sorted(set(FORBIDDEN_MODULES) & imported)
+        status = "ok" if best <= budget and not heavy else "FAIL"
+        print(f"{status:4} {module:30} {best:7.1f} ms (budget {budget} ms)" + (f", imports {', '.join(heavy)}" if heavy else ""))
+        if status != "ok":
+            failures.append(module)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
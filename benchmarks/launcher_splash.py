@@ -0,0 +1,91 @@
+"""
+Launcher splash CPU
+===================
+Shows the update splash while a worker thread sends set_status faster than
+frames are drawn (like the download progress callback), and measures the
+launcher process's CPU time while visible (one frame per tick) and while
+withdrawn (animation suspended). Needs a display; skipped without one.
+
+Usage: python -m benchmarks.launcher_splash [--seconds 3]
+"""
+import time
+import argparse
+import tempfile
+import threading
+
+from benchmarks.update_download import _load_launcher
+
+# Share of one core the splash may use while visible / hidden
+CPU_BUDGET_VISIBLE = 0.10
+CPU_BUDGET_HIDDEN = 0.02
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure the launcher splash's CPU use")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args(argv)
+
+    launcher = _load_launcher(tempfile.mkdtemp(prefix="launcher_splash_"))
+    splash = launcher.ModernSplashScreen(mode="update")
+    try:
+        splash.create_window()
+    except launcher.tk.TclError as e:
+        print(f"skip cannot open the splash here ({e})")
+        return 0
+
+    frames = [0]
+    draw_frame = splash.draw_frame
+
+    def counted(now):
+        frames[0] += 1
+        draw_frame(now)
+
+    splash.draw_frame = counted
+    stop = threading.Event()
+
+    def worker():
+        # 100 progress messages per second, more than there are frames
+        n = 0
+        while not stop.is_set():
+            n += 1
+            splash.set_status(f"Downloading {n / 100:.1f} MB")
+            time.sleep(0.01)
+
+    results = {}
+
+    def measure(name, then):
+        started, cpu, seen = time.monotonic(), time.process_time(), frames[0]
+
+        def done():
+            elapsed = time.monotonic() - started
+            results[name] = ((time.process_time() - cpu) / elapsed, (frames[0] - seen) / elapsed)
+            then()
+
+        splash.root.after(int(args.seconds * 1000), done)
+
+    def hidden_phase():
+        splash.root.withdraw()
+        # Measure once the Unmap event has arrived
+        splash.root.after(100, lambda: measure("hidden", finish))
+
+    def finish():
+        stop.set()
+        splash.request_close()
+
+    threading.Thread(target=worker, daemon=True).start()
+    measure("visible", hidden_phase)
+    splash.run()
+
+    failures = []
+    for name, budget in (("visible", CPU_BUDGET_VISIBLE), ("hidden", CPU_BUDGET_HIDDEN)):
+        cpu, fps = results.get(name, (1.0, 0.0))
+        # The flooding worker is part of the measured CPU time
+        ok = cpu <= budget and (fps > 0 if name == "visible" else fps == 0)
+        print(f"{'ok' if ok else 'FAIL':4} {name:8} {cpu:6.1%} CPU (budget {budget:.0%}), {fps:5.1f} frames/s")
+        if not ok:
+            failures.append(name)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,102 @@
+"""
+Launcher startup budget
+=======================
+Runs the launcher's startup worker against a local stub update server that
+answers slowly (like a bad office link) and checks that the app is started
+before the update check finishes, and that the check result still reaches
+the app through the status file.
+
+Usage: python -m benchmarks.launcher_startup [--server-delay 2.0]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds from starting the worker until the app process is launched
+LAUNCH_BUDGET_S = 0.3
+
+STUB_VERSION = "99.0.0"
+
+
+def start_stub_server(delay: float):
+    """Serve /version.json on localhost after delay seconds; returns (server, base_url)."""
+    body = json.dumps({"version": STUB_VERSION, "url": "", "sha256": ""}).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            self.send_response(200 if self.path.endswith("/version.json") else 404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/updates/"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check that the launcher starts the app before the update check")
+    parser.add_argument("--server-delay", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    workdir = tempfile.mkdtemp(prefix="launcher_startup_")
+    os.chdir(workdir)  # launcher.log and the status file go here
+    import launcher
+
+    server, base_url = start_stub_server(args.server_delay)
+    launcher.UPDATE_URL = base_url
+    launcher.SOURCE_VERSION = "1.0.0"
+    launched = {}
+    # A stand-in for the app: no window, exits at once
+    launcher.get_main_app_command = lambda: [sys.executable, "-c", "pass"]
+    original_launch = launcher.launch_app
+
+    def launch_app(*a, **kw):
+        result = original_launch(*a, **kw)
+        launched["at"] = time.perf_counter()
+        launched["status_file"] = kw.get("status_file")
+        return result
+
+    launcher.launch_app = launch_app
+
+    started = time.perf_counter()
+    launcher.startup_worker()
+    finished = time.perf_counter()
+    server.shutdown()
+
+    failures = []
+    launch_s = launched.get("at", finished) - started
+    status = "ok" if launch_s <= LAUNCH_BUDGET_S else "FAIL"
+    print(f"{status:4} app launched after     {launch_s * 1000:7.1f} ms (budget {LAUNCH_BUDGET_S * 1000:.0f} ms)")
+    if status != "ok":
+        failures.append("launch")
+    print(f"     update check done after {(finished - started) * 1000:7.1f} ms (server delay {args.server_delay * 1000:.0f} ms)")
+
+    try:
+        with open(launched.get("status_file") or "", "r", encoding="utf-8") as f:
+            update = json.load(f).get("update") or {}
+    except (OSError, ValueError):
+        update = {}
+    status = "ok" if update.get("version") == STUB_VERSION else "FAIL"
+    print(f"{status:4} status file reports     {update.get('version')!r}")
+    if status != "ok":
+        failures.append("status")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,160 @@
+"""
+Export benchmark runner
+=======================
+Runs main_exporter on synthetic datasets (see benchmarks.generate) and records
+rows/sec, per-stage time (from the run report) and peak RSS. Every size runs in
+a fresh subprocess so RSS and import costs are measured per run.
+
+Usage:
+  python -m benchmarks.run [--sizes 10 1000 10000] [--out results.json]
+                           [--save-baseline] [--compare [BASELINE]]
+                           [--tolerance 0.15]
+"""
+import os
+import sys
+import json
+import argparse
+import platform
+import subprocess
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+DEFAULT_SIZES = [10, 1000, 10000]
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_RESULTS = os.path.join(BENCH_DIR, "results", "latest.json")
+
+
+def _peak_rss_mb() -> float:
+    import resource
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def run_single(dataset: dict, export_dir: str) -> dict:
+    """Run one export in this process and return its measurements."""
+    from datetime import datetime
+    from automeldung.main_exporter import main_exporter
+    from automeldung.utils.run.context import RunContext
+    from benchmarks.generate import REFERENCE_DATE
+
+    now = datetime.combine(REFERENCE_DATE, datetime.min.time())
+    paths = {key: value for key, value in dataset.items() if key.endswith("_path")}
+    ctx = RunContext.from_config(
+        **paths,
+        export_path=export_dir,
+        limit_rows=dataset["rows"],
+        creation_date=REFERENCE_DATE.strftime("%d.%m.%Y"),
+        timing_report=True,
+        log=lambda m: None,
+        now=lambda: now,
+    )
+
+    stats = main_exporter(ctx)
+    stages = {}
+    report_path = stats.get("report_path")
+    if report_path and os.path.exists(report_path):
+        with open(report_path, "r", encoding="utf-8") as f:
+            report = json.load(f)
+        stages = {s["stage"]: s for s in report.get("stages", [])}
+        stats["bytes_written"] = report.get("bytes_written", 0)
+    return {
+        "rows": dataset["rows"],
+        "done": stats.get("done", 0),
+        "failed": stats.get("failed", 0),
+        "elapsed_seconds": stats.get("elapsed_seconds", 0.0),
+        "rows_per_sec": stats.get("rows_per_sec", 0.0),
+        "bytes_written": stats.get("bytes_written", 0),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "stages": {name: {"total_s": s["total_s"], "p50_s": s["p50_s"], "p95_s": s["p95_s"]} for name, s in stages.items()},
+    }
+
+
+def run_size(rows: int, data_root: str, seed: int) -> dict:
+    """Generate (or reuse) the dataset for `rows` and benchmark it in a subprocess."""
+    from benchmarks.generate import REFERENCE_DATE, generate_dataset
+
+    data_dir = os.path.join(data_root, str(rows))
+    manifest = os.path.join(data_dir, "dataset.json")
+    dataset = None
+    if os.path.exists(manifest):
+        with open(manifest, "r", encoding="utf-8") as f:
+            dataset = json.load(f)
+    # Data generated with another seed or reference date is generated again
+    version = {"seed": seed, "reference_date": REFERENCE_DATE.isoformat()}
+    if dataset is None or any(dataset.get(key) != value for key, value in version.items()):
+        dataset = {**generate_dataset(rows, data_dir, seed), **version}
+        with open(manifest, "w", encoding="utf-8") as f:
+            json.dump(dataset, f, indent=2)
+
+    with tempfile.TemporaryDirectory(prefix="automeldung_bench_") as export_dir:
+        cmd = [sys.executable, "-m", "benchmarks.run", "--worker", manifest, "--export-dir", export_dir]
+        proc = subprocess.run(cmd, cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Benchmark for {rows} rows failed:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare(results: dict, baseline: dict, tolerance: float):
+    """Return human-readable regressions (rows/sec down or RSS up by more than tolerance)."""
+    regressions = []
+    base_by_rows = {r["rows"]: r for r in baseline.get("runs", [])}
+    for run in results["runs"]:
+        base = base_by_rows.get(run["rows"])
+        if not base:
+            continue
+        if base["rows_per_sec"] and run["rows_per_sec"] < base["rows_per_sec"] * (1 - tolerance):
+            regressions.append(f"{run['rows']} rows: {run['rows_per_sec']} rows/s vs baseline {base['rows_per_sec']}")
+        if base["peak_rss_mb"] and run["peak_rss_mb"] > base["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(f"{run['rows']} rows: peak RSS {run['peak_rss_mb']} MB vs baseline {base['peak_rss_mb']} MB")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Automeldung exports")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--data-root", default=os.path.join(BENCH_DIR, "data"))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=DEFAULT_RESULTS)
+    parser.add_argument(
+        "--compare", nargs="?", const=DEFAULT_BASELINE, default=None,
+        help=f"Baseline file to compare against (default: {DEFAULT_BASELINE}, written by --save-baseline)",
+    )
+    parser.add_argument("--save-baseline", action="store_true", help=f"Also write results to {DEFAULT_BASELINE}")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    # Internal: run a single dataset in this process
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--export-dir", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        with open(args.worker, "r", encoding="utf-8") as f:
+            dataset = json.load(f)
+        print(json.dumps(run_single(dataset, args.export_dir)))
+        return 0
+
+    results = {"python": platform.python_version(), "platform": platform.platform(), "runs": []}
+    for rows in args.sizes:
+        run = run_size(rows, args.data_root, args.seed)
+        results["runs"].append(run)
+        print(f"{rows:>6} rows: {run['rows_per_sec']:8.2f} rows/s, {run['elapsed_seconds']:8.2f}s, peak RSS {run['peak_rss_mb']} MB")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(DEFAULT_BASELINE, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION: {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,140 @@
+"""
+Shared lookups per worker
+=========================
+Publishes a synthetic Kontaktdaten index, AU folder listing and template in
+shared memory (SharedStore, as the scheduler does), then starts 1, 2, 4, ...
+export-style worker processes that attach through SharedView and run
+lookups. Each worker reports the CPU time of attaching and opening the
+lookups and how much private memory (anonymous RSS) it added. Both must stay
+flat as the worker count grows: the packed tables are read in place, so a
+worker must not hold its own copy of the published data.
+
+Usage: python -m benchmarks.shared_workers [--rows 200000] [--workers 1 2 4 8]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+import multiprocessing
+
+from automeldung.utils.data.au_index import AuIndex
+from automeldung.utils.data.kontaktdaten_index import KontaktdatenIndex
+from automeldung.utils.run.shared import BufferStream, SharedStore, SharedView
+
+# Private memory one worker may add for attaching and its lookups
+PRIVATE_BUDGET_MB = 4.0
+# Median attach time with the most workers vs. with one (plus a floor for noise)
+STARTUP_GROWTH = 2.0
+STARTUP_FLOOR_MS = 2.0
+LOOKUPS = 2000
+
+
+def _anon_rss_kb():
+    """Anonymous (process-private) RSS in KiB, or None where unavailable."""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("RssAnon:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_full_info().uss // 1024
+
+
+def _worker(manifest, probes, results):
+    before = _anon_rss_kb()
+    # CPU time: all workers start at once, so wall time would measure contention
+    started = time.process_time()
+    view = SharedView()
+    view.manifest = manifest
+    kontaktdaten = KontaktdatenIndex.from_bytes(view.lookup("kontaktdaten", "kontaktdaten.xlsx", 1.0))
+    au_index = AuIndex.from_bytes(view.lookup("au_index", "au", 1.0))
+    template = BufferStream(view.lookup("template", "vorlage.pdf", 1.0))
+    template.seek(-1024, os.SEEK_END)
+    template.read()
+    kontaktdaten.persnr[probes[0]]
+    attach_ms = (time.process_time() - started) * 1000
+
+    for nachname, vorname in probes:
+        kontaktdaten.persnr[(nachname, vorname)]
+        kontaktdaten.vertrag_in_fachbereich(nachname, vorname)
+        au_index.find(f"AU_{nachname}")
+    after = _anon_rss_kb()
+    private_mb = (after - before) / 1024 if before is not None and after is not None else None
+    results.put((attach_ms, private_mb))
+    del kontaktdaten, au_index, template
+    view.close()
+
+
+def _synthetic(rows: int, seed: int):
+    rng = random.Random(seed)
+    people = [(f"Nachname{i:07d}", rng.choice(("Anna", "Jörg", "Max", "Lea"))) for i in range(rows)]
+    kontaktdaten = KontaktdatenIndex(
+        (nn, vn, 100000 + i, "FB" if i % 10 == 0 else "")
+        for i, (nn, vn) in enumerate(people)
+    )
+    au_index = AuIndex(entries=[
+        (f"au_{nn.lower()}_{i}.pdf", (0, -float(i)), f"/au/AU_{nn}_{i}.pdf")
+        for i, (nn, _) in enumerate(people[::2])
+    ])
+    template = rng.randbytes(4 * 1024 * 1024) if hasattr(rng, "randbytes") else os.urandom(4 * 1024 * 1024)
+    return people, kontaktdaten, au_index, template
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check that shared lookups cost each worker the same")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    people, kontaktdaten, au_index, template = _synthetic(args.rows, args.seed)
+    store = SharedStore()
+    store.publish("kontaktdaten", "kontaktdaten.xlsx", 1.0, kontaktdaten.to_bytes())
+    store.publish("au_index", "au", 1.0, au_index.to_bytes())
+    store.publish("template", "vorlage.pdf", 1.0, template)
+    published_mb = sum(size for _, _, size in store.manifest().values()) / (1024 * 1024)
+    print(f"published {published_mb:.1f} MB for {args.rows} Kontaktdaten rows")
+
+    probes = random.Random(args.seed).sample(people, min(LOOKUPS, len(people)))
+    mp = multiprocessing.get_context("spawn")
+    medians = {}
+    failures = []
+    try:
+        for count in args.workers:
+            results = mp.Queue()
+            workers = [mp.Process(target=_worker, args=(store.manifest(), probes, results)) for _ in range(count)]
+            for worker in workers:
+                worker.start()
+            measured = [results.get(timeout=120) for _ in workers]
+            for worker in workers:
+                worker.join()
+            attach = statistics.median(ms for ms, _ in measured)
+            private = [mb for _, mb in measured if mb is not None]
+            worst = max(private) if private else None
+            medians[count] = attach
+            ok = worst is None or worst <= PRIVATE_BUDGET_MB
+            memory = f"{worst:6.2f} MB private (budget {PRIVATE_BUDGET_MB} MB)" if worst is not None else "memory not measurable here"
+            print(f"{'ok' if ok else 'FAIL':4} {count:2} workers: attach {attach:7.2f} ms median, {memory}")
+            if not ok:
+                failures.append(f"{count} workers: {worst:.2f} MB private per worker")
+    finally:
+        store.close()
+
+    first, last = medians[args.workers[0]], medians[args.workers[-1]]
+    limit = max(first * STARTUP_GROWTH, first + STARTUP_FLOOR_MS)
+    ok = last <= limit
+    print(f"{'ok' if ok else 'FAIL':4} attach with {args.workers[-1]} workers {last:.2f} ms vs {first:.2f} ms with {args.workers[0]} (limit {limit:.2f} ms)")
+    if not ok:
+        failures.append("attach time grows with the worker count")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Update check cache
+==================
+Serves version.json with an ETag from a local stub server and counts what
+reaches it. The launcher's startup check must fetch the manifest once and
+hand it to the app; the app's own check right after must not ask the server
+again; forced and expired checks must be conditional (304) and reuse the
+pooled connection.
+
+Usage: python -m benchmarks.update_check
+"""
+import os
+import sys
+import json
+import hashlib
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.update_download import _load_launcher
+
+STUB_VERSION = "99.0.0"
+
+
+class ManifestServer:
+    """version.json with ETag / If-None-Match; records (status, client port) per request."""
+
+    def __init__(self, manifest: dict):
+        body = json.dumps(manifest).encode()
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if self.headers.get("If-None-Match") == etag:
+                    stub.requests.append((304, self.client_address[1]))
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                stub.requests.append((200, self.client_address[1]))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/updates/"
+
+    def close(self):
+        self.server.shutdown()
+
+
+def main(argv=None) -> int:
+    workdir = tempfile.mkdtemp(prefix="update_check_")
+    launcher = _load_launcher(workdir)
+    import update_service
+
+    stub = ManifestServer({"version": STUB_VERSION, "url": "core.exe", "sha256": ""})
+    launcher.UPDATE_URL = stub.base_url
+    launcher.SOURCE_VERSION = "1.0.0"
+    launcher.get_main_app_command = lambda: [sys.executable, "-c", "pass"]
+    cache_path = os.path.abspath(launcher.UPDATE_CACHE_FILE)
+
+    def launcher_start():
+        launcher.startup_worker()
+        with open(launcher.UPDATE_STATUS_FILE, "r", encoding="utf-8") as f:
+            status = json.load(f)
+        # The app compares the handed-over manifest against its own version
+        return update_service.update_info(status.get("manifest"), "1.0.0")
+
+    def app_check(min_interval=update_service.MIN_CHECK_INTERVAL, force=False):
+        # What the update banner does when the launcher's result is missing
+        service = update_service.UpdateService(stub.base_url, cache_path=cache_path, min_interval=min_interval)
+        return service.check("1.0.0", force=force)
+
+    steps = (
+        ("launcher start", launcher_start, [200]),
+        ("app after launcher", app_check, []),
+        ("forced check", lambda: app_check(force=True), [304]),
+        ("interval elapsed", lambda: app_check(min_interval=0), [304]),
+    )
+    failures = []
+    for name, step, expected in steps:
+        seen = len(stub.requests)
+        update = step()
+        got = [status for status, _ in stub.requests[seen:]]
+        ok = got == expected and update is not None and update["version"] == STUB_VERSION
+        print(f"{'ok' if ok else 'FAIL':4} {name:19} requests: {got or 'none'}")
+        if not ok:
+            failures.append(name)
+    stub.close()
+
+    # The conditional requests share one pooled connection
+    ports = {port for status, port in stub.requests if status == 304}
+    ok = len(ports) == 1
+    print(f"{'ok' if ok else 'FAIL':4} {'connection reuse':19} {len(ports)} connection(s) for the conditional requests")
+    if not ok:
+        failures.append("connection reuse")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+"""
+Compressed update check
+=======================
+Compresses a fake core.exe with update_payload.py (every encoding this
+installation supports) and serves it from the stub update server. The
+launcher must pick the best encoding, decompress while downloading, resume
+after a dropped connection without re-sending the first half, and fall back
+to the uncompressed file when the compressed one is broken.
+
+Usage: python -m benchmarks.update_compressed [--size-mb 20]
+"""
+import os
+import time
+import hashlib
+import argparse
+import tempfile
+
+from benchmarks.update_download import StubUpdateServer, fake_exe, _load_launcher
+
+
+def compressible_exe(size: int) -> bytes:
+    """Like a frozen app: random code sections between padding and repeated tables."""
+    parts, total, n = [], 0, 0
+    while total < size:
+        if n % 3 == 0:
+            part = fake_exe(64 * 1024, seed=b"section %d" % n)[2:]
+        else:
+            part = b"\0" * 32 * 1024 + bytes(range(256)) * 128
+        parts.append(part)
+        total += len(part)
+        n += 1
+    return (b"MZ" + b"".join(parts))[:size]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check compressed update downloads against a stub server")
+    parser.add_argument("--size-mb", type=float, default=20)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="update_compressed_")
+    launcher = _load_launcher(workdir)
+    import update_payload
+
+    data = compressible_exe(int(args.size_mb * 1e6))
+    with open("core.exe.src", "wb") as f:
+        f.write(data)
+    expected = hashlib.sha256(data).hexdigest()
+    variants, files = [], {launcher.CORE_EXECUTABLE: data}
+    for encoding in update_payload.available_encodings():
+        started = time.perf_counter()
+        entry = update_payload.compress("core.exe.src", workdir, encoding)
+        with open(entry["url"], "rb") as f:
+            files[entry["url"]] = f.read()
+        variants.append(entry)
+        print(f"     {encoding:5} {entry['size'] / 1e6:6.2f} MB for {len(data) / 1e6:.1f} MB, "
+              f"built in {time.perf_counter() - started:.1f} s")
+    best = update_payload.pick_variant(variants)
+
+    failures = []
+    broken = dict(best, sha256=hashlib.sha256(b"other payload").hexdigest())
+    cases = (
+        ("compressed", [best], 0, True),
+        ("resume after drop", [best], best["size"] // 2, True),
+        ("fallback", [broken], 0, False),
+    )
+    for name, manifest_variants, drop_after, expect_compressed in cases:
+        stub = StubUpdateServer(files, drop_after=drop_after)
+        launcher.UPDATE_URL = stub.base_url
+        started = time.perf_counter()
+        path = launcher.download_update(sha256_expected=expected, variants=manifest_variants)
+        elapsed = time.perf_counter() - started
+        stub.close()
+
+        full_requested = any(p.endswith("/" + launcher.CORE_EXECUTABLE) for p, _ in stub.requests)
+        ok = path is not None and open(path, "rb").read() == data and full_requested != expect_compressed
+        if expect_compressed:
+            # Resuming must not transfer the first half again
+            ok = ok and stub.bytes_sent <= best["size"] + launcher.DOWNLOAD_CHUNK_SIZE
+        print(f"{'ok' if ok else 'FAIL':4} {name:18} {elapsed * 1000:7.1f} ms, {stub.bytes_sent / 1e6:.2f} MB sent, "
+              f"{len(stub.requests)} request(s)")
+        if not ok:
+            failures.append(name)
+        if path and os.path.exists(path):
+            os.remove(path)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
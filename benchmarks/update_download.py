@@ -0,0 +1,147 @@
+"""
+Update download check
+=====================
+Serves a fake core.exe from a local stub server (HTTP Range support, first
+connection dropped half-way) and runs the launcher's download_update against
+it: the download must resume instead of restarting, verify the SHA-256 and
+report progress. Also runs the parallel-range variant.
+
+Usage: python -m benchmarks.update_download [--size-mb 20]
+"""
+import os
+import sys
+import time
+import random
+import hashlib
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class StubUpdateServer:
+    """Serves files from a dict {name: bytes} with Range support.
+
+    drop_after: the first GET of a full file is cut off after that many bytes.
+    """
+
+    def __init__(self, files: dict, drop_after: int = 0):
+        self.files = files
+        self.drop_after = drop_after
+        self.requests = []
+        self.bytes_sent = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _target(self):
+                name = self.path.rsplit("/", 1)[-1]
+                return stub.files.get(name)
+
+            def do_HEAD(self):
+                data = self._target()
+                if data is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("Accept-Ranges", "bytes")
+                self.end_headers()
+
+            def do_GET(self):
+                data = self._target()
+                stub.requests.append((self.path, self.headers.get("Range")))
+                if data is None:
+                    self.send_error(404)
+                    return
+                start, end = 0, len(data) - 1
+                range_header = self.headers.get("Range")
+                if range_header:
+                    first, _, last = range_header.replace("bytes=", "").partition("-")
+                    start = int(first)
+                    end = int(last) if last else len(data) - 1
+                    if start >= len(data):
+                        self.send_response(416)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+                else:
+                    self.send_response(200)
+                body = data[start:end + 1]
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Accept-Ranges", "bytes")
+                self.end_headers()
+                if not range_header and stub.drop_after:
+                    cut, stub.drop_after = stub.drop_after, 0
+                    self.wfile.write(body[:cut])
+                    stub.bytes_sent += cut
+                    self.wfile.flush()
+                    self.close_connection = True
+                    self.connection.shutdown(2)
+                    return
+                self.wfile.write(body)
+                stub.bytes_sent += len(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/updates/"
+
+    def close(self):
+        self.server.shutdown()
+
+
+def fake_exe(size: int, seed: bytes = b"v1") -> bytes:
+    """Deterministic, incompressible bytes starting with the PE magic."""
+    return b"MZ" + random.Random(seed).randbytes(max(0, size - 2))
+
+
+def _load_launcher(workdir):
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    os.chdir(workdir)  # core.exe.new and launcher.log go here
+    import launcher
+    return launcher
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check resumable update downloads against a stub server")
+    parser.add_argument("--size-mb", type=float, default=20)
+    args = parser.parse_args(argv)
+
+    launcher = _load_launcher(tempfile.mkdtemp(prefix="update_download_"))
+    data = fake_exe(int(args.size_mb * 1e6))
+    expected = hashlib.sha256(data).hexdigest()
+    failures = []
+
+    for name, parts, drop_after in (("resume after drop", 1, len(data) // 2), ("parallel ranges", 4, 0)):
+        stub = StubUpdateServer({launcher.CORE_EXECUTABLE: data}, drop_after=drop_after)
+        launcher.UPDATE_URL = stub.base_url
+        messages = []
+        started = time.perf_counter()
+        path = launcher.download_update(sha256_expected=expected, callback=messages.append, parts=parts)
+        elapsed = time.perf_counter() - started
+        stub.close()
+
+        ok = path is not None and open(path, "rb").read() == data
+        # Resuming must not transfer the first half again
+        ok = ok and stub.bytes_sent <= len(data) + launcher.DOWNLOAD_CHUNK_SIZE
+        print(f"{'ok' if ok else 'FAIL':4} {name:18} {elapsed * 1000:7.1f} ms, "
+              f"{stub.bytes_sent / 1e6:.1f} MB sent for {len(data) / 1e6:.1f} MB, {len(stub.requests)} request(s)")
+        print(f"     last progress: {next((m for m in reversed(messages) if m.startswith('Downloading ')), None)!r}")
+        if not ok:
+            failures.append(name)
+        if path:
+            os.remove(path)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,63 @@
+"""
+Update handoff latency
+======================
+Starts a stand-in for the app (takes the PID lock like gui/app.py, exits at
+a known time) and measures how long the launcher's wait_for_app_to_close
+takes to notice the exit: once with --app-pid, once from the lock file
+alone. The old file-lock polling needed at least a second.
+
+Usage: python -m benchmarks.update_handoff [--app-runtime 0.5]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+
+from benchmarks.update_download import PROJECT_ROOT, _load_launcher
+
+# Seconds from the app's exit until the launcher may install
+HANDOFF_BUDGET_S = 0.2
+
+# The app side of the handshake, as gui/app.py does it, then a clean exit
+APP_STANDIN = """
+import sys, time
+sys.path.insert(0, sys.argv[1])
+import app_lock
+app_lock.acquire(sys.argv[2])
+print("ready", flush=True)
+time.sleep(max(0.0, float(sys.argv[3]) - time.time()))
+"""
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure the launcher/app update handoff")
+    parser.add_argument("--app-runtime", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    launcher = _load_launcher(tempfile.mkdtemp(prefix="update_handoff_"))
+    lock_path = os.path.abspath(launcher.APP_LOCK_FILE)
+    failures = []
+
+    for name, pass_pid in (("--app-pid", True), ("lock file", False)):
+        exit_at = time.time() + args.app_runtime
+        app = subprocess.Popen(
+            [sys.executable, "-c", APP_STANDIN, PROJECT_ROOT, lock_path, str(exit_at)],
+            stdout=subprocess.PIPE, text=True,
+        )
+        app.stdout.readline()  # lock taken
+        ok = launcher.wait_for_app_to_close(max_wait=10, app_pid=app.pid if pass_pid else None)
+        latency = time.time() - exit_at
+        app.wait()
+
+        ok = ok and latency <= HANDOFF_BUDGET_S and not os.path.exists(lock_path)
+        print(f"{'ok' if ok else 'FAIL':4} {name:10} install could start {latency * 1000:6.1f} ms after the app exited "
+              f"(budget {HANDOFF_BUDGET_S * 1000:.0f} ms)")
+        if not ok:
+            failures.append(name)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,165 @@
+"""
+Binary delta patches for core.exe updates.
+
+A patch rebuilds the new executable from the installed one: "copy these
+bytes from the old file" and "insert these new bytes" operations, stored
+lzma-compressed. Rebuilding from a frozen app where only a few modules
+changed needs a small fraction of the full download.
+
+Build a patch and print its version.json entry:
+    python delta_patch.py make old/core.exe new/core.exe updates/core-1.2.1.patch
+
+Format (inside the lzma stream): MAGIC, new size (8 bytes), then operations
+  b"C" offset (8) length (8)   copy from the old file
+  b"I" length (4) data         insert data
+  b"E"                         end
+"""
+import hashlib
+import json
+import lzma
+import os
+import struct
+import sys
+
+MAGIC = b"AMDELTA1"
+# Matching granularity; smaller finds more matches but needs more memory
+BLOCK_SIZE = 64
+_COMPARE_STEP = 64 * 1024
+_MAX_INSERT = 1 << 20
+_BUFFER_SIZE = 256 * 1024
+
+
+class PatchError(Exception):
+    """The patch is malformed or does not fit the old file."""
+
+
+def _match_length(old: bytes, old_at: int, new: bytes, new_at: int) -> int:
+    """Length of the common run of old[old_at:] and new[new_at:]."""
+    length = 0
+    limit = min(len(old) - old_at, len(new) - new_at)
+    # Whole steps compare in C; only the last step goes byte by byte
+    while length + _COMPARE_STEP <= limit and \
+            old[old_at + length:old_at + length + _COMPARE_STEP] == new[new_at + length:new_at + length + _COMPARE_STEP]:
+        length += _COMPARE_STEP
+    while length < limit and old[old_at + length] == new[new_at + length]:
+        length += 1
+    return length
+
+
+def diff(old: bytes, new: bytes):
+    """Yield ("C", offset, length) / ("I", data) operations that turn old into new."""
+    index = {}
+    for offset in range(0, len(old) - BLOCK_SIZE + 1, BLOCK_SIZE):
+        index.setdefault(old[offset:offset + BLOCK_SIZE], offset)
+
+    i = pending = 0
+    last = len(new) - BLOCK_SIZE
+    while i <= last:
+        offset = index.get(new[i:i + BLOCK_SIZE])
+        if offset is None:
+            i += 1
+            continue
+        # Grow the match backwards into the bytes not yet emitted
+        while i > pending and offset > 0 and new[i - 1] == old[offset - 1]:
+            i -= 1
+            offset -= 1
+        length = _match_length(old, offset, new, i)
+        if i > pending:
+            yield ("I", new[pending:i])
+        yield ("C", offset, length)
+        i += length
+        pending = i
+    if pending < len(new):
+        yield ("I", new[pending:])
+
+
+def make_patch(old_path: str, new_path: str, patch_path: str) -> dict:
+    """Write a patch from old_path to new_path; returns its version.json entry
+    (without url)."""
+    with open(old_path, "rb") as f:
+        old = f.read()
+    with open(new_path, "rb") as f:
+        new = f.read()
+    with lzma.open(patch_path, "wb", preset=6) as out:
+        out.write(MAGIC + struct.pack("<Q", len(new)))
+        for op in diff(old, new):
+            if op[0] == "C":
+                out.write(b"C" + struct.pack("<QQ", op[1], op[2]))
+            else:
+                data = op[1]
+                for start in range(0, len(data), _MAX_INSERT):
+                    part = data[start:start + _MAX_INSERT]
+                    out.write(b"I" + struct.pack("<I", len(part)) + part)
+        out.write(b"E")
+    return {
+        "from_sha256": hashlib.sha256(old).hexdigest(),
+        "sha256": _file_sha256(patch_path),
+        "size": os.path.getsize(patch_path),
+    }
+
+
+def _read_exact(f, n: int) -> bytes:
+    data = f.read(n)
+    if len(data) != n:
+        raise PatchError("patch is truncated")
+    return data
+
+
+def apply_patch(old_path: str, patch_path: str, out_path: str) -> str:
+    """Rebuild the new file at out_path; returns its SHA-256 hex digest
+    (computed while writing)."""
+    sha256_hash = hashlib.sha256()
+    written = 0
+    try:
+        with lzma.open(patch_path, "rb") as patch, open(old_path, "rb") as old, open(out_path, "wb") as out:
+            if _read_exact(patch, len(MAGIC)) != MAGIC:
+                raise PatchError("not a delta patch")
+            (new_size,) = struct.unpack("<Q", _read_exact(patch, 8))
+            old_size = os.fstat(old.fileno()).st_size
+            while True:
+                op = _read_exact(patch, 1)
+                if op == b"E":
+                    break
+                if op == b"C":
+                    offset, length = struct.unpack("<QQ", _read_exact(patch, 16))
+                    if offset + length > old_size:
+                        raise PatchError("patch does not fit the installed file")
+                    old.seek(offset)
+                    while length:
+                        chunk = old.read(min(length, _BUFFER_SIZE))
+                        out.write(chunk)
+                        sha256_hash.update(chunk)
+                        written += len(chunk)
+                        length -= len(chunk)
+                elif op == b"I":
+                    (length,) = struct.unpack("<I", _read_exact(patch, 4))
+                    chunk = _read_exact(patch, length)
+                    out.write(chunk)
+                    sha256_hash.update(chunk)
+                    written += length
+                else:
+                    raise PatchError(f"unknown operation {op!r}")
+    except (lzma.LZMAError, EOFError) as e:
+        raise PatchError(f"patch is corrupt: {e}")
+    if written != new_size:
+        raise PatchError(f"patched file has {written} bytes, expected {new_size}")
+    return sha256_hash.hexdigest()
+
+
+def _file_sha256(path: str) -> str:
+    sha256_hash = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_BUFFER_SIZE), b""):
+            sha256_hash.update(chunk)
+    return sha256_hash.hexdigest()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 5 or sys.argv[1] != "make":
+        print("Usage: python delta_patch.py make <old core.exe> <new core.exe> <out.patch>")
+        sys.exit(1)
+    entry = make_patch(sys.argv[2], sys.argv[3], sys.argv[4])
+    entry["url"] = os.path.basename(sys.argv[4])
+    size = os.path.getsize(sys.argv[3])
+    print(f"Patch: {entry['size'] / 1e6:.2f} MB for a {size / 1e6:.2f} MB executable. Add to \"patches\" in version.json:")
+    print(json.dumps(entry, indent=4))
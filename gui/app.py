@@ -14,12 +14,12 @@ else:
 import flet as ft
 import update_config
 
-from gui.utils.settings import load_settings
+from gui.utils.settings import load_settings_store
 from gui.components.inputs import create_inputs_section
 from gui.components.export import create_export_section
 from gui.components.status import create_status_section
 from gui.components.update_checker import create_update_banner
-from gui.logic.runner import setup_runner
+from gui.logic.runner import setup_runner, start_backend_warmup
 
 def cleanup_old_executable():
     """Removes the .old file left behind by the update process."""
@@ -34,9 +34,24 @@ def cleanup_old_executable():
             except Exception as e:
                 print(f"Could not remove old version: {e}")
 
+def register_running_app():
+    """Writes core.pid so the launcher can wait for this process before
+    replacing the executable (removed again on exit)."""
+    import app_lock
+    app_lock.acquire()
+
+def record_version():
+    """Keeps core.version.json next to the exe current, so the launcher reads
+    the version instead of starting this app with --version."""
+    if getattr(sys, 'frozen', False):
+        import version_sidecar
+        version_sidecar.write_version(sys.executable, update_config.CURRENT_VERSION)
+
 def main(page: ft.Page):
     # Cleanup any old executable from a previous update
     cleanup_old_executable()
+    record_version()
+    register_running_app()
 
     # Page setup
     page.title = "Automeldung — PDF Automation"
@@ -50,19 +65,19 @@ def main(page: ft.Page):
     page.window.height = 539
     page.theme_mode = "dark"
 
-    # Load settings
-    settings = load_settings()
+    # Load settings (kept in memory, saved debounced in the background and on exit)
+    settings = load_settings_store()
     # Reset creation_date on startup so it doesn't persist
-    settings["creation_date"] = ""
+    settings.set("creation_date", "")
 
     # Create components
     inputs_card, input_refs = create_inputs_section(page, settings)
     export_card, export_refs = create_export_section(page, settings)
-    status_card, status_refs = create_status_section()
-    update_banner, start_update_check = create_update_banner(page, CURRENT_VERSION, UPDATE_URL)
+    status_card, status_refs = create_status_section(page)
+    update_banner, start_update_checks = create_update_banner(page, CURRENT_VERSION, UPDATE_URL)
 
     # Setup logic
-    setup_runner(page, settings, input_refs, export_refs, status_refs)
+    scheduler = setup_runner(page, settings, input_refs, export_refs, status_refs)
 
     # Layout
     header = ft.Row([
@@ -91,22 +106,34 @@ def main(page: ft.Page):
     )
 
     page.add(content_column)
-    
-    # Run update check in a background thread to avoid blocking the UI
-    start_update_check()
+
+    # Window is drawn; start the export worker (imports pandas/pikepdf/reportlab) in the background
+    start_backend_warmup(scheduler, settings)
+
+    # Update checks run on their own thread (first one now, then periodically);
+    # nothing on the way to the first frame touches the network
+    start_update_checks()
 
 if __name__ == "__main__":
+    # Export workers are spawned processes; needed when frozen into an .exe
+    import multiprocessing
+    multiprocessing.freeze_support()
+
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument("--version", action="store_true", help="Print version and exit")
     parser.add_argument("--update-available", action="store_true", help="Signal that update is available")
+    parser.add_argument("--update-status", help="File where the launcher writes its update check result")
     args, unknown = parser.parse_known_args()
 
     if args.version:
         print(update_config.CURRENT_VERSION)
+        record_version()
         sys.exit(0)
 
     if args.update_available:
         os.environ["UPDATE_AVAILABLE"] = "1"
+    if args.update_status:
+        os.environ["UPDATE_STATUS_FILE"] = args.update_status
 
     ft.app(target=main)
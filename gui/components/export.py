@@ -1,7 +1,6 @@
 import flet as ft
-from gui.utils.settings import save_settings
 
-def create_export_section(page: ft.Page, settings: dict):
+def create_export_section(page: ft.Page, settings):
     # Picker
     export_dir_picker = ft.FilePicker()
     page.overlay.append(export_dir_picker)
@@ -10,25 +9,25 @@ def create_export_section(page: ft.Page, settings: dict):
     export_folder = ft.TextField(label="Export Folder", read_only=True, expand=True, value=settings.get("export_folder", ""))
     limit_rows = ft.TextField(label="Limit rows", value=str(settings.get("limit_rows", "20")), width=120, keyboard_type=ft.KeyboardType.NUMBER)
     creation_date_input = ft.TextField(label="Creation Date (DD.MM.YYYY)", hint_text="Leave empty for today", expand=True, value=settings.get("creation_date", ""))
+    # Diagnostics: not persisted, a profiled run is a one-off
+    profile_run = ft.Checkbox(label="Profile run (saves .pstats to export folder)", value=False)
+    snapshot_every = ft.TextField(label="Memory snapshot every N rows", hint_text="0 = off", value="0", width=220, keyboard_type=ft.KeyboardType.NUMBER)
 
     # Handlers
     def on_export_dir_pick(e: ft.FilePickerResultEvent):
         if e.path:
             export_folder.value = e.path
             export_folder.update()
-            settings["export_folder"] = export_folder.value
-            save_settings(settings)
+            settings.set("export_folder", export_folder.value)
 
     def on_limit_change(e):
         val = limit_rows.value.strip()
         if not val.isdigit():
             return
-        settings["limit_rows"] = int(val)
-        save_settings(settings)
+        settings.set("limit_rows", int(val))
 
     def on_creation_date_change(e):
-        settings["creation_date"] = creation_date_input.value
-        save_settings(settings)
+        settings.set("creation_date", creation_date_input.value)
 
     export_dir_picker.on_result = on_export_dir_pick
     limit_rows.on_change = on_limit_change
@@ -54,6 +53,10 @@ def create_export_section(page: ft.Page, settings: dict):
                                 creation_date_input,
                                 limit_rows,
                             ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                            ft.Row([
+                                profile_run,
+                                snapshot_every,
+                            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                         ],
                         spacing=12,
                     )
@@ -67,6 +70,8 @@ def create_export_section(page: ft.Page, settings: dict):
         "export_folder": export_folder,
         "limit_rows": limit_rows,
         "creation_date_input": creation_date_input,
+        "profile_run": profile_run,
+        "snapshot_every": snapshot_every,
     }
 
     return export_card, refs
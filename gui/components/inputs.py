@@ -1,7 +1,6 @@
 import flet as ft
-from gui.utils.settings import save_settings
 
-def create_inputs_section(page: ft.Page, settings: dict):
+def create_inputs_section(page: ft.Page, settings):
     # ----- Pickers -----
     krankmeldungen_picker = ft.FilePicker()
     kontaktdaten_picker = ft.FilePicker()
@@ -34,51 +33,43 @@ def create_inputs_section(page: ft.Page, settings: dict):
         if e.files and len(e.files) > 0:
             krankmeldungen_path.value = e.files[0].path or e.files[0].name
             krankmeldungen_path.update()
-            settings["krankmeldungen_path"] = krankmeldungen_path.value
-            save_settings(settings)
+            settings.set("krankmeldungen_path", krankmeldungen_path.value)
 
     def on_krank_ohne_pick(e: ft.FilePickerResultEvent):
         if e.files and len(e.files) > 0:
             krank_ohne_path.value = e.files[0].path or e.files[0].name
             krank_ohne_path.update()
-            settings["krank_ohne_path"] = krank_ohne_path.value
-            save_settings(settings)
+            settings.set("krank_ohne_path", krank_ohne_path.value)
 
     def on_krankmeldungen_sheet_change(e):
-        settings["krankmeldungen_sheet_name"] = krankmeldungen_sheet_name.value
-        save_settings(settings)
+        settings.set("krankmeldungen_sheet_name", krankmeldungen_sheet_name.value)
 
     def on_krank_mit_pick(e: ft.FilePickerResultEvent):
         if e.files and len(e.files) > 0:
             krank_mit_path.value = e.files[0].path or e.files[0].name
             krank_mit_path.update()
-            settings["krank_mit_path"] = krank_mit_path.value
-            save_settings(settings)
+            settings.set("krank_mit_path", krank_mit_path.value)
 
     def on_gesund_pick(e: ft.FilePickerResultEvent):
         if e.files and len(e.files) > 0:
             gesund_path.value = e.files[0].path or e.files[0].name
             gesund_path.update()
-            settings["gesund_path"] = gesund_path.value
-            save_settings(settings)
+            settings.set("gesund_path", gesund_path.value)
 
     def on_kontaktdaten_pick(e: ft.FilePickerResultEvent):
         if e.files and len(e.files) > 0:
             kontaktdaten_path.value = e.files[0].path or e.files[0].name
             kontaktdaten_path.update()
-            settings["kontaktdaten_path"] = kontaktdaten_path.value
-            save_settings(settings)
+            settings.set("kontaktdaten_path", kontaktdaten_path.value)
 
     def on_kontaktdaten_sheet_change(e):
-        settings["kontaktdaten_sheet_name"] = kontaktdaten_sheet_name.value
-        save_settings(settings)
+        settings.set("kontaktdaten_sheet_name", kontaktdaten_sheet_name.value)
 
     def on_au_dir_pick(e: ft.FilePickerResultEvent):
         if e.path:
             au_folder.value = e.path
             au_folder.update()
-            settings["au_folder"] = au_folder.value
-            save_settings(settings)
+            settings.set("au_folder", au_folder.value)
 
     # Wire handlers
     krankmeldungen_picker.on_result = on_krankmeldungen_pick
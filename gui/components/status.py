@@ -1,79 +1,345 @@
+import os
+import sys
+import time
+import atexit
+import threading
+import subprocess
+from collections import deque
+
 import flet as ft
+from gui.logic.scheduler import RUNNING
+from gui.utils.settings import get_project_root
 
-def create_status_section():
-    log_view = ft.ListView(expand=True, spacing=6, auto_scroll=True)
-    status_bar = ft.Text("Ready.")
-    prog = ft.ProgressBar(width=400, visible=False)
+# Redraw the log at most this often; messages arriving in between are batched
+LOG_FLUSH_INTERVAL = 0.1
+# Lines kept in the on-screen log; the full session log is on disk
+MAX_VISIBLE_LOG_LINES = 300
+LOG_FILE_PATH = os.path.join(get_project_root(), "automeldung.log")
+# Sessions are appended to the log file; past this size it moves to automeldung.log.1
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+# Lines in the job list (queued, running and recently finished exports)
+MAX_JOB_LINES = 20
 
-    # State for log grouping
-    log_state = {"current_column": None}
+# Severity ranks used for coloring and the filter dropdown
+SEVERITY_INFO, SEVERITY_SUCCESS, SEVERITY_WARNING, SEVERITY_ERROR = 0, 1, 2, 3
+LOG_FILTERS = {
+    "all": SEVERITY_INFO,
+    "warnings": SEVERITY_WARNING,
+    "errors": SEVERITY_ERROR,
+}
 
-    def append_log(msg: str):
-        # Colorize based on simple keywords
+def _classify(msg: str):
+    """Return (severity, color) for a log line based on simple keywords."""
+    ml = msg.lower()
+    if any(k in ml for k in ("error", "fehler", "exception", "traceback")):
+        return SEVERITY_ERROR, ft.Colors.RED_400
+    if any(k in ml for k in ("warn", "achtung")):
+        return SEVERITY_WARNING, ft.Colors.AMBER_400
+    if any(k in ml for k in ("finished", "success", "done", "fertig")):
+        return SEVERITY_SUCCESS, ft.Colors.GREEN_400
+    if any(k in ml for k in ("started", "starting", "start")):
+        return SEVERITY_INFO, ft.Colors.BLUE_300
+    return SEVERITY_INFO, ft.Colors.GREY
+
+def _starts_block(msg: str) -> bool:
+    # Messages of queued jobs carry a "[#3 Workbook.xlsx] " prefix
+    if msg.startswith("[") and "] " in msg:
+        msg = msg.split("] ", 1)[1]
+    # "Processing:" indicates start of a new person/row
+    # "Export started..." or "Export finished." are major lifecycle events
+    return msg.startswith("Processing:") or msg.startswith("Export started") or msg.startswith("Export finished")
+
+def _open_with_system_viewer(path: str):
+    if sys.platform == "win32":
+        os.startfile(path)
+    elif sys.platform == "darwin":
+        subprocess.Popen(["open", path])
+    else:
+        subprocess.Popen(["xdg-open", path])
+
+class LogSink:
+    """Buffers log messages from any thread and renders them in batches.
+
+    append() only queues the message and writes it to the log file; a
+    background thread redraws the ListView at most every LOG_FLUSH_INTERVAL with
+    a single page.update() and flushes the file once per batch. The view keeps
+    the last MAX_VISIBLE_LOG_LINES lines (ring buffer), so a long run no longer
+    grows the GUI process. Each session is appended to the file below a header
+    line; close() flushes and closes it (registered at exit).
+    """
+
+    def __init__(self, page, log_view, status_bar, log_path=LOG_FILE_PATH):
+        self.page = page
+        self.log_view = log_view
+        self.status_bar = status_bar
+        self.log_path = log_path
+        self.min_severity = SEVERITY_INFO
+        # (msg, severity, color, starts_block) for rebuilding the view on filter change
+        self._history = deque(maxlen=MAX_VISIBLE_LOG_LINES)
+        self._pending = []
+        self._lock = threading.Lock()
+        self._has_data = threading.Event()
+        self._log_file = None
+        self._session_started = False
+        self._current_column = None
+        self._visible_lines = 0
+        self._flusher = None
+
+    def append(self, msg):
         m = str(msg)
-        ml = m.lower()
-        color = None
-        if any(k in ml for k in ("error", "fehler", "exception", "traceback")):
-            color = ft.Colors.RED_400
-        elif any(k in ml for k in ("warn", "achtung")):
-            color = ft.Colors.AMBER_400
-        elif any(k in ml for k in ("finished", "success", "done", "fertig")):
-            color = ft.Colors.GREEN_400
-        elif any(k in ml for k in ("started", "starting", "start")):
-            color = ft.Colors.BLUE_300
-        else:
-            color = ft.Colors.GREY
-
-        # Determine if we need a new block
-        # "Processing:" indicates start of a new person/row
-        # "Export started..." or "Export finished." are major lifecycle events
-        is_new_block = m.startswith("Processing:") or m.startswith("Export started") or m.startswith("Export finished")
-
-        if is_new_block or log_state["current_column"] is None:
-            log_state["current_column"] = ft.Column(spacing=2)
-            container = ft.Container(
-                content=log_state["current_column"],
+        severity, color = _classify(m)
+        entry = (m, severity, color, _starts_block(m))
+        with self._lock:
+            self._pending.append(entry)
+            self._write_to_file(m)
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+                self._flusher.start()
+        self._has_data.set()
+
+    def set_filter(self, key: str):
+        """Show only lines at or above the chosen severity and redraw from history."""
+        with self._lock:
+            self.min_severity = LOG_FILTERS.get(key, SEVERITY_INFO)
+            self.log_view.controls.clear()
+            self._current_column = None
+            self._visible_lines = 0
+            for entry in self._history:
+                self._render(entry)
+        self._update(self.log_view)
+
+    def open_full_log(self):
+        with self._lock:
+            if self._log_file:
+                self._log_file.flush()
+        if os.path.exists(self.log_path):
+            _open_with_system_viewer(self.log_path)
+
+    def close(self):
+        """Flush and close the log file; a later append() reopens it."""
+        with self._lock:
+            log_file, self._log_file = self._log_file, None
+        if log_file is not None:
+            try:
+                log_file.close()
+            except OSError:
+                pass
+
+    # --- internals ---
+
+    def _write_to_file(self, msg: str):
+        try:
+            if self._log_file is None:
+                self._log_file = self._open_log_file()
+            self._log_file.write(f"{time.strftime('%H:%M:%S')} {msg}\n")
+        except OSError:
+            pass
+
+    def _open_log_file(self):
+        # "Show full log" opens this file; earlier sessions stay above this one
+        if not self._session_started:
+            try:
+                if os.path.getsize(self.log_path) > LOG_FILE_MAX_BYTES:
+                    os.replace(self.log_path, self.log_path + ".1")
+            except OSError:
+                pass
+        log_file = open(self.log_path, "a", encoding="utf-8")
+        if not self._session_started:
+            log_file.write(f"--- Session started {time.strftime('%Y-%m-%d %H:%M:%S')} ---\n")
+            self._session_started = True
+        return log_file
+
+    def _flush_loop(self):
+        while True:
+            self._has_data.wait()
+            # Let everything that arrives within one frame join this batch
+            time.sleep(LOG_FLUSH_INTERVAL)
+            self._has_data.clear()
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return
+            for entry in batch:
+                self._history.append(entry)
+                self._render(entry)
+            self._trim()
+            if self._log_file is not None:
+                try:
+                    self._log_file.flush()
+                except OSError:
+                    pass
+            last_msg, _, last_color, _ = batch[-1]
+            self.status_bar.value = last_msg
+            self.status_bar.color = last_color
+        self._update(self.log_view, self.status_bar)
+
+    def _render(self, entry):
+        msg, severity, color, starts_block = entry
+        if severity < self.min_severity:
+            return
+        if starts_block or self._current_column is None:
+            self._current_column = ft.Column(spacing=2)
+            self.log_view.controls.append(ft.Container(
+                content=self._current_column,
                 padding=10,
                 border=ft.border.all(1, color if color != ft.Colors.GREY else ft.Colors.BLUE_GREY_400),
                 border_radius=5,
-            )
-            log_view.controls.append(container)
-            log_view.update()
+            ))
+        self._current_column.controls.append(ft.Text(msg, color=color, selectable=True))
+        self._visible_lines += 1
 
-        # Add the message line to the current block
-        log_state["current_column"].controls.append(ft.Text(m, color=color, selectable=True))
-        log_state["current_column"].update()
+    def _trim(self):
+        # Drop the oldest lines (and emptied blocks) beyond the visible cap
+        controls = self.log_view.controls
+        while self._visible_lines > MAX_VISIBLE_LOG_LINES and controls:
+            column = controls[0].content
+            if column.controls:
+                column.controls.pop(0)
+                self._visible_lines -= 1
+            if not column.controls:
+                controls.pop(0)
+                if column is self._current_column:
+                    self._current_column = None
 
-        status_bar.value = m
-        status_bar.color = color
-        status_bar.update()
+    def _update(self, *controls):
+        try:
+            self.page.update(*controls)
+        except Exception:
+            # Controls not mounted yet (or page closed); next flush redraws
+            pass
+
+class JobList:
+    """One line per export job: label, progress bar, progress text and a cancel button.
+
+    show(job) may be called from any thread (the scheduler's job threads); it
+    only updates that job's controls.
+    """
+
+    def __init__(self, page, column, on_cancel=None):
+        self.page = page
+        self.column = column
+        self.on_cancel = on_cancel
+        self._rows = {}
+        self._lock = threading.Lock()
+
+    def show(self, job):
+        with self._lock:
+            row = self._rows.get(job.id)
+            if row is None:
+                row = self._create_row(job)
+                self._rows[job.id] = row
+                self.column.controls.append(row["container"])
+                self._trim()
+            finished = job.finished
+            _, total, fraction = job.progress()
+            text = job.describe()
+            row["bar"].value = fraction if total else (None if job.state == RUNNING else 0)
+            row["bar"].visible = not finished
+            row["text"].value = text
+            row["text"].color = _classify(text)[1] if finished else ft.Colors.GREY_400
+            row["cancel"].visible = not finished
+            self.column.visible = True
+        try:
+            self.page.update(self.column)
+        except Exception:
+            pass
+
+    def _create_row(self, job):
+        bar = ft.ProgressBar(width=160, value=0)
+        text = ft.Text("", size=12)
+        cancel = ft.IconButton(ft.Icons.CLOSE, tooltip="Cancel job", icon_size=16, on_click=lambda e, job_id=job.id: self._cancel(job_id))
+        container = ft.Row([
+            ft.Text(job.label, size=12, width=220, no_wrap=True, overflow=ft.TextOverflow.ELLIPSIS),
+            bar,
+            ft.Container(text, expand=True),
+            cancel,
+        ], spacing=8)
+        return {"job": job, "container": container, "bar": bar, "text": text, "cancel": cancel}
+
+    def _cancel(self, job_id):
+        if self.on_cancel is not None:
+            self.on_cancel(job_id)
+
+    def _trim(self):
+        # Forget the oldest finished jobs beyond MAX_JOB_LINES
+        finished = sorted(job_id for job_id, row in self._rows.items() if row["job"].finished)
+        for job_id in finished[:max(0, len(self._rows) - MAX_JOB_LINES)]:
+            self.column.controls.remove(self._rows.pop(job_id)["container"])
+
+def create_status_section(page: ft.Page):
+    log_view = ft.ListView(expand=True, spacing=6, auto_scroll=True)
+    status_bar = ft.Text("Ready.")
+    prog = ft.ProgressBar(width=400, visible=False)
+    # Rows done, rows/sec and ETA, driven by the exporter's progress events
+    progress_text = ft.Text("", size=12, color=ft.Colors.GREY_400)
+    # One line per queued/running/finished export job (filled by the runner)
+    jobs_view = ft.Column(spacing=4, visible=False)
+    job_list = JobList(page, jobs_view)
+
+    sink = LogSink(page, log_view, status_bar)
+    atexit.register(sink.close)
+
+    def append_log(msg: str):
+        sink.append(msg)
+
+    log_filter = ft.Dropdown(
+        width=170,
+        dense=True,
+        value="all",
+        options=[
+            ft.dropdown.Option("all", "All messages"),
+            ft.dropdown.Option("warnings", "Warnings & errors"),
+            ft.dropdown.Option("errors", "Errors only"),
+        ],
+        on_change=lambda e: sink.set_filter(log_filter.value),
+    )
+    show_all_btn = ft.TextButton("Show full log", icon=ft.Icons.OPEN_IN_NEW, on_click=lambda e: sink.open_full_log())
+
+    run_btn = ft.ElevatedButton("Run", icon=ft.Icons.PLAY_ARROW, tooltip="Queue an export with the current settings")
+    resume_btn = ft.OutlinedButton("Resume", icon=ft.Icons.REPLAY)
+    cancel_btn = ft.OutlinedButton("Cancel all", icon=ft.Icons.CANCEL)
+    check_btn = ft.OutlinedButton(
+        "Check rows", icon=ft.Icons.FACT_CHECK,
+        tooltip="List what each row would produce and which rows would fail, without creating PDFs",
+    )
 
-    run_btn = ft.ElevatedButton("Run", icon=ft.Icons.PLAY_ARROW)
-    cancel_btn = ft.OutlinedButton("Cancel", icon=ft.Icons.CANCEL)
-    
     actions_row = ft.Row([
         run_btn,
+        resume_btn,
         cancel_btn,
+        check_btn,
     ], spacing=12)
 
     status_card = ft.Card(
         content=ft.Container(
             content=ft.Column([
-                ft.Text("Status", style=ft.TextThemeStyle.TITLE_MEDIUM),
+                ft.Row([
+                    ft.Text("Status", style=ft.TextThemeStyle.TITLE_MEDIUM),
+                    ft.Row([log_filter, show_all_btn], spacing=8),
+                ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                 log_view,
                 ft.Row([prog, status_bar], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                progress_text,
+                jobs_view,
                 actions_row,
             ], spacing=12),
             padding=16,
             expand=True,
         )
     )
-    
+
     refs = {
         "append_log": append_log,
         "prog": prog,
+        "progress_text": progress_text,
+        "job_list": job_list,
         "run_btn": run_btn,
+        "resume_btn": resume_btn,
         "cancel_btn": cancel_btn,
+        "check_btn": check_btn,
     }
 
     return status_card, refs
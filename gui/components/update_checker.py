@@ -1,20 +1,97 @@
 import flet as ft
-import requests
 import os
 import sys
 import subprocess
 import logging
 import threading
+import json
+import time
+
+import update_service
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for the launcher's update check before checking ourselves
+LAUNCHER_STATUS_WAIT = 15
+_STATUS_POLL_INTERVAL = 0.25
+# Re-check interval for sessions left open, and the retry delay after a
+# failed check (doubles from UPDATE_RETRY_MIN up to UPDATE_RETRY_MAX)
+UPDATE_RECHECK_INTERVAL = 4 * 60 * 60
+UPDATE_RETRY_MIN = 60
+UPDATE_RETRY_MAX = 60 * 60
+
+
+def wait_for_launcher_status(path, timeout=LAUNCHER_STATUS_WAIT):
+    """Result of the launcher's update check (see launcher.startup_worker).
+
+    Returns the status dict ({"update": {...} or None}) once the launcher wrote
+    it, or None when it did not arrive within timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(_STATUS_POLL_INTERVAL)
+
+
+class UpdateCheckLoop:
+    """Runs check() on a daemon thread: at once, then every interval.
+
+    check() returns True when it found an update (the loop ends, the banner
+    stays), False when the app is up to date, and raises when the check
+    failed; failed checks are retried with exponential backoff. Nothing here
+    runs on the page-setup path, so an offline start is not delayed.
+    """
+
+    def __init__(self, check, interval=UPDATE_RECHECK_INTERVAL, retry_min=UPDATE_RETRY_MIN, retry_max=UPDATE_RETRY_MAX):
+        self.check = check
+        self.interval = interval
+        self.retry_min = retry_min
+        self.retry_max = retry_max
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="update-check", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        retry = self.retry_min
+        while True:
+            try:
+                if self.check():
+                    return
+                delay, retry = self.interval, self.retry_min
+            except Exception as e:
+                logger.warning(f"Update check failed: {e}; retrying in {retry:.0f}s")
+                delay, retry = retry, min(retry * 2, self.retry_max)
+            time.sleep(delay)
+
 def create_update_banner(page: ft.Page, current_version: str, update_url: str):
     """
     Creates an update banner with modern styling.
+
+    Returns (banner, start_update_checks); call the latter once the page is
+    drawn. The banner's controls are changed from the check thread and from
+    click handlers, always under ui_lock.
     """
     update_container = ft.Container(visible=False)
+    ui_lock = threading.Lock()
+    service = update_service.UpdateService(update_url)
+
+    def refresh():
+        try:
+            page.update(update_container)
+        except Exception:
+            # Page closed while a check was running
+            pass
     
     # UI Elements with improved styling
     update_icon = ft.Icon(ft.Icons.SYSTEM_UPDATE, color=ft.Colors.GREEN_400, size=24)
@@ -23,11 +100,12 @@ def create_update_banner(page: ft.Page, current_version: str, update_url: str):
     
     def start_update(e):
         """Triggers the update process via AutoMeldung.exe (launcher)"""
-        update_btn.disabled = True
-        update_btn.text = "Starting..."
-        status_text.value = "⏳ Please close this window for the update to start."
-        status_text.color = ft.Colors.AMBER_400
-        page.update()
+        with ui_lock:
+            update_btn.disabled = True
+            update_btn.text = "Starting..."
+            status_text.value = "⏳ Please close this window for the update to start."
+            status_text.color = ft.Colors.AMBER_400
+        refresh()
 
         try:
             # Determine launcher path
@@ -48,33 +126,37 @@ def create_update_banner(page: ft.Page, current_version: str, update_url: str):
                 startupinfo = subprocess.STARTUPINFO()
                 startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
                 startupinfo.wShowWindow = subprocess.SW_HIDE
+            # The launcher installs as soon as this process has exited
+            handoff = ["--app-pid", str(os.getpid())]
 
             if getattr(sys, 'frozen', False):
                 if os.path.exists(launcher_path):
-                    subprocess.Popen([launcher_path, "--install-update"], startupinfo=startupinfo)
+                    subprocess.Popen([launcher_path, "--install-update", *handoff], startupinfo=startupinfo)
                 else:
                     raise FileNotFoundError(f"Launcher not found at {launcher_path}")
             else:
                 # Run python launcher.py
-                subprocess.Popen([sys.executable, launcher_path, "--install-update"], startupinfo=startupinfo)
+                subprocess.Popen([sys.executable, launcher_path, "--install-update", *handoff], startupinfo=startupinfo)
 
             # Update UI to inform user
-            update_text.value = "Update ready!"
-            update_icon.name = ft.Icons.CHECK_CIRCLE
-            update_icon.color = ft.Colors.GREEN_400
-            update_btn.visible = False
-            status_text.value = "✕ Please close this window now for the update to install."
-            status_text.color = ft.Colors.GREEN_400
-            status_text.weight = ft.FontWeight.BOLD
-            page.update()
+            with ui_lock:
+                update_text.value = "Update ready!"
+                update_icon.name = ft.Icons.CHECK_CIRCLE
+                update_icon.color = ft.Colors.GREEN_400
+                update_btn.visible = False
+                status_text.value = "✕ Please close this window now for the update to install."
+                status_text.color = ft.Colors.GREEN_400
+                status_text.weight = ft.FontWeight.BOLD
+            refresh()
 
         except Exception as ex:
             logger.error(f"Failed to start launcher: {ex}")
-            status_text.value = f"❌ Error: {ex}"
-            status_text.color = ft.Colors.RED_400
-            update_btn.disabled = False
-            update_btn.text = "Retry Update"
-            page.update()
+            with ui_lock:
+                status_text.value = f"❌ Error: {ex}"
+                status_text.color = ft.Colors.RED_400
+                update_btn.disabled = False
+                update_btn.text = "Retry Update"
+            refresh()
 
     update_btn = ft.ElevatedButton(
         "Update Now",
@@ -109,38 +191,60 @@ def create_update_banner(page: ft.Page, current_version: str, update_url: str):
         border_radius=10,
     )
 
-    def check_for_updates():
-        """Checks version.json on the server."""
-        # If launched with --update-available, show banner immediately
-        if os.environ.get("UPDATE_AVAILABLE") == "1":
-            update_text.value = "🎉 New version available!"
+    def show_update(latest_version=None):
+        with ui_lock:
+            update_text.value = f"🎉 New version {latest_version} available!" if latest_version else "🎉 New version available!"
             update_btn.visible = True
             update_container.visible = True
-            page.update()
-            return
+        refresh()
 
-        # Otherwise, check manually (e.g. if app is left open)
-        try:
-            version_url = update_url.rstrip("/") + "/version.json"
-            logger.info(f"Checking for updates at {version_url}")
-            
-            resp = requests.get(version_url, timeout=5)
-            if resp.status_code == 200:
-                data = resp.json()
-                latest_version = data.get("version")
-                
-                if latest_version != current_version:
-                    logger.info(f"Update found: {latest_version}")
-                    update_text.value = f"🎉 New version {latest_version} available!"
-                    update_btn.visible = True
-                    update_container.visible = True
-                    page.update()
-                else:
-                    logger.info("App is up to date.")
-            else:
-                logger.warning(f"Could not check updates. Status: {resp.status_code}")
-        except Exception as e:
-            logger.error(f"Update check failed: {e}")
+    def launcher_result():
+        """The update found by the launcher's check, False when it found none,
+        None when there is no usable result (not started by the launcher, or
+        its check failed)."""
+        # If launched with --update-available, show banner immediately
+        if os.environ.get("UPDATE_AVAILABLE") == "1":
+            return {}  # an update without a known version
+
+        # Started by the launcher, which checks while this app loads
+        status_file = os.environ.get("UPDATE_STATUS_FILE")
+        if not status_file:
+            return None
+        # The launcher keeps its manifest cache next to the status file
+        service.cache_path = os.path.join(os.path.dirname(status_file), update_service.CACHE_FILE)
+        status = wait_for_launcher_status(status_file)
+        if status is None:
+            logger.info("No update check result from launcher; checking here.")
+            return None
+        if status.get("manifest"):
+            return update_service.update_info(status["manifest"], current_version) or False
+        return status.get("update") or None
+
+    first_check = [True]
+
+    def check_for_updates():
+        """One check (blocking; UpdateCheckLoop runs it on a thread).
+
+        Returns True when an update is shown, False when up to date; raises
+        when version.json could not be fetched.
+        """
+        update = None
+        if first_check[0]:
+            first_check[0] = False
+            update = launcher_result()
+            if update is False:
+                logger.info("App is up to date (checked by launcher).")
+                return False
+        if update is None:
+            # A recent check by the launcher (or this app) is reused
+            update = service.check(current_version)
+            if not update:
+                logger.info("App is up to date.")
+                return False
+        logger.info(f"Update found: {update.get('version')}")
+        show_update(update.get("version"))
+        return True
 
-    return update_container, check_for_updates
+    loop = UpdateCheckLoop(check_for_updates)
+    return update_container, loop.start
 
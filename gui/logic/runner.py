@@ -1,14 +1,51 @@
+import atexit
 import threading
-import importlib
-import os
-import automeldung.config as config
-from gui.utils.settings import save_settings
+
+from automeldung.utils.run.context import RunContext
+from gui.logic.scheduler import JobScheduler, DEFAULT_MAX_CONCURRENT_JOBS, RUNNING, QUEUED
+
+def start_backend_warmup(scheduler, settings):
+    """Start the first export worker so the first run starts fast.
+
+    The worker imports the backends and loads the Kontaktdaten, templates and
+    AU listing of the current settings; it stays warm for later runs.
+    """
+    scheduler.warm_up(RunContext.from_settings(settings.snapshot()))
 
 def setup_runner(page, settings, input_refs, export_refs, status_refs):
     append_log = status_refs["append_log"]
     prog = status_refs["prog"]
-    
-    def on_run_clicked(e):
+    progress_text = status_refs["progress_text"]
+    job_list = status_refs["job_list"]
+
+    def on_job_change(job):
+        job_list.show(job)
+        jobs = scheduler.jobs()
+        running = [j for j in jobs if j.state == RUNNING]
+        queued = sum(1 for j in jobs if j.state == QUEUED)
+        progress = [j.progress() for j in running]
+        total = sum(t for _, t, _ in progress)
+        completed = sum(c for c, _, _ in progress)
+        prog.visible = bool(running)
+        prog.value = completed / total if total else None
+        progress_text.value = f"{len(running)} running, {queued} queued" if running or queued else ""
+        try:
+            page.update(prog, progress_text)
+        except Exception:
+            pass
+
+    scheduler = JobScheduler(
+        max_concurrent=settings.get("max_concurrent_jobs", DEFAULT_MAX_CONCURRENT_JOBS),
+        on_change=on_job_change,
+        # Exports run in worker processes unless turned off in app_settings.json
+        isolated=settings.get("isolated_exports", True) is not False,
+    )
+    job_list.on_cancel = scheduler.cancel
+    # Stops idle workers and unlinks the shared-memory blocks on exit
+    atexit.register(scheduler.close)
+
+    def build_context():
+        """Persist the form values and return an immutable RunContext of them."""
         # Extract values
         krankmeldungen_path = input_refs["krankmeldungen_path"]
         krankmeldungen_sheet_name = input_refs["krankmeldungen_sheet_name"]
@@ -23,40 +60,13 @@ def setup_runner(page, settings, input_refs, export_refs, status_refs):
         limit_rows = export_refs["limit_rows"]
         creation_date_input = export_refs["creation_date_input"]
 
-        # Apply UI paths to config temporarily (only if provided)
-        if krankmeldungen_path.value:
-            config.krankmeldungsliste_path = krankmeldungen_path.value
-        if krankmeldungen_sheet_name.value.strip():
-            config.krankmeldungsliste_sheet_name = krankmeldungen_sheet_name.value.strip()
-        if export_folder.value:
-            config.export_path = export_folder.value
-        if krank_ohne_path.value:
-            config.vorlage_krankmeldung_ohne_au_path = krank_ohne_path.value
-        if krank_mit_path.value:
-            config.vorlage_krankmeldung_mit_au_path = krank_mit_path.value
-        if gesund_path.value:
-            config.vorlage_gesundmeldung_path = gesund_path.value
-        if au_folder.value:
-            config.au_files_path = au_folder.value
-        if kontaktdaten_path.value:
-            config.kontaktdaten_path = kontaktdaten_path.value
-        if kontaktdaten_sheet_name.value.strip():
-            config.kontaktdaten_sheet_name = kontaktdaten_sheet_name.value.strip()
-        
-        # Set creation date if provided
-        if creation_date_input.value.strip():
-            config.creation_date = creation_date_input.value.strip()
-        else:
-            config.creation_date = None
-
         # Limit rows
         try:
             limit = int(limit_rows.value.strip()) if limit_rows.value.strip() else 20
         except ValueError:
             limit = 20
-        os.environ['AUTOMELDUNG_LIMIT'] = str(limit)
 
-        # Persist current values
+        # Persist current values (written in the background by the settings store)
         settings.update({
             "krankmeldungen_path": krankmeldungen_path.value,
             "krankmeldungen_sheet_name": krankmeldungen_sheet_name.value,
@@ -70,43 +80,55 @@ def setup_runner(page, settings, input_refs, export_refs, status_refs):
             "limit_rows": limit,
             "creation_date": creation_date_input.value,
         })
-        save_settings(settings)
 
-        # Show progress UI
-        prog.visible = True
-        prog.update()
-        append_log("Export started...")
+        # Immutable snapshot for this job; later edits in the form do not affect it.
+        # Empty fields fall back to the config defaults.
+        return RunContext.from_settings(
+            settings.snapshot(),
+            creation_date=creation_date_input.value.strip() or None,
+            log=lambda m: append_log(str(m)),
+        )
 
-        def worker():
-            try:
-                # (Re-)set logger so backend logs appear in the UI
-                try:
-                    config.set_logger(lambda m: append_log(str(m)))
-                except Exception:
-                    pass
-                # Re-import exporter to ensure it sees updated config
-                importlib.reload(config)
-                try:
-                    config.set_logger(lambda m: append_log(str(m)))
-                except Exception:
-                    pass
-                # Run existing exporter (iterates over head(20) inside)
-                from automeldung.main_exporter import main_exporter as run_exporter
-                run_exporter()
-                append_log("Export finished.")
-            except Exception as ex:
-                append_log(f"Error: {ex}")
-            finally:
-                prog.visible = False
-                page.update()
+    def start_export(resume: bool):
+        profile_run = bool(export_refs["profile_run"].value)
+        snapshot_text = (export_refs["snapshot_every"].value or "").strip()
+        snapshot_every = int(snapshot_text) if snapshot_text.isdigit() else 0
+        ctx = build_context()
+
+        job = scheduler.submit(ctx, resume=resume, profile=profile_run, snapshot_every=snapshot_every)
+        if scheduler.active > 1:
+            append_log(f"Queued {job.label}.")
+
+    def on_run_clicked(e):
+        start_export(resume=False)
 
-        threading.Thread(target=worker, daemon=True).start()
+    def on_resume_clicked(e):
+        start_export(resume=True)
 
     def on_cancel_clicked(e):
-        append_log("Operation cancelled.")
-        prog.visible = False
-        prog.update()
+        if not scheduler.active:
+            return
+        scheduler.cancel_all()
+        append_log("Cancelling all jobs... running ones finish their current step first.")
+
+    def on_check_clicked(e):
+        ctx = build_context()
+        append_log("Checking rows (no PDFs are created)...")
+
+        def check():
+            try:
+                result = scheduler.dry_run(ctx)
+            except Exception as ex:
+                append_log(f"Error: check failed: {ex}")
+                return
+            for line in result.format_table():
+                append_log(line)
+
+        threading.Thread(target=check, name="dry-run", daemon=True).start()
 
     # Attach handlers
     status_refs["run_btn"].on_click = on_run_clicked
+    status_refs["resume_btn"].on_click = on_resume_clicked
     status_refs["cancel_btn"].on_click = on_cancel_clicked
+    status_refs["check_btn"].on_click = on_check_clicked
+    return scheduler
@@ -0,0 +1,338 @@
+import os
+import logging
+import threading
+from dataclasses import replace
+
+from automeldung.utils.run.cancel import CancelToken, ExportCancelled
+from automeldung.utils.run.context import RunCaches
+from automeldung.utils.run.events import ProgressTracker, RunStarted, RowDone, RowFailed, RunFinished
+
+logger = logging.getLogger(__name__)
+
+# Exports running at the same time (override with "max_concurrent_jobs" in app_settings.json)
+DEFAULT_MAX_CONCURRENT_JOBS = 2
+# Finished jobs kept in the list; older ones are forgotten
+MAX_FINISHED_JOBS = 20
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+# Events that change what the status panel shows for a job
+_PROGRESS_EVENTS = (RunStarted, RowDone, RowFailed, RunFinished)
+
+
+class ExportJob:
+    """One queued export with its own settings snapshot, cancel token and progress."""
+
+    def __init__(self, job_id: int, ctx, resume=False, profile=False, snapshot_every=0):
+        self.id = job_id
+        self.ctx = ctx
+        self.resume = resume
+        self.profile = profile
+        self.snapshot_every = snapshot_every
+        workbook = os.path.basename(ctx.krankmeldungsliste_path or "") or "export"
+        self.label = f"#{job_id} {workbook}"
+        self.token = CancelToken()
+        # Events arrive from pipeline threads while the GUI reads progress;
+        # go through track()/progress()/describe(), which hold the lock
+        self.tracker = ProgressTracker()
+        self._progress_lock = threading.Lock()
+        self.state = QUEUED
+        self.stats = None
+        self.error = None
+        # ExportProcess running this job (isolated mode)
+        self.engine = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (DONE, FAILED, CANCELLED)
+
+    def track(self, event):
+        with self._progress_lock:
+            self.tracker.update(event)
+
+    def progress(self):
+        """(completed, total, fraction) of the rows, read together."""
+        with self._progress_lock:
+            return self.tracker.completed, self.tracker.total, self.tracker.fraction
+
+    def describe(self) -> str:
+        with self._progress_lock:
+            return self._describe()
+
+    def _describe(self) -> str:
+        if self.state == QUEUED:
+            return "Queued" + (" (resume)" if self.resume else "")
+        if self.state == RUNNING:
+            if self.token.cancelled:
+                return "Cancelling... (cancel again to stop at once)"
+            return self.tracker.describe() if self.tracker.total else "Starting..."
+        if self.state == DONE:
+            stats = self.stats or {}
+            return f"Done: {stats.get('done', 0)} done, {stats.get('failed', 0)} failed"
+        if self.state == CANCELLED:
+            return "Cancelled" + (f" after {self.tracker.completed} row(s)" if self.tracker.completed else "")
+        return f"Failed: {self.error}"
+
+
+class JobScheduler:
+    """Queues export jobs and runs up to max_concurrent of them at once.
+
+    isolated (default): every running job gets a worker process
+    (automeldung.utils.run.engine.ExportProcess), so PDF work does not stall
+    the UI and a crash in a PDF library only fails that job. Idle worker
+    processes are kept warm for the next job, and templates and lookup tables
+    are handed to them through shared memory (SharedStore). Cancel asks a job to stop at its
+    next safe point; cancelling it again terminates its process.
+
+    Otherwise jobs run on threads in this process and share one thread pool
+    for their PDF stages and one RunCaches.
+
+    Two jobs with the same export folder never run at the same time (they would
+    share the checkpoint file); the later one waits in the queue.
+
+    on_change(job) is called from worker threads whenever a job's state or
+    progress changes.
+    """
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT_JOBS, on_change=None, isolated: bool = True):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.on_change = on_change
+        self.isolated = isolated
+        self.caches = RunCaches()
+        self._jobs = []
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_per_job = 0
+        self._idle_engines = []
+        self._store = None
+
+    def submit(self, ctx, resume=False, profile=False, snapshot_every=0) -> ExportJob:
+        with self._lock:
+            job = ExportJob(self._next_id, ctx, resume=resume, profile=profile, snapshot_every=snapshot_every)
+            self._next_id += 1
+            self._jobs.append(job)
+            self._forget_old_jobs()
+        self._notify(job)
+        self._dispatch()
+        return job
+
+    def cancel(self, job_id: int):
+        """Drop a queued job; cancel a running one at its next safe point.
+
+        Cancelling a job that is already cancelling terminates its worker
+        process (isolated mode).
+        """
+        with self._lock:
+            job = next((j for j in self._jobs if j.id == job_id), None)
+            if job is None or job.finished:
+                return
+            force = job.token.cancelled
+            job.token.cancel()
+            if job.state == QUEUED:
+                job.state = CANCELLED
+            engine = job.engine
+        if force and engine is not None:
+            engine.terminate()
+        self._notify(job)
+
+    def dry_run(self, ctx, cancel_token=None):
+        """Check the rows of ctx without exporting (automeldung.dry_run); blocks.
+
+        Not queued: it writes nothing, so it may run next to exports. Uses a
+        warm worker process in isolated mode.
+        """
+        ctx = replace(ctx, caches=self.caches)
+        if not self.isolated:
+            from automeldung.dry_run import dry_run
+            return dry_run(ctx, cancel_token=cancel_token)
+        self._refresh_shared(ctx)
+        engine = self._take_engine()
+        try:
+            return engine.run(ctx, cancel_token=cancel_token, dry_run=True)
+        finally:
+            self._release_engine(engine)
+
+    def warm_up(self, ctx=None):
+        """Prepare a worker in the background: backends imported and, given
+        ctx, its Kontaktdaten, templates and AU listing loaded."""
+        if self.isolated:
+            def start():
+                engine = self._take_engine()
+                if ctx is not None:
+                    self._refresh_shared(ctx)
+                    engine.preload(ctx)
+                self._release_engine(engine)
+            threading.Thread(target=start, name="export-warmup", daemon=True).start()
+            return
+
+        def warmup():
+            try:
+                from automeldung.main_exporter import warm_up_backends, preload_lookups
+                warm_up_backends()
+                if ctx is not None:
+                    preload_lookups(replace(ctx, caches=self.caches))
+            except Exception as ex:
+                # The first run reports the real import error
+                (ctx.log if ctx is not None else logger.warning)(f"warn: backend warm-up failed: {ex}")
+
+        threading.Thread(target=warmup, name="export-warmup", daemon=True).start()
+
+    def close(self):
+        """Stop the idle worker processes and release the shared memory."""
+        with self._lock:
+            engines, self._idle_engines = self._idle_engines, []
+            store, self._store = self._store, None
+        for engine in engines:
+            engine.close()
+        if store is not None:
+            store.close()
+
+    def cancel_all(self):
+        for job in self.jobs():
+            self.cancel(job.id)
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs)
+
+    @property
+    def active(self) -> int:
+        """Number of jobs queued or running."""
+        with self._lock:
+            return sum(1 for j in self._jobs if not j.finished)
+
+    # --- internals ---
+
+    def _dispatch(self):
+        started = []
+        with self._lock:
+            running = [j for j in self._jobs if j.state == RUNNING]
+            busy_folders = {j.ctx.export_path for j in running}
+            for job in self._jobs:
+                if len(running) + len(started) >= self.max_concurrent:
+                    break
+                if job.state != QUEUED or job.ctx.export_path in busy_folders:
+                    continue
+                job.state = RUNNING
+                busy_folders.add(job.ctx.export_path)
+                started.append(job)
+        for job in started:
+            self._notify(job)
+            threading.Thread(target=self._run_job, args=(job,), name=f"export-job-{job.id}", daemon=True).start()
+
+    def _shared_executor(self, ctx):
+        # validate + write plus the four PDF stages, for every concurrent job
+        per_job = 2 + 4 * max(1, int(ctx.pipeline_workers))
+        with self._lock:
+            if self._executor is None or per_job > self._executor_per_job:
+                from concurrent.futures import ThreadPoolExecutor
+                # Jobs still running keep the smaller pool; its threads end
+                # once they drop it
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrent * per_job, thread_name_prefix="export"
+                )
+                self._executor_per_job = per_job
+            return self._executor
+
+    def _shared_store(self):
+        with self._lock:
+            if self._store is None:
+                from automeldung.utils.run.shared import SharedStore
+                self._store = SharedStore()
+            return self._store
+
+    def _refresh_shared(self, ctx):
+        # Workers fall back to reading the files themselves
+        try:
+            self._shared_store().refresh(ctx)
+        except Exception as ex:
+            ctx.log(f"warn: sharing templates with export workers failed: {ex}")
+
+    def _take_engine(self):
+        from automeldung.utils.run.engine import ExportProcess
+        with self._lock:
+            while self._idle_engines:
+                engine = self._idle_engines.pop()
+                if engine.alive:
+                    return engine
+        engine = ExportProcess(store=self._shared_store())
+        engine.start()
+        return engine
+
+    def _release_engine(self, engine):
+        if not engine.alive:
+            return
+        with self._lock:
+            if len(self._idle_engines) < self.max_concurrent:
+                self._idle_engines.append(engine)
+                return
+        engine.close()
+
+    def _run_export(self, job, ctx, on_event):
+        options = dict(
+            cancel_token=job.token,
+            resume=job.resume,
+            on_event=on_event,
+            profile=job.profile,
+            snapshot_every=job.snapshot_every,
+        )
+        if not self.isolated:
+            from automeldung.main_exporter import main_exporter
+            return main_exporter(ctx, executor=self._shared_executor(ctx), **options)
+
+        self._refresh_shared(ctx)
+        engine = self._take_engine()
+        job.engine = engine
+        try:
+            return engine.run(ctx, **options)
+        finally:
+            job.engine = None
+            if not engine.alive:
+                # Killed mid-row (hard cancel or crash): no other job writes to
+                # this folder while this one is running, so sweep its leftovers
+                from automeldung.utils.pdf.output_writer import remove_intermediates
+                if remove_intermediates(ctx.export_path):
+                    ctx.log("Removed intermediate files of the interrupted export.")
+            self._release_engine(engine)
+
+    def _run_job(self, job: ExportJob):
+        log = job.ctx.log
+
+        def job_log(msg):
+            log(f"[{job.label}] {msg}")
+
+        ctx = replace(job.ctx, caches=self.caches, log=job_log)
+
+        def on_event(event):
+            job.track(event)
+            if isinstance(event, _PROGRESS_EVENTS):
+                self._notify(job)
+
+        job_log("Export resumed..." if job.resume else "Export started...")
+        try:
+            job.stats = self._run_export(job, ctx, on_event)
+            job.state = DONE
+            job_log("Export finished.")
+        except ExportCancelled:
+            job.state = CANCELLED
+            job_log("Operation cancelled.")
+        except Exception as ex:
+            job.error = ex
+            job.state = FAILED
+            job_log(f"Error: {ex}")
+        self._notify(job)
+        self._dispatch()
+
+    def _forget_old_jobs(self):
+        finished = [j for j in self._jobs if j.finished]
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            self._jobs.remove(job)
+
+    def _notify(self, job):
+        if self.on_change is None:
+            return
+        try:
+            self.on_change(job)
+        except Exception:
+            pass
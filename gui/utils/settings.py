@@ -1,6 +1,11 @@
 import os
-import json
 import sys
+import json
+import time
+import logging
+import atexit
+import tempfile
+import threading
 
 def get_project_root():
     if getattr(sys, 'frozen', False):
@@ -10,6 +15,11 @@ def get_project_root():
 
 SETTINGS_PATH = os.path.join(get_project_root(), "app_settings.json")
 
+logger = logging.getLogger(__name__)
+
+# Quiet period after the last change before the settings are written
+SAVE_DEBOUNCE_SECONDS = 0.5
+
 def get_default_settings() -> dict:
     """
     Returns the default app_settings.json template with placeholders.
@@ -38,8 +48,7 @@ def create_default_settings_if_missing() -> bool:
     if not os.path.exists(SETTINGS_PATH):
         default_settings = get_default_settings()
         try:
-            with open(SETTINGS_PATH, "w", encoding="utf-8") as f:
-                json.dump(default_settings, f, indent=2)
+            _write_atomic(SETTINGS_PATH, default_settings)
             return True
         except Exception:
             return False
@@ -54,9 +63,113 @@ def load_settings() -> dict:
     except Exception:
         return get_default_settings()
 
+def _write_atomic(path: str, data: dict):
+    """Write JSON to a temp file next to path and rename it over path.
+
+    A crash mid-write leaves the previous file intact instead of a truncated one.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=".app_settings_", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
 def save_settings(settings: dict):
+    """Write settings immediately (atomically). The GUI uses SettingsStore instead."""
     try:
-        with open(SETTINGS_PATH, "w", encoding="utf-8") as f:
-            json.dump(settings, f, indent=2)
+        _write_atomic(SETTINGS_PATH, dict(settings))
     except Exception:
         pass
+
+class SettingsStore:
+    """In-memory app settings with debounced, atomic writes to app_settings.json.
+
+    set()/update() only change memory and return at once, so typing in a field
+    never waits for the disk. A background thread writes the latest state once
+    no change came in for `delay` seconds; bursts of changes become one write.
+    flush() writes right away and runs at interpreter exit.
+    """
+
+    def __init__(self, data: dict, path: str = SETTINGS_PATH, delay: float = SAVE_DEBOUNCE_SECONDS):
+        self.path = path
+        self.delay = delay
+        self._data = dict(data)
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._due = 0.0
+        self._closed = False
+        self._thread = None
+
+    def get(self, key, default=None):
+        with self._cond:
+            return self._data.get(key, default)
+
+    def __getitem__(self, key):
+        with self._cond:
+            return self._data[key]
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return dict(self._data)
+
+    def set(self, key, value):
+        self.update({key: value})
+
+    def update(self, values: dict):
+        with self._cond:
+            self._data.update(values)
+            self._dirty = True
+            self._due = time.monotonic() + self.delay
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="settings-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self):
+        """Write pending changes now (no-op when nothing changed)."""
+        # The write lock keeps writes in snapshot order
+        with self._write_lock:
+            with self._cond:
+                if not self._dirty:
+                    return
+                data = dict(self._data)
+                self._dirty = False
+            try:
+                _write_atomic(self.path, data)
+            except Exception as ex:
+                logger.warning("Could not save settings: %s", ex)
+
+    def close(self):
+        """Stop the writer thread after writing pending changes."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                remaining = self._due - time.monotonic()
+                if remaining > 0:
+                    # Wait out the quiet period; a new change moves _due again
+                    self._cond.wait(remaining)
+                    continue
+            self.flush()
+
+def load_settings_store() -> SettingsStore:
+    """Load app_settings.json into a SettingsStore that is flushed on exit."""
+    store = SettingsStore(load_settings())
+    atexit.register(store.close)
+    return store
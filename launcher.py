@@ -19,8 +19,11 @@ import argparse
 import requests
 import logging
 import hashlib
+import json
+import queue
 import threading
 import random
+from urllib.parse import urljoin
 
 # Hide console window immediately on Windows
 if sys.platform == "win32":
@@ -104,6 +107,12 @@ logging.basicConfig(
 # Configuration - core.exe is the actual application
 CORE_EXECUTABLE = "core.exe"
 
+# Result of the startup update check, written after the app was started and
+# read by its update banner (gui/components/update_checker.py)
+UPDATE_STATUS_FILE = "update_status.json"
+# Seconds the launcher process stays alive for the check after the splash closed
+UPDATE_CHECK_GRACE = 15
+
 # Fun facts to display while loading
 FUN_FACTS = [
     "Did you know? PDFs were invented by Adobe in 1993.",
@@ -121,20 +130,47 @@ FUN_FACTS = [
     "Over 2.5 trillion PDFs are created every year."
 ]
 
+import app_lock
+import delta_patch
+import update_payload
+import update_service
+import version_sidecar
+
 # Update URL
 UPDATE_URL = None
+# Version of the source tree (dev mode runs gui/app.py from it)
+SOURCE_VERSION = None
 try:
     import update_config
     UPDATE_URL = update_config.UPDATE_URL
+    SOURCE_VERSION = update_config.CURRENT_VERSION
 except ImportError:
     pass
 
 if not UPDATE_URL:
     UPDATE_URL = "https://aminechr54.github.io/AutoMeldung/updates/"
 
+# Last fetched version.json, shared with the app (see update_service.py)
+UPDATE_CACHE_FILE = update_service.CACHE_FILE
+# PID of the running app (see app_lock.py)
+APP_LOCK_FILE = app_lock.LOCK_FILE
+# After the app exited, Windows may keep core.exe locked for a moment
+# (antivirus, unmapping); checked at this interval until max_wait
+FILE_UNLOCK_INTERVAL = 0.1
+
+# Splash rendering: one tick per frame (~30 fps) draws the animation; while
+# the window is hidden the tick only applies status text and close requests
+FRAME_INTERVAL_MS = 33
+IDLE_INTERVAL_MS = 250
+FACT_INTERVAL = 5.0
+
 
 class ModernSplashScreen:
-    """A modern, sleek loading splash screen with smooth edges."""
+    """A modern, sleek loading splash screen with smooth edges.
+
+    Only the Tk thread touches the window. Workers call set_status() and
+    request_close(), which queue the change for the next tick.
+    """
     
     def __init__(self, mode="startup"):
         self.mode = mode
@@ -144,9 +180,12 @@ class ModernSplashScreen:
         self.canvas = None
         self.should_close = False
         self.update_available = False
-        self.progress_angle = 0
-        self.dots = 0
-        self.glow_phase = 0
+        self._status_queue = queue.SimpleQueue()
+        self._close_requested = threading.Event()
+        self._visible = True
+        self._started = time.monotonic()
+        self._next_fact = 0.0
+        self._glow_intensity = None
         self.scale = 1.0  # Raw DPI scale factor (screen)
         self.win_scale = 1.0  # Window element scale (clamped)
         self.font_scale = 1.0  # Font scale (clamped, slightly lower than DPI)
@@ -305,10 +344,11 @@ class ModernSplashScreen:
             justify="center"
         )
         
-        # Start animations (dots animation removed)
-        self.animate_progress()
-        self.rotate_facts()
-        self.animate_glow()
+        # Drawing pauses while the window is minimized or withdrawn
+        self.root.bind("<Map>", lambda e: self._set_visible(e, True))
+        self.root.bind("<Unmap>", lambda e: self._set_visible(e, False))
+        self._next_fact = time.monotonic() + FACT_INTERVAL
+        self._tick()
         
     def draw_smooth_rounded_rect(self, x1, y1, x2, y2, radius, color):
         """Draws a smooth rounded rectangle using multiple overlapping shapes."""
@@ -470,65 +510,74 @@ class ModernSplashScreen:
             y = y1 + self.s(12) + self.s(i * 8)
             self.canvas.create_line(start_x, y, start_x + length, y, fill=line_color, width=lw, capstyle="round")
     
-    def animate_progress(self):
-        """Animates the progress bar with smooth easing."""
+    def _set_visible(self, event, visible):
+        # Map/Unmap of child widgets arrive here too
+        if event.widget is self.root:
+            self._visible = visible
+    
+    def _tick(self):
+        """The only recurring callback: applies what workers queued, then
+        draws one animation frame within FRAME_INTERVAL_MS."""
         if self.should_close or not self.root:
             return
-            
-        # Calculate position with smooth easing
+        if self._close_requested.is_set():
+            self.close()
+            return
+        
+        # Several updates since the last frame: only the newest is shown
+        text = None
+        while True:
+            try:
+                text = self._status_queue.get_nowait()
+            except queue.Empty:
+                break
+        if text is not None:
+            self.canvas.itemconfig(self.status_text_id, text=text)
+        
+        if not self._visible:
+            self.root.after(IDLE_INTERVAL_MS, self._tick)
+            return
+        started = time.monotonic()
+        self.draw_frame(started)
+        # A slow frame shortens the wait instead of letting frames pile up
+        spent_ms = int((time.monotonic() - started) * 1000)
+        self.root.after(max(1, FRAME_INTERVAL_MS - spent_ms), self._tick)
+    
+    def draw_frame(self, now):
+        """Progress bar position and glow, fun fact rotation (time based, so
+        the speed does not depend on the frame rate)."""
         import math
-        self.progress_angle += 0.03
+        t = now - self._started
         
-        # Use sine wave for smooth back-and-forth motion
-        progress = (math.sin(self.progress_angle) + 1) / 2  # 0 to 1
-        # Apply easing for smoother feel
-        eased = progress * progress * (3 - 2 * progress)  # Smoothstep
+        # Sine wave for smooth back-and-forth motion, with smoothstep easing
+        progress = (math.sin(t * 1.875) + 1) / 2  # 0 to 1
+        eased = progress * progress * (3 - 2 * progress)
         
         fill_width = self.s(100)  # Scaled progress bar fill width (slightly smaller)
         x_pos = self.bar_x + 2 + eased * (self.bar_width - fill_width - 4)
-        
         self.canvas.coords(
             self.progress_bar,
             x_pos, self.bar_y + 1,
             x_pos + fill_width, self.bar_y + self.bar_height - 1
         )
         
-        self.root.after(16, self.animate_progress)  # ~60fps
-    
-    # animate_dots removed per request
-    
-    def animate_glow(self):
-        """Animates a subtle glow effect on the accent elements."""
-        if self.should_close or not self.root:
-            return
-            
-        import math
-        self.glow_phase += 0.05
-        
-        # Pulse the progress bar color slightly
-        intensity = int(77 + 20 * math.sin(self.glow_phase))  # 77 is base for #4d in hex
-        glow_color = f"#7c{intensity:02x}ff"
-        
-        try:
-            self.canvas.itemconfig(self.progress_bar, fill=glow_color)
-        except:
-            pass
+        # Pulse the progress bar color slightly; recolor only when it changes
+        intensity = int(77 + 20 * math.sin(t))  # 77 is base for #4d in hex
+        if intensity != self._glow_intensity:
+            self._glow_intensity = intensity
+            self.canvas.itemconfig(self.progress_bar, fill=f"#7c{intensity:02x}ff")
         
-        self.root.after(50, self.animate_glow)
-    
-    def rotate_facts(self):
-        """Changes the fun fact periodically with transition."""
-        if self.should_close or not self.root:
-            return
-            
-        self.canvas.itemconfig(self.fact_id, text=random.choice(FUN_FACTS))
-        self.root.after(5000, self.rotate_facts)
+        if now >= self._next_fact:
+            self._next_fact = now + FACT_INTERVAL
+            self.canvas.itemconfig(self.fact_id, text=random.choice(FUN_FACTS))
     
     def set_status(self, text):
-        """Updates the status text."""
-        if self.canvas and self.status_text_id:
-            self.canvas.itemconfig(self.status_text_id, text=text)
-            self.root.update()
+        """Updates the status text; safe to call from any thread."""
+        self._status_queue.put(text)
+    
+    def request_close(self):
+        """Closes the splash screen on the next tick; safe from any thread."""
+        self._close_requested.set()
     
     def close(self):
         """Closes the splash screen."""
@@ -559,10 +608,28 @@ def get_main_app_command():
 
 
 def get_app_version():
-    """Gets the version of the core application."""
+    """Gets the version of the core application.
+
+    Read from core.version.json next to core.exe (version_sidecar); in dev
+    mode gui/app.py runs from this source tree, so update_config applies.
+    Only when neither is available is core.exe started with --version.
+    """
     cmd = get_main_app_command()
     if not cmd:
         return None
+    is_core = cmd[0] == CORE_EXECUTABLE
+    version = version_sidecar.read_version(CORE_EXECUTABLE) if is_core else SOURCE_VERSION
+    if version:
+        return version
+    logging.info("No version metadata for core app; asking it with --version.")
+    version = _get_app_version_from_process(cmd)
+    if version and is_core:
+        version_sidecar.write_version(CORE_EXECUTABLE, version)
+    return version
+
+
+def _get_app_version_from_process(cmd):
+    """Runs the core app with --version (slow: boots the whole app)."""
     cmd = cmd + ["--version"]
     try:
         startupinfo = None
@@ -577,36 +644,52 @@ def get_app_version():
         return None
 
 
-def check_for_updates(current_version):
-    """Checks for updates and returns update info if available."""
-    if not current_version:
-        return None
-    
+def get_update_service():
+    """UpdateService for UPDATE_URL, cached next to the launcher's other files."""
+    return update_service.UpdateService(UPDATE_URL, cache_path=os.path.abspath(UPDATE_CACHE_FILE))
+
+
+def fetch_manifest(force=False):
+    """version.json from the server or the recent-check cache, None on errors."""
     try:
-        version_url = UPDATE_URL.rstrip("/") + "/version.json"
-        logging.info(f"Checking for updates at {version_url}")
-        response = requests.get(version_url, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            latest_version = data.get("version")
-            logging.info(f"Current: {current_version}, Latest: {latest_version}")
-            if latest_version and latest_version != current_version:
-                return {
-                    "version": latest_version,
-                    "sha256": data.get("sha256"),
-                    "url": data.get("url")
-                }
+        return get_update_service().fetch_manifest(force=force)
     except Exception as e:
         logging.error(f"Update check failed: {e}")
-    
-    return None
+        return None
+
+
+def check_for_updates(current_version, force=False):
+    """Checks for updates and returns update info if available.
+
+    force: skip the minimum check interval (installing needs the current
+    manifest); the request is still conditional.
+    """
+    if not current_version:
+        return None
+    return update_service.update_info(fetch_manifest(force=force), current_version)
+
 
+def wait_for_app_to_close(max_wait=30, callback=None, app_pid=None):
+    """Waits for the core app to close.
 
-def wait_for_app_to_close(max_wait=30, callback=None):
-    """Waits for the core app to close by checking file lock."""
+    Blocks on the app's process (app_pid from --app-pid, else the PID in
+    APP_LOCK_FILE) until it exits, then confirms core.exe can be opened for
+    writing. Without a running app only the file check is left.
+    """
     logging.info("Waiting for core app to close...")
+    deadline = time.monotonic() + max_wait
     
-    for i in range(max_wait):
+    pid = app_pid or app_lock.read_pid(os.path.abspath(APP_LOCK_FILE))
+    if pid and pid != os.getpid() and app_lock.is_running(pid):
+        if callback:
+            callback("Waiting for app to close")
+        logging.info(f"Waiting for app process {pid} to exit.")
+        if not app_lock.wait_for_exit(pid, max_wait):
+            logging.error("Timed out waiting for core app to close.")
+            return False
+        logging.info(f"App process {pid} exited.")
+    
+    while True:
         try:
             if os.path.exists(CORE_EXECUTABLE):
                 with open(CORE_EXECUTABLE, "a+b") as f:
@@ -614,20 +697,292 @@ def wait_for_app_to_close(max_wait=30, callback=None):
             logging.info("Core app file is accessible.")
             return True
         except PermissionError:
-            if callback:
-                callback(f"Waiting for app to close ({i+1}s)")
-            logging.info(f"Core app still running. Retrying {i+1}/{max_wait}...")
-            time.sleep(1)
+            logging.info("Core app file still locked.")
         except Exception as e:
             logging.warning(f"Error checking file lock: {e}")
-            time.sleep(1)
+        if time.monotonic() >= deadline:
+            break
+        time.sleep(FILE_UNLOCK_INTERVAL)
     
     logging.error("Timed out waiting for core app to close.")
     return False
 
 
-def download_update(sha256_expected=None, callback=None):
-    """Downloads the new core executable from the server."""
+# Download tuning: read buffer, automatic resumes after a dropped connection,
+# and how often progress is reported to the splash screen
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+DOWNLOAD_RETRIES = 3
+PROGRESS_INTERVAL = 0.25
+# Ranges fetched at the same time for a fresh download (1 = single stream,
+# hashed while downloading; more needs Range support and hashes afterwards)
+DOWNLOAD_PARTS = 1
+
+
+class DownloadProgress:
+    """Turns byte counts into throttled "Downloading 12.3/45.6 MB (2.1 MB/s)" messages."""
+
+    def __init__(self, callback, total=None, already=0):
+        self.callback = callback
+        self.total = total
+        self.done = already
+        self.started = time.monotonic()
+        self.already = already
+        self.last_report = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, n):
+        with self.lock:
+            self.done += n
+            now = time.monotonic()
+            if now - self.last_report < PROGRESS_INTERVAL:
+                return
+            self.last_report = now
+        self.report()
+
+    def report(self):
+        if not self.callback:
+            return
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        rate = (self.done - self.already) / elapsed / 1e6
+        done_mb = self.done / 1e6
+        if self.total:
+            self.callback(f"Downloading {done_mb:.1f}/{self.total / 1e6:.1f} MB ({rate:.1f} MB/s)")
+        else:
+            self.callback(f"Downloading {done_mb:.1f} MB ({rate:.1f} MB/s)")
+
+
+def _hash_file(path, sha256_hash=None):
+    sha256_hash = sha256_hash or hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            sha256_hash.update(chunk)
+    return sha256_hash
+
+
+def _partial_matches(dest, sha256_expected):
+    """A partial download may be continued only for the same expected file."""
+    try:
+        with open(dest + ".sha256", "r", encoding="utf-8") as f:
+            return bool(sha256_expected) and f.read().strip().lower() == sha256_expected.lower()
+    except OSError:
+        return False
+
+
+def _discard_partial(dest):
+    for path in (dest, dest + ".sha256"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _download_stream(session, url, dest, sha256_expected, callback):
+    """Single-stream download into dest, continuing a partial file with Range.
+
+    Returns the SHA-256 hex digest of the whole file, computed while writing.
+    """
+    offset = 0
+    sha256_hash = hashlib.sha256()
+    if os.path.exists(dest) and _partial_matches(dest, sha256_expected):
+        offset = os.path.getsize(dest)
+        _hash_file(dest, sha256_hash)
+    elif os.path.exists(dest):
+        _discard_partial(dest)
+    if sha256_expected:
+        with open(dest + ".sha256", "w", encoding="utf-8") as f:
+            f.write(sha256_expected)
+
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    with session.get(url, stream=True, timeout=(10, 60), headers=headers) as response:
+        if offset and response.status_code == 416:
+            # Nothing left to fetch: the partial file is already complete
+            return sha256_hash.hexdigest()
+        response.raise_for_status()
+        if offset and response.status_code != 206:
+            # Server ignored the range; start over
+            logging.info("Server does not support ranges; restarting download.")
+            offset = 0
+            sha256_hash = hashlib.sha256()
+        elif offset:
+            logging.info(f"Resuming download at {offset} bytes.")
+        length = int(response.headers.get("Content-Length") or 0)
+        progress = DownloadProgress(callback, total=offset + length if length else None, already=offset)
+        with open(dest, "ab" if offset else "wb") as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                if chunk:
+                    f.write(chunk)
+                    sha256_hash.update(chunk)
+                    progress.add(len(chunk))
+    progress.report()
+    return sha256_hash.hexdigest()
+
+
+def _download_parallel(session, url, dest, parts, callback):
+    """Fetch parts byte ranges at once; returns the digest or None when the
+    server does not support ranges (then the caller streams instead)."""
+    head = session.head(url, timeout=10, allow_redirects=True)
+    size = int(head.headers.get("Content-Length") or 0)
+    if head.status_code != 200 or head.headers.get("Accept-Ranges") != "bytes" or size < parts * DOWNLOAD_CHUNK_SIZE:
+        return None
+    with open(dest, "wb") as f:
+        f.truncate(size)
+    progress = DownloadProgress(callback, total=size)
+    bounds = [(i * size // parts, (i + 1) * size // parts - 1) for i in range(parts)]
+    errors = []
+
+    def fetch(start, end):
+        try:
+            headers = {"Range": f"bytes={start}-{end}"}
+            with session.get(url, stream=True, timeout=(10, 60), headers=headers) as response:
+                if response.status_code != 206:
+                    raise IOError(f"range request answered with {response.status_code}")
+                with open(dest, "r+b") as f:
+                    f.seek(start)
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        progress.add(len(chunk))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=fetch, args=b, daemon=True) for b in bounds]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+    progress.report()
+    if callback:
+        callback("Verifying download")
+    return _hash_file(dest).hexdigest()
+
+
+def _fetch_resumable(session, url, dest, sha256_expected, callback):
+    """_download_stream, resumed after dropped connections; returns the digest."""
+    for attempt in range(DOWNLOAD_RETRIES + 1):
+        try:
+            return _download_stream(session, url, dest, sha256_expected, callback)
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            if attempt == DOWNLOAD_RETRIES:
+                raise
+            logging.warning(f"Download interrupted ({e}); resuming.")
+            if callback:
+                callback("Connection lost, resuming download")
+
+
+def download_delta(update_info, callback=None):
+    """Builds core.exe.new from a binary patch listed in version.json.
+
+    "patches" entries name the hash of the installed core.exe they apply to
+    ({"from_sha256", "url", "sha256", "size"}, see delta_patch.py). Returns
+    the new path, or None when no patch fits or the result does not match the
+    manifest's sha256 (the caller then downloads the full executable).
+    """
+    patches = update_info.get("patches") or []
+    sha256_expected = update_info.get("sha256")
+    if not patches or not sha256_expected or not os.path.exists(CORE_EXECUTABLE):
+        return None
+    
+    if callback:
+        callback("Checking installed version")
+    current = _hash_file(CORE_EXECUTABLE).hexdigest()
+    patch = next((p for p in patches if (p.get("from_sha256") or "").lower() == current), None)
+    if patch is None or not patch.get("url"):
+        logging.info("No patch for the installed version; downloading the full update.")
+        return None
+    
+    patch_url = urljoin(UPDATE_URL, patch["url"])
+    patch_path = CORE_EXECUTABLE + ".patch"
+    new_exe_path = CORE_EXECUTABLE + ".new"
+    logging.info(f"Downloading patch from {patch_url}")
+    session = update_service.get_session()
+    try:
+        digest = _fetch_resumable(session, patch_url, patch_path, patch.get("sha256"), callback)
+        if patch.get("sha256") and digest.lower() != patch["sha256"].lower():
+            logging.error("Patch hash mismatch!")
+            return None
+        
+        if callback:
+            callback("Applying patch")
+        _discard_partial(new_exe_path)
+        calculated = delta_patch.apply_patch(CORE_EXECUTABLE, patch_path, new_exe_path)
+        if calculated.lower() != sha256_expected.lower():
+            logging.error("Patched file hash mismatch!")
+            _discard_partial(new_exe_path)
+            return None
+        logging.info(f"Patch applied: {new_exe_path}")
+        return new_exe_path
+    except Exception as e:
+        logging.error(f"Patch update failed: {e}")
+        _discard_partial(new_exe_path)
+        return None
+    finally:
+        _discard_partial(patch_path)
+
+
+def _download_compressed(session, variant, dest, callback):
+    """Downloads a compressed variant and decompresses it straight into dest.
+
+    Both hashes are computed inline. The variant's sha256 is checked here
+    against the received bytes; the SHA-256 of the decompressed file is
+    returned, or None when the compressed bytes do not match. A dropped
+    connection is resumed with Range while the decoder keeps its state, so
+    nothing is decoded twice.
+    """
+    url = urljoin(UPDATE_URL, variant["url"])
+    decoder = update_payload.StreamDecoder(variant["encoding"])
+    compressed_hash, plain_hash = hashlib.sha256(), hashlib.sha256()
+    received = 0
+    total = variant.get("size")
+    progress = DownloadProgress(callback, total=total)
+    logging.info(f"Downloading {variant['encoding']} update from {url}")
+    _discard_partial(dest)
+    with open(dest, "wb") as out:
+        for attempt in range(DOWNLOAD_RETRIES + 1):
+            headers = {"Range": f"bytes={received}-"} if received else {}
+            try:
+                with session.get(url, stream=True, timeout=(10, 60), headers=headers) as response:
+                    response.raise_for_status()
+                    if received and response.status_code != 206:
+                        raise IOError("server cannot resume the compressed download")
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        if not chunk:
+                            continue
+                        compressed_hash.update(chunk)
+                        received += len(chunk)
+                        data = decoder.feed(chunk)
+                        out.write(data)
+                        plain_hash.update(data)
+                        progress.add(len(chunk))
+                break
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                if attempt == DOWNLOAD_RETRIES:
+                    raise
+                logging.warning(f"Download interrupted ({e}); resuming at {received} bytes.")
+                if callback:
+                    callback("Connection lost, resuming download")
+        data = decoder.finish()
+        out.write(data)
+        plain_hash.update(data)
+    progress.report()
+    
+    if variant.get("sha256") and compressed_hash.hexdigest().lower() != variant["sha256"].lower():
+        logging.error("Compressed download hash mismatch!")
+        return None
+    logging.info(f"Downloaded {received} bytes for {os.path.getsize(dest)} ({variant['encoding']}).")
+    return plain_hash.hexdigest()
+
+
+def download_update(sha256_expected=None, callback=None, parts=DOWNLOAD_PARTS, variants=None):
+    """Downloads the new core executable from the server.
+
+    Streams into core.exe.new with large buffers and hashes while writing. A
+    dropped connection is resumed with an HTTP Range request, within this call
+    (DOWNLOAD_RETRIES) and across launcher runs (the partial file is kept
+    next to the expected hash). Progress and throughput go to callback.
+
+    variants: the manifest's "compressed" entries (see update_payload). The
+    best one this launcher can decode is tried first; the uncompressed file
+    is the fallback.
+    """
     # Server still hosts as core.exe
     exe_url = UPDATE_URL.rstrip("/") + f"/{CORE_EXECUTABLE}"
     new_exe_path = CORE_EXECUTABLE + ".new"
@@ -636,51 +991,58 @@ def download_update(sha256_expected=None, callback=None):
     if callback:
         callback("Downloading update")
     
+    session = update_service.get_session()
+    calculated = None
     try:
-        response = requests.get(exe_url, stream=True, timeout=120)
-        response.raise_for_status()
-        
-        with open(new_exe_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
+        variant = update_payload.pick_variant(variants)
+        if variant and not _partial_matches(new_exe_path, sha256_expected):
+            try:
+                calculated = _download_compressed(session, variant, new_exe_path, callback)
+            except Exception as e:
+                logging.warning(f"Compressed download failed ({e}); downloading uncompressed.")
+            if not calculated or (sha256_expected and calculated.lower() != sha256_expected.lower()):
+                calculated = None
+                _discard_partial(new_exe_path)
+        if parts > 1 and not calculated and not _partial_matches(new_exe_path, sha256_expected):
+            try:
+                calculated = _download_parallel(session, exe_url, new_exe_path, parts, callback)
+            except Exception as e:
+                logging.warning(f"Parallel download failed ({e}); falling back to a single stream.")
+                _discard_partial(new_exe_path)
+        if not calculated:
+            calculated = _fetch_resumable(session, exe_url, new_exe_path, sha256_expected, callback)
         
         # Verify PE file
         with open(new_exe_path, "rb") as f:
             header = f.read(2)
             if header != b'MZ':
                 logging.error("Downloaded file is not a valid executable.")
-                os.remove(new_exe_path)
+                _discard_partial(new_exe_path)
                 return None
         
-        # Verify SHA256
+        # Verify SHA256 (computed while downloading)
         if sha256_expected:
-            if callback:
-                callback("Verifying download")
-            sha256_hash = hashlib.sha256()
-            with open(new_exe_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(chunk)
-            calculated = sha256_hash.hexdigest()
-            
             if calculated.lower() != sha256_expected.lower():
                 logging.error(f"Hash mismatch!")
-                os.remove(new_exe_path)
+                _discard_partial(new_exe_path)
                 return None
             logging.info("Hash verified successfully.")
         
+        if os.path.exists(new_exe_path + ".sha256"):
+            os.remove(new_exe_path + ".sha256")
         logging.info(f"Download complete: {new_exe_path}")
         return new_exe_path
         
     except Exception as e:
+        # The partial file stays for the next attempt when it can be resumed
         logging.error(f"Download failed: {e}")
-        if os.path.exists(new_exe_path):
-            os.remove(new_exe_path)
+        if os.path.exists(new_exe_path) and not _partial_matches(new_exe_path, sha256_expected):
+            _discard_partial(new_exe_path)
         return None
 
 
-def apply_update(new_exe_path, callback=None):
-    """Replaces the old core executable with the new one."""
+def apply_update(new_exe_path, callback=None, version=None):
+    """Replaces the old core executable with the new one and records its version."""
     old_exe_path = CORE_EXECUTABLE + ".old"
     
     if callback:
@@ -697,6 +1059,8 @@ def apply_update(new_exe_path, callback=None):
         os.rename(new_exe_path, CORE_EXECUTABLE)
         logging.info(f"Renamed {new_exe_path} -> {CORE_EXECUTABLE}")
         
+        if version:
+            version_sidecar.write_version(CORE_EXECUTABLE, version)
         return True
         
     except Exception as e:
@@ -707,14 +1071,35 @@ def apply_update(new_exe_path, callback=None):
         return False
 
 
-def launch_app(with_update_flag=False):
-    """Launches the core application."""
+def write_update_status(path, update_info, manifest=None):
+    """Hands the update check result to the running app (temp file + rename).
+
+    The manifest goes along so the app compares against its own version
+    without fetching version.json again.
+    """
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"checked_at": time.time(), "update": update_info, "manifest": manifest}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logging.warning(f"Could not write update status: {e}")
+
+
+def launch_app(with_update_flag=False, status_file=None):
+    """Launches the core application.
+
+    status_file: the app waits for the launcher's update check result there
+    instead of checking itself.
+    """
     cmd = get_main_app_command()
     if not cmd:
         return
     
     if with_update_flag:
         cmd.append("--update-available")
+    if status_file:
+        cmd += ["--update-status", status_file]
     
     startupinfo = None
     if sys.platform == "win32":
@@ -726,72 +1111,77 @@ def launch_app(with_update_flag=False):
 
 
 def startup_worker():
-    """Background worker for startup mode."""
+    """Background worker for startup mode.
+
+    Starts the app first, then checks for updates while it loads; the result
+    goes to the app through UPDATE_STATUS_FILE. Offline users no longer wait
+    for the HTTP timeout before they see anything.
+    """
     global splash
     
+    status_file = os.path.abspath(UPDATE_STATUS_FILE)
+    try:
+        # A result left from an earlier start must not be taken for this one
+        if os.path.exists(status_file):
+            os.remove(status_file)
+    except OSError:
+        pass
+
     try:
         if splash:
-            splash.set_status("Getting version info")
-        
-        current_version = get_app_version()
-        
-        if splash:
-            splash.set_status("Checking for updates")
-        
-        update_info = check_for_updates(current_version)
-        
-        time.sleep(0.5)
-        
-        if splash:
-            if update_info:
-                splash.set_status(f"Update {update_info['version']} available!")
-                splash.update_available = True
-            else:
-                splash.set_status("Starting application")
-        
-        time.sleep(0.3)
-        
-        launch_app(with_update_flag=bool(update_info))
-        
+            splash.set_status("Starting application")
+        launch_app(status_file=status_file)
     except Exception as e:
         logging.error(f"Startup error: {e}")
     finally:
         if splash:
-            splash.root.after(100, splash.close)
+            splash.request_close()
 
+    update_info = manifest = None
+    try:
+        manifest = fetch_manifest()
+        update_info = update_service.update_info(manifest, get_app_version())
+    except Exception as e:
+        logging.error(f"Update check error: {e}")
+    finally:
+        write_update_status(status_file, update_info, manifest)
 
-def update_worker():
+
+def update_worker(app_pid=None):
     """Background worker for update installation mode."""
     global splash
     
     def set_status(text):
         if splash:
-            try:
-                splash.root.after(0, lambda: splash.set_status(text))
-            except:
-                pass
+            splash.set_status(text)
     
     try:
         set_status("Waiting for app to close")
         
-        if not wait_for_app_to_close(callback=set_status):
+        if not wait_for_app_to_close(callback=set_status, app_pid=app_pid):
             logging.error("Could not proceed - app still running.")
             launch_app()
             return
         
         set_status("Getting version info")
         current_version = get_app_version()
-        update_info = check_for_updates(current_version)
+        update_info = check_for_updates(current_version, force=True)
         
         if not update_info:
             logging.info("No update found. Launching app normally.")
             set_status("Starting application")
-            time.sleep(0.5)
             launch_app()
             return
         
         set_status(f"Downloading v{update_info['version']}")
-        new_exe = download_update(sha256_expected=update_info.get("sha256"), callback=set_status)
+        # A patch against the installed version is much smaller; full download otherwise
+        new_exe = download_delta(update_info, callback=set_status)
+        if not new_exe:
+            new_exe = download_update(
+                sha256_expected=update_info.get("sha256"),
+                callback=set_status,
+                variants=update_info.get("compressed"),
+            )
         
         if not new_exe:
             logging.error("Download failed. Launching current app.")
@@ -801,17 +1191,14 @@ def update_worker():
             return
         
         set_status("Installing update")
-        if apply_update(new_exe, callback=set_status):
+        if apply_update(new_exe, callback=set_status, version=update_info["version"]):
             logging.info("Update applied successfully!")
             set_status("Update complete!")
         else:
             logging.error("Failed to apply update.")
             set_status("Update failed")
         
-        time.sleep(0.5)
         set_status("Starting application")
-        time.sleep(0.3)
-        
         launch_app()
         
     except Exception as e:
@@ -819,7 +1206,7 @@ def update_worker():
         launch_app()
     finally:
         if splash:
-            splash.root.after(100, splash.close)
+            splash.request_close()
 
 
 def main_startup():
@@ -834,19 +1221,25 @@ def main_startup():
     worker.start()
     
     splash.run()
+    # The update check may still be running after the app started
+    worker.join(UPDATE_CHECK_GRACE)
     
     os._exit(0)  # Use os._exit to skip atexit handlers and prevent PyInstaller cleanup warning
 
 
-def install_update():
-    """Update installation with splash screen."""
+def install_update(app_pid=None):
+    """Update installation with splash screen.
+
+    app_pid: the app that requested the update; installing starts as soon as
+    it exits.
+    """
     global splash
     logging.info("=== Starting install_update ===")
     
     splash = ModernSplashScreen(mode="update")
     splash.create_window()
     
-    worker = threading.Thread(target=update_worker, daemon=True)
+    worker = threading.Thread(target=update_worker, args=(app_pid,), daemon=True)
     worker.start()
     
     splash.run()
@@ -857,10 +1250,11 @@ def install_update():
 def main():
     parser = argparse.ArgumentParser(description="AutoMeldung Launcher")
     parser.add_argument("--install-update", action="store_true", help="Download and install update")
+    parser.add_argument("--app-pid", type=int, help="PID of the app to wait for before installing")
     args = parser.parse_args()
     
     if args.install_update:
-        install_update()
+        install_update(app_pid=args.app_pid)
     else:
         main_startup()
 
@@ -0,0 +1,109 @@
+"""
+Compressed variants of the core.exe update payload.
+
+version.json may list them under "compressed"; the launcher takes the first
+encoding it can decode (ENCODING_PREFERENCE) and decompresses while
+downloading. "sha256" of a variant is the hash of the compressed file, the
+top-level "sha256" that of core.exe itself.
+
+Build the variants and print their version.json entries:
+    python update_payload.py dist/core.exe updates/
+"""
+import gzip
+import hashlib
+import json
+import lzma
+import os
+import sys
+import zlib
+
+# Best ratio first; zstd needs the optional zstandard package
+ENCODING_PREFERENCE = ("zstd", "xz", "gzip")
+SUFFIXES = {"zstd": ".zst", "xz": ".xz", "gzip": ".gz"}
+_BUFFER_SIZE = 256 * 1024
+
+
+def _zstandard():
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+def available_encodings():
+    """Encodings this installation can decode, best first."""
+    return [e for e in ENCODING_PREFERENCE if e != "zstd" or _zstandard() is not None]
+
+
+class StreamDecoder:
+    """Incremental decoder: feed() compressed chunks, finish() at the end."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == "xz":
+            self._obj = lzma.LZMADecompressor()
+        elif encoding == "zstd" and _zstandard() is not None:
+            self._obj = _zstandard().ZstdDecompressor().decompressobj()
+        else:
+            raise ValueError(f"unsupported encoding: {encoding}")
+
+    def feed(self, chunk: bytes) -> bytes:
+        return self._obj.decompress(chunk)
+
+    def finish(self) -> bytes:
+        """Remaining output; raises ValueError when the stream is incomplete."""
+        tail = b""
+        if hasattr(self._obj, "flush") and self.encoding != "xz":
+            tail = self._obj.flush()
+        if getattr(self._obj, "eof", True) is False:
+            raise ValueError(f"{self.encoding} stream ended early")
+        return tail
+
+
+def pick_variant(variants):
+    """The manifest entry to download, or None when none can be decoded."""
+    usable = {v.get("encoding"): v for v in variants or () if v.get("url")}
+    for encoding in available_encodings():
+        if encoding in usable:
+            return usable[encoding]
+    return None
+
+
+def compress(path: str, out_dir: str, encoding: str) -> dict:
+    """Write path compressed with encoding into out_dir; returns its manifest entry."""
+    out_path = os.path.join(out_dir, os.path.basename(path) + SUFFIXES[encoding])
+    if encoding == "gzip":
+        out = gzip.open(out_path, "wb", compresslevel=9)
+    elif encoding == "xz":
+        out = lzma.open(out_path, "wb", preset=9 | lzma.PRESET_EXTREME)
+    else:
+        out = _zstandard().ZstdCompressor(level=19).stream_writer(open(out_path, "wb"))
+    with open(path, "rb") as f, out:
+        for chunk in iter(lambda: f.read(_BUFFER_SIZE), b""):
+            out.write(chunk)
+    sha256_hash = hashlib.sha256()
+    with open(out_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_BUFFER_SIZE), b""):
+            sha256_hash.update(chunk)
+    return {
+        "encoding": encoding,
+        "url": os.path.basename(out_path),
+        "sha256": sha256_hash.hexdigest(),
+        "size": os.path.getsize(out_path),
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python update_payload.py <core.exe> <output folder>")
+        sys.exit(1)
+    exe_path, out_dir = sys.argv[1], sys.argv[2]
+    entries = [compress(exe_path, out_dir, e) for e in available_encodings()]
+    size = os.path.getsize(exe_path)
+    for entry in entries:
+        print(f"{entry['encoding']:5} {entry['size'] / 1e6:7.2f} MB ({entry['size'] / size:.0%})")
+    print('Add to "compressed" in version.json:')
+    print(json.dumps(entries, indent=4))
@@ -0,0 +1,147 @@
+"""
+Update checks shared by the launcher and the app.
+
+version.json is fetched over one pooled session with conditional requests
+(ETag / Last-Modified), and the last manifest is cached on disk together
+with the time of the check. Within MIN_CHECK_INTERVAL of that check the
+cached manifest is used without asking the server, so the app started by
+the launcher (or restarted a minute later) does not fetch it again.
+
+    service = UpdateService(update_config.UPDATE_URL)
+    update = service.check(update_config.CURRENT_VERSION)  # None when up to date
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = "update_cache.json"
+# Seconds a checked manifest counts as current; force=True asks anyway
+MIN_CHECK_INTERVAL = 10 * 60
+# (connect, read) seconds for version.json
+REQUEST_TIMEOUT = (5, 10)
+# Connections kept per host; parallel range downloads use several at once
+POOL_SIZE = 8
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """The process-wide requests.Session, created on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests  # deferred: the app imports this module at startup
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def default_cache_path() -> str:
+    """CACHE_FILE next to the executable (frozen) or the source tree."""
+    if getattr(sys, "frozen", False):
+        base_dir = os.path.dirname(sys.executable)
+    else:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_dir, CACHE_FILE)
+
+
+def update_info(manifest, current_version):
+    """The update manifest offers over current_version, or None."""
+    if not manifest or not current_version:
+        return None
+    latest_version = manifest.get("version")
+    logger.info(f"Current: {current_version}, Latest: {latest_version}")
+    if not latest_version or latest_version == current_version:
+        return None
+    return {
+        "version": latest_version,
+        "sha256": manifest.get("sha256"),
+        "url": manifest.get("url"),
+        "patches": manifest.get("patches") or [],
+        "compressed": manifest.get("compressed") or [],
+    }
+
+
+class UpdateService:
+    """Fetches version.json from base_url, cached in cache_path."""
+
+    def __init__(self, base_url: str, cache_path: str = None, min_interval: float = MIN_CHECK_INTERVAL):
+        self.manifest_url = base_url.rstrip("/") + "/version.json"
+        self.cache_path = cache_path or default_cache_path()
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+
+    def _load_cache(self) -> dict:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # A cache for another server (e.g. a test URL) does not count
+        if not isinstance(cache, dict) or cache.get("url") != self.manifest_url:
+            return {}
+        return cache
+
+    def _save_cache(self, cache: dict):
+        tmp_path = self.cache_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write update cache: {e}")
+
+    def fetch_manifest(self, force: bool = False) -> dict:
+        """The current version.json.
+
+        Served from the cache within min_interval of the last check unless
+        force is set; otherwise asked for with If-None-Match /
+        If-Modified-Since, so an unchanged manifest costs a 304. Raises on
+        network errors and bad responses; the cache is left as it was, so
+        the next call asks again.
+        """
+        with self._lock:
+            cache = self._load_cache()
+            manifest = cache.get("manifest")
+            age = time.time() - cache.get("checked_at", 0)
+            if not force and manifest is not None and 0 <= age < self.min_interval:
+                logger.info(f"Using update manifest checked {age:.0f}s ago.")
+                return manifest
+
+            headers = {}
+            if manifest is not None and cache.get("etag"):
+                headers["If-None-Match"] = cache["etag"]
+            if manifest is not None and cache.get("last_modified"):
+                headers["If-Modified-Since"] = cache["last_modified"]
+            logger.info(f"Checking for updates at {self.manifest_url}")
+            response = get_session().get(self.manifest_url, headers=headers, timeout=REQUEST_TIMEOUT)
+            if response.status_code == 304 and manifest is not None:
+                logger.info("Update manifest not modified.")
+            else:
+                response.raise_for_status()
+                manifest = response.json()
+                if not isinstance(manifest, dict):
+                    raise ValueError("version.json is not an object")
+                cache = {
+                    "url": self.manifest_url,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "manifest": manifest,
+                }
+            cache["checked_at"] = time.time()
+            self._save_cache(cache)
+            return manifest
+
+    def check(self, current_version: str, force: bool = False):
+        """The update to offer (see update_info), or None when up to date."""
+        return update_info(self.fetch_manifest(force=force), current_version)
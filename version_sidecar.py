@@ -0,0 +1,63 @@
+"""
+Version metadata of core.exe, stored next to it as core.version.json.
+
+The launcher reads it instead of starting core.exe --version (which unpacks
+and boots the whole frozen app just to print a string). It is written:
+- at build time: python version_sidecar.py dist/core.exe
+- by the launcher after it installed an update
+- by the app itself on start when it is missing or outdated
+
+The recorded file size guards against a sidecar left over from another build;
+readers fall back to asking the executable when it does not match.
+"""
+import json
+import os
+import sys
+from typing import Optional
+
+SIDECAR_SUFFIX = ".version.json"
+
+
+def sidecar_path(exe_path: str) -> str:
+    """core.exe -> core.version.json"""
+    return os.path.splitext(exe_path)[0] + SIDECAR_SUFFIX
+
+
+def read_version(exe_path: str) -> Optional[str]:
+    """Version recorded for exe_path, or None when missing or not for this file."""
+    try:
+        with open(sidecar_path(exe_path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("size") != os.path.getsize(exe_path):
+            return None
+        return data.get("version") or None
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def write_version(exe_path: str, version: str) -> bool:
+    """Record version for exe_path (skipped when already up to date); True on success."""
+    if read_version(exe_path) == version:
+        return True
+    path = sidecar_path(exe_path)
+    tmp_path = path + ".tmp"
+    try:
+        data = {"version": version, "size": os.path.getsize(exe_path)}
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+        return True
+    except OSError:
+        return False
+
+
+if __name__ == "__main__":
+    import update_config
+
+    if len(sys.argv) != 2:
+        print("Usage: python version_sidecar.py <path/to/core.exe>")
+        sys.exit(1)
+    if not write_version(sys.argv[1], update_config.CURRENT_VERSION):
+        print(f"Could not write {sidecar_path(sys.argv[1])}")
+        sys.exit(1)
+    print(f"{sidecar_path(sys.argv[1])}: {update_config.CURRENT_VERSION}")